@@ -1,3 +1,4 @@
+import atexit
 from flask import Flask
 from flask_restx import Api
 from app.api.v1.users import api as users_ns
@@ -6,6 +7,8 @@ from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from config import DevelopmentConfig
 from flask_bcrypt import Bcrypt
+from app.persistence.durable import DurableStore
+from app.services import facade
 
 bcrypt = Bcrypt()
 
@@ -20,4 +23,12 @@ def create_app(config_class=DevelopmentConfig):
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
+
+    if app.config.get('PERSISTENCE_PATH'):
+        store = DurableStore(app.config['PERSISTENCE_PATH'],
+                             fsync=app.config['PERSISTENCE_FSYNC'],
+                             fsync_interval=app.config['PERSISTENCE_FSYNC_INTERVAL'],
+                             snapshot_every=app.config['SNAPSHOT_EVERY'])
+        facade.persist(store)
+        atexit.register(store.close)
     return app
@@ -23,7 +23,11 @@ class UserList(Resource):
         if existing_user:
             return {'error': 'Email already registered'}, 400
 
-        new_user = facade.create_user(user_data)
+        # The unique email index still rejects a concurrent duplicate
+        try:
+            new_user = facade.create_user(user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return new_user.to_dict(), 201
 
     @api.response(200, 'List of users retrieved')
@@ -46,9 +50,13 @@ class UserResource(Resource):
     @api.expect(user_model, validate=True)
     @api.response(200, 'User updated successfully')
     @api.response(404, 'User not found')
+    @api.response(400, 'Invalid input data')
     def put(self, user_id):
         """Update user by ID"""
-        user = facade.update_user(user_id, api.payload)
+        try:
+            user = facade.update_user(user_id, api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not user:
             return {'error': 'User not found'}, 404
         return user.to_dict(), 200
@@ -1,6 +1,8 @@
-from app.models.base import BaseModel
+from app.models.base import BaseModel, intern_str
 
 class Amenity(BaseModel):
+    __slots__ = ('_name',)
+
     def __init__(self, name):
         super().__init__()
         self.name = name
@@ -13,7 +15,7 @@ class Amenity(BaseModel):
     def name(self, value):
         if not value or len(value) > 50:
             raise ValueError("Amenity name is required and must not exceed 50 characters")
-        self._name = value
+        self._name = intern_str(value)
 
     def to_dict(self):
         return {
@@ -21,6 +23,13 @@ class Amenity(BaseModel):
             "name": self.name
         }
 
+    def to_record(self):
+        return super().to_record() + (self.name,)
+
+    def load_record(self, record, resolve):
+        super().load_record(record, resolve)
+        self._name = intern_str(record[3])
+
     def update(self, data):
         if 'name' in data:
             self.name = data['name']
@@ -1,11 +1,84 @@
+import sys
 import uuid
 from datetime import datetime
 
+
+def intern_str(value):
+    """One shared copy of a string that many entities repeat (names, ...).
+
+    Only for low-cardinality values: interned strings are immortal on
+    CPython 3.12+, so interning free text would leak every edited or
+    deleted value without sharing anything.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
 class BaseModel:
+    # No per-instance __dict__: millions of entities stay in memory. Every
+    # subclass declares its own __slots__ for the same reason.
+    __slots__ = ('id', 'created_at', 'updated_at', '_watchers')
+
     def __init__(self):
+        object.__setattr__(self, '_watchers', ())
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        # One datetime for both: they only differ once the object is saved
+        self.created_at = self.updated_at = datetime.now()
+
+    def __setattr__(self, name, value):
+        callbacks = [callback for names, callback in self._watchers if name in names]
+        if not callbacks:
+            object.__setattr__(self, name, value)
+            return
+        old_value = getattr(self, name, None)
+        object.__setattr__(self, name, value)
+        # Read back rather than use value: setters may normalize it (email)
+        new_value = getattr(self, name)
+        notified = []
+        try:
+            for callback in callbacks:
+                callback(self, name, old_value, new_value)
+                notified.append(callback)
+        except ValueError:
+            object.__setattr__(self, name, old_value)
+            for callback in notified:
+                callback(self, name, new_value, old_value)
+            raise
+
+    def watch(self, watchers):
+        """Add watchers, a tuple of (names, callback) pairs.
+
+        callback(obj, name, old, new) runs after each assignment to one of
+        names; repositories use it to keep their attribute indexes current.
+        A callback raising ValueError undoes the assignment. An object
+        with no other watchers keeps the given tuple itself, so one tuple
+        shared by a repository costs its objects nothing.
+        """
+        current = self._watchers
+        if current:
+            watchers = current + tuple(watcher for watcher in watchers if watcher not in current)
+        object.__setattr__(self, '_watchers', watchers)
+
+    def unwatch(self, watchers):
+        remaining = tuple(watcher for watcher in self._watchers if watcher not in watchers)
+        object.__setattr__(self, '_watchers', remaining)
+
+    @classmethod
+    def from_record(cls, record, resolve):
+        """Rebuild an object from to_record() output, skipping validation.
+
+        resolve(kind, obj_id) returns the object a stored id refers to.
+        """
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, '_watchers', ())
+        obj.load_record(record, resolve)
+        return obj
+
+    def to_record(self):
+        """Plain values for persistence; relationships are stored as ids."""
+        return (self.id, self.created_at, self.updated_at)
+
+    def load_record(self, record, resolve):
+        self.id, self.created_at, self.updated_at = record[:3]
 
     def save(self):
         """Actualizar la marca de tiempo updated_at cada vez que se modifique el objeto"""
@@ -1,6 +1,9 @@
 from app.models.base import BaseModel
 
 class Place(BaseModel):
+    __slots__ = ('_title', '_price', '_latitude', '_longitude', '_description', 'owner',
+                 '_reviews', '_amenities')
+
     def __init__(self, title, price, latitude, longitude, owner, description=None):
         super().__init__()
         self.title = title
@@ -9,8 +12,9 @@ class Place(BaseModel):
         self.longitude = longitude
         self.description = description or ""
         self.owner = owner
-        self.reviews = []
-        self.amenities = []
+        # Tuples of references: empty ones are shared, full ones have no spare slots
+        self._reviews = ()
+        self._amenities = ()
 
     @property
     def title(self):
@@ -52,11 +56,39 @@ class Place(BaseModel):
             raise ValueError("Longitude out of bounds.")
         self._longitude = value
 
+    @property
+    def description(self):
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        # Free text is unique per place, so it is not interned (see intern_str)
+        self._description = value
+
+    @property
+    def reviews(self):
+        return self._reviews
+
+    @reviews.setter
+    def reviews(self, value):
+        self._reviews = tuple(value)
+
+    @property
+    def amenities(self):
+        return self._amenities
+
+    @amenities.setter
+    def amenities(self, value):
+        self._amenities = tuple(value)
+
     def add_review(self, review):
-        self.reviews.append(review)
+        self._reviews += (review,)
+
+    def remove_review(self, review):
+        self._reviews = tuple(r for r in self._reviews if r.id != review.id)
 
     def add_amenity(self, amenity):
-        self.amenities.append(amenity)
+        self._amenities += (amenity,)
 
     def to_dict(self):
         return {
@@ -71,6 +103,20 @@ class Place(BaseModel):
             "reviews": [review.to_dict() for review in self.reviews]
         }
 
+    def to_record(self):
+        # reviews are not stored: each review records its place instead
+        return super().to_record() + (
+            self.title, self.description, self.price, self.latitude, self.longitude,
+            self.owner.id, [amenity.id for amenity in self.amenities])
+
+    def load_record(self, record, resolve):
+        super().load_record(record, resolve)
+        (self._title, self._description, self._price, self._latitude, self._longitude,
+         owner_id, amenity_ids) = record[3:]
+        self.owner = resolve('user', owner_id)
+        self._amenities = tuple(resolve('amenity', amenity_id) for amenity_id in amenity_ids)
+        self._reviews = ()
+
     def update(self, data):
         for field in ['title', 'description', 'price', 'latitude', 'longitude']:
             if field in data:
@@ -1,6 +1,8 @@
 from app.models.base import BaseModel
 
 class Review(BaseModel):
+    __slots__ = ('_text', '_rating', 'place', 'user')
+
     def __init__(self, text, rating, place, user):
         super().__init__()
         self.text = text
@@ -37,6 +39,15 @@ class Review(BaseModel):
             "user_id": self.user.id
         }
 
+    def to_record(self):
+        return super().to_record() + (self.text, self.rating, self.place.id, self.user.id)
+
+    def load_record(self, record, resolve):
+        super().load_record(record, resolve)
+        self._text, self._rating, place_id, user_id = record[3:]
+        self.place = resolve('place', place_id)
+        self.user = resolve('user', user_id)
+
     def update(self, data):
         if 'text' in data:
             self.text = data['text']
@@ -1,16 +1,16 @@
 from email_validator import validate_email, EmailNotValidError
-from app.models.base import BaseModel
+from app.models.base import BaseModel, intern_str
 
 
 class User(BaseModel):
+    __slots__ = ('_first_name', '_last_name', '_email', 'is_admin')
+
     def __init__(self, first_name: str, last_name: str, email: str, is_admin: bool = False):
         super().__init__()
         self.first_name = first_name
         self.last_name = last_name
         self.email = email
         self.is_admin = is_admin
-        self.places = []
-        self.reviews = []
 
     @property
     def first_name(self):
@@ -20,7 +20,7 @@ class User(BaseModel):
     def first_name(self, value):
         if not value or len(value) > 50:
             raise ValueError("First name is required and cannot exceed 50 characters")
-        self._first_name = value
+        self._first_name = intern_str(value)
 
     @property
     def last_name(self):
@@ -30,7 +30,7 @@ class User(BaseModel):
     def last_name(self, value):
         if not value or len(value) > 50:
             raise ValueError("Last name is required and cannot exceed 50 characters")
-        self._last_name = value
+        self._last_name = intern_str(value)
 
     @property
     def email(self):
@@ -53,8 +53,24 @@ class User(BaseModel):
             "is_admin": self.is_admin
         }
 
+    def to_record(self):
+        return super().to_record() + (self.first_name, self.last_name, self.email, self.is_admin)
+
+    def load_record(self, record, resolve):
+        super().load_record(record, resolve)
+        first_name, last_name, self._email, self.is_admin = record[3:]
+        self._first_name = intern_str(first_name)
+        self._last_name = intern_str(last_name)
+
     def update(self, data):
-        for field in ['first_name', 'last_name', 'email', 'is_admin']:
-            if field in data:
-                setattr(self, field, data[field])
+        # Validate everything on a scratch copy first so a rejected update
+        # leaves this user untouched. The email goes first: the repository
+        # can still reject it as taken, and then nothing else has changed.
+        fields = [field for field in ('email', 'first_name', 'last_name', 'is_admin') if field in data]
+        checked = User.__new__(User)
+        object.__setattr__(checked, '_watchers', ())
+        for field in fields:
+            setattr(checked, field, data[field])
+        for field in fields:
+            setattr(self, field, getattr(checked, field))
         self.save()
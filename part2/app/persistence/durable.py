@@ -0,0 +1,486 @@
+import gc
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime, timedelta
+
+# Files are a header (magic, generation) followed by frames: a u32 payload
+# length, the payload's crc32, then the payload
+SNAPSHOT_MAGIC = b'HBNBSNP1'
+LOG_MAGIC = b'HBNBLOG1'
+_HEADER = struct.Struct('<8sQ')
+_FRAME = struct.Struct('<II')
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+_PUT, _DELETE = 'put', 'delete'
+
+# Value tags of the record encoding
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LIST, _TIME = b'NTFidslt'
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_U32 = struct.Struct('<I')
+_EPOCH = datetime(1970, 1, 1)
+
+
+class PersistenceError(Exception):
+    """The data files cannot be read back into the repositories."""
+
+
+def _encode(value, out):
+    if value is None:
+        out += b'N'
+    elif value is True:
+        out += b'T'
+    elif value is False:
+        out += b'F'
+    elif isinstance(value, int):
+        out += b'i'
+        out += _I64.pack(value)
+    elif isinstance(value, float):
+        out += b'd'
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out += b's'
+        out += _U32.pack(len(data))
+        out += data
+    elif isinstance(value, datetime):
+        out += b't'
+        out += _I64.pack((value - _EPOCH) // timedelta(microseconds=1))
+    elif isinstance(value, (list, tuple)):
+        out += b'l'
+        out += _U32.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    else:
+        raise TypeError(f"Cannot persist {type(value).__name__} values")
+
+
+def encode(values):
+    """values (a tuple of None/bool/int/float/str/datetime/lists) as bytes."""
+    out = bytearray()
+    _encode(values, out)
+    return bytes(out)
+
+
+def _decode(buffer, offset):
+    tag = buffer[offset]
+    offset += 1
+    if tag == _STR:
+        length = _U32.unpack_from(buffer, offset)[0]
+        offset += 4
+        return str(buffer[offset:offset + length], 'utf-8'), offset + length
+    if tag == _INT:
+        return _I64.unpack_from(buffer, offset)[0], offset + 8
+    if tag == _FLOAT:
+        return _F64.unpack_from(buffer, offset)[0], offset + 8
+    if tag == _TIME:
+        return _EPOCH + timedelta(microseconds=_I64.unpack_from(buffer, offset)[0]), offset + 8
+    if tag == _LIST:
+        count = _U32.unpack_from(buffer, offset)[0]
+        offset += 4
+        items = []
+        for _ in range(count):
+            # Strings dominate records; decode them without the call
+            if buffer[offset] == _STR:
+                length = _U32.unpack_from(buffer, offset + 1)[0]
+                offset += 5
+                items.append(str(buffer[offset:offset + length], 'utf-8'))
+                offset += length
+            else:
+                item, offset = _decode(buffer, offset)
+                items.append(item)
+        return items, offset
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    raise PersistenceError(f"Unknown value tag {tag!r}")
+
+
+def decode(buffer, offset=0):
+    return _decode(buffer, offset)[0]
+
+
+def frame(payload):
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_frames(buffer, offset):
+    """(payload, end offset) of each intact frame from offset on.
+
+    Stops at the first incomplete or corrupt frame: the torn tail a crash
+    can leave after the last write that reached the disk.
+    """
+    size = len(buffer)
+    while offset + _FRAME.size <= size:
+        length, checksum = _FRAME.unpack_from(buffer, offset)
+        start = offset + _FRAME.size
+        end = start + length
+        if end > size:
+            return
+        payload = buffer[start:end]
+        if zlib.crc32(payload) != checksum:
+            return
+        yield payload, end
+        offset = end
+
+
+def _fsync_directory(path):
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class Journal:
+    """One repository's handle on a DurableStore."""
+
+    def __init__(self, store, kind, repo):
+        self.store = store
+        self.kind = kind
+        self.repo = repo
+
+    def put(self, obj):
+        self.store.append_put(self, obj)
+
+    def delete(self, obj_id):
+        self.store.append_delete(self, obj_id)
+
+
+class DurableStore:
+    """Persists InMemoryRepository contents to a directory.
+
+    Every add, delete and save() of a stored object appends the object's
+    whole record (or its id, for deletes) to journal.log. After
+    snapshot_every appends, the log is renamed to journal.old and a new
+    one started; a background thread then merges journal.old into
+    snapshot.bin and removes it. Writers only wait for the rename.
+    Recovery memory-maps the snapshot, loads it and replays journal.old
+    (if still there) and journal.log on top.
+
+    Every file carries a generation number. The log of generation g is
+    rotated out while a new one of generation g + 1 takes appends, and
+    the snapshot merged from it is generation g + 1 as well. A log older
+    than the snapshot was already merged into it and is skipped, so a
+    crash at any point of a compaction loses nothing and replays nothing
+    twice; an unmerged journal.old is merged again after the restart.
+
+    fsync is 'always' (before each write returns), 'interval' (from a
+    background thread every fsync_interval seconds, so a crash of the
+    machine loses at most that much) or 'never' (left to the OS). Every
+    append is flushed to the OS, so a crash of the process alone loses
+    nothing under any policy.
+    """
+
+    def __init__(self, path, fsync='interval', fsync_interval=1.0, snapshot_every=100000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = os.path.join(path, 'snapshot.bin')
+        self.log_path = os.path.join(path, 'journal.log')
+        self.old_log_path = os.path.join(path, 'journal.old')
+        self._journals = []
+        self._lock = threading.RLock()
+        self._log = None
+        self._generation = 0
+        self._appended = 0
+        self._dirty = False
+        self._replaying = False
+        # journal.old exists and is not merged yet; no rotation until it is
+        self._folding = False
+        self._fold_lock = threading.Lock()
+        self._compactor = None
+        self._stopped = threading.Event()
+        self._syncer = None
+
+    def attach(self, collections):
+        """Load the data files into [(kind, repo, model_class)], then journal them.
+
+        The collections are loaded and snapshotted in the given order, so
+        a model must come after the ones its records reference.
+        """
+        journals = {kind: Journal(self, kind, repo) for kind, repo, model_class in collections}
+        models = {kind: model_class for kind, repo, model_class in collections}
+        with self._lock:
+            if self._journals:
+                raise PersistenceError("Store is already attached")
+            os.makedirs(self.path, exist_ok=True)
+            self._journals = list(journals.values())
+            for journal in self._journals:
+                journal.repo.set_journal(journal)
+            self._replaying = True
+            # Loading allocates millions of long-lived objects and no garbage;
+            # the cyclic collector would rescan the growing heap again and again
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                self._generation = self._load_snapshot(journals, models)
+                self._folding = self._replay_log(self.old_log_path, journals, models)
+                if self._folding:
+                    # A compaction was cut short; journal.log follows journal.old
+                    self._generation += 1
+                elif os.path.exists(self.old_log_path):
+                    os.remove(self.old_log_path)
+                self._appended = 0
+                self._replay_log(self.log_path, journals, models)
+            finally:
+                self._replaying = False
+                if collecting:
+                    gc.enable()
+            self._open_log()
+            if self._folding:
+                self._start_compactor()
+        if self.fsync == 'interval':
+            self._stopped.clear()
+            self._syncer = threading.Thread(target=self._sync_periodically,
+                                            name='journal-fsync', daemon=True)
+            self._syncer.start()
+
+    def _restore(self, journals, models, payload):
+        op, kind, value = decode(payload)
+        journal = journals.get(kind)
+        if journal is None:
+            raise PersistenceError(f"Unknown record kind {kind!r}")
+        repo = journal.repo
+        if op == _DELETE:
+            repo.delete(value)
+            return
+        existing = repo.get(value[0])
+        if existing is None:
+            repo.add(models[kind].from_record(value, self._resolve))
+        else:
+            # Reload in place: other objects hold references to this one
+            repo.delete(existing.id)
+            existing.load_record(value, self._resolve)
+            repo.add(existing)
+
+    def _resolve(self, kind, obj_id):
+        for journal in self._journals:
+            if journal.kind == kind:
+                obj = journal.repo.get(obj_id)
+                if obj is None:
+                    raise PersistenceError(f"Record refers to missing {kind} {obj_id}")
+                return obj
+        raise PersistenceError(f"Unknown record kind {kind!r}")
+
+    def _load_snapshot(self, journals, models):
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        # A snapshot only holds puts of distinct objects in attach order, so
+        # each kind is built in full and added with one add_many
+        loaded = {}
+
+        def resolve(kind, obj_id):
+            obj = loaded.get(kind, {}).get(obj_id)
+            return obj if obj is not None else self._resolve(kind, obj_id)
+
+        with open(self.snapshot_path, 'rb') as snapshot:
+            if os.fstat(snapshot.fileno()).st_size < _HEADER.size:
+                raise PersistenceError(f"{self.snapshot_path} is truncated")
+            with mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                magic, generation = _HEADER.unpack_from(buffer, 0)
+                if magic != SNAPSHOT_MAGIC:
+                    raise PersistenceError(f"{self.snapshot_path} is not a snapshot")
+                end = _HEADER.size
+                for payload, end in read_frames(buffer, _HEADER.size):
+                    op, kind, record = decode(payload)
+                    if op != _PUT or kind not in journals:
+                        raise PersistenceError(f"Unexpected {op} of {kind!r} in snapshot")
+                    loaded.setdefault(kind, {})[record[0]] = models[kind].from_record(record, resolve)
+                if end != len(buffer):
+                    # Snapshots are renamed into place once complete
+                    raise PersistenceError(f"{self.snapshot_path} is corrupt at byte {end}")
+        for kind, objs in loaded.items():
+            journals[kind].repo.add_many(objs.values())
+        return generation
+
+    def _replay_log(self, path, journals, models):
+        """Replay the log at path; False if it is missing, empty or already merged."""
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as log:
+            data = log.read()
+        if len(data) < _HEADER.size:
+            return False
+        magic, generation = _HEADER.unpack_from(data, 0)
+        if magic != LOG_MAGIC:
+            raise PersistenceError(f"{path} is not a journal")
+        if generation < self._generation:
+            return False
+        end = _HEADER.size
+        for payload, end in read_frames(data, _HEADER.size):
+            self._restore(journals, models, payload)
+            self._appended += 1
+        if end != len(data):
+            # Drop the torn tail so new appends follow the last good frame
+            with open(path, 'r+b') as log:
+                log.truncate(end)
+        return True
+
+    def _open_log(self):
+        fresh = True
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) >= _HEADER.size:
+            with open(self.log_path, 'rb') as log:
+                fresh = _HEADER.unpack(log.read(_HEADER.size))[1] < self._generation
+        if fresh:
+            self._start_log()
+        else:
+            self._log = open(self.log_path, 'ab')
+
+    def _start_log(self):
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, 'wb')
+        self._log.write(_HEADER.pack(LOG_MAGIC, self._generation))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._appended = 0
+        self._dirty = False
+
+    def append_put(self, journal, obj):
+        # The repository only calls this for objects it stores, under its lock
+        with self._lock:
+            if self._replaying:
+                return
+            self._append(encode((_PUT, journal.kind, obj.to_record())))
+
+    def append_delete(self, journal, obj_id):
+        with self._lock:
+            if self._replaying:
+                return
+            self._append(encode((_DELETE, journal.kind, obj_id)))
+
+    def _append(self, payload):
+        if self._log is None:
+            raise PersistenceError("Store is closed")
+        self._log.write(frame(payload))
+        self._log.flush()
+        if self.fsync == 'always':
+            os.fsync(self._log.fileno())
+        else:
+            self._dirty = True
+        self._appended += 1
+        if self._appended >= self.snapshot_every and not self._folding:
+            self._rotate()
+            self._start_compactor()
+
+    def _rotate(self):
+        """Move the log aside as journal.old and start the next generation's."""
+        self._log.close()
+        self._log = None
+        os.replace(self.log_path, self.old_log_path)
+        self._generation += 1
+        self._start_log()
+        _fsync_directory(self.path)
+        self._folding = True
+
+    def _start_compactor(self):
+        self._compactor = threading.Thread(target=self._fold, name='journal-compact', daemon=True)
+        self._compactor.start()
+
+    def _fold(self):
+        """Merge journal.old into a new snapshot, then remove it.
+
+        Runs without the store lock: it only reads the files, so appends
+        to the new log carry on meanwhile. If it fails, journal.old stays
+        and no further rotation happens until compact() or a restart
+        merges it.
+        """
+        with self._fold_lock:
+            if not self._folding:
+                return
+            with open(self.old_log_path, 'rb') as log:
+                # 'interval' and 'never' appends may not be on the disk yet
+                os.fsync(log.fileno())
+                data = log.read()
+            generation = _HEADER.unpack_from(data, 0)[1] + 1
+            # The last record of each object the log touched; None once deleted
+            changes = {}
+            for payload, _ in read_frames(data, _HEADER.size):
+                op, kind, value = decode(payload)
+                if op == _PUT:
+                    changes.setdefault(kind, {})[value[0]] = payload
+                else:
+                    changes.setdefault(kind, {})[value] = None
+            temporary = self.snapshot_path + '.tmp'
+            with open(temporary, 'wb') as snapshot:
+                snapshot.write(_HEADER.pack(SNAPSHOT_MAGIC, generation))
+                for payload in self._merged(changes):
+                    snapshot.write(frame(payload))
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temporary, self.snapshot_path)
+            _fsync_directory(self.path)
+            os.remove(self.old_log_path)
+            with self._lock:
+                self._folding = False
+
+    def _merged(self, changes):
+        """The snapshot's records with changes applied, kinds still in attach order."""
+        kinds = [journal.kind for journal in self._journals]
+        written = 0  # kinds[:written] are complete
+
+        def added(kind):
+            return [payload for payload in changes.get(kind, {}).values() if payload is not None]
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as snapshot, \
+                    mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for payload, _ in read_frames(buffer, _HEADER.size):
+                    op, kind, record = decode(payload)
+                    position = kinds.index(kind)
+                    # Objects new since the last snapshot close their kind's run
+                    for earlier in kinds[written:position]:
+                        yield from added(earlier)
+                    written = position
+                    payload = changes.get(kind, {}).pop(record[0], payload)
+                    if payload is not None:
+                        yield payload
+        for kind in kinds[written:]:
+            yield from added(kind)
+
+    def compact(self):
+        """Merge the whole log into a new snapshot now, in the calling thread."""
+        # A rotated log still pending goes first
+        self._fold()
+        with self._lock:
+            if self._log is None:
+                raise PersistenceError("Store is closed")
+            if not self._folding:
+                self._rotate()
+        self._fold()
+
+    def sync(self):
+        with self._lock:
+            if self._log is not None and self._dirty:
+                os.fsync(self._log.fileno())
+                self._dirty = False
+
+    def _sync_periodically(self):
+        while not self._stopped.wait(self.fsync_interval):
+            self.sync()
+
+    def close(self):
+        self._stopped.set()
+        if self._syncer is not None:
+            self._syncer.join()
+            self._syncer = None
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._log.close()
+                self._log = None
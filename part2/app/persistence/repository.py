@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 
 class Repository(ABC):
@@ -26,18 +27,153 @@ class Repository(ABC):
         pass
 
 
-class InMemoryRepository(Repository):
+class ReadWriteLock:
+    """Any number of readers, or one writer.
+
+    Readers never wait for each other, only for a writer. A waiting
+    writer holds off new readers so a steady stream of reads cannot
+    starve it. Not reentrant: a thread must not take the write lock
+    while it holds either lock.
+
+    read() and write() return context managers: `with lock.read(): ...`
+    """
+
     def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+        # Guards _writers_waiting, so a writer can announce itself without
+        # first winning the condition's lock from a stream of readers
+        self._waiting_lock = threading.Lock()
+        self._read = _Held(self.acquire_read, self.release_read)
+        self._write = _Held(self.acquire_write, self.release_write)
+
+    def read(self):
+        return self._read
+
+    def write(self):
+        return self._write
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        # Announced before taking the condition's lock: that lock is not
+        # fair, and readers cycling through it could keep a writer out of
+        # it for seconds. Readers seeing the count park in wait() instead.
+        with self._waiting_lock:
+            self._writers_waiting += 1
+        try:
+            with self._condition:
+                while self._writing or self._readers:
+                    self._condition.wait()
+                self._writing = True
+        finally:
+            with self._waiting_lock:
+                self._writers_waiting -= 1
+
+    def release_write(self):
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+
+
+class _Held:
+    """Context manager calling acquire on entry and release on exit.
+
+    Stateless, so one instance serves every thread; cheaper per call than
+    a @contextmanager generator on these hot paths.
+    """
+
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc_info):
+        self._release()
+
+
+class InMemoryRepository(Repository):
+    """Objects kept in a dict by id, with optional secondary hash indexes.
+
+    unique and indexed name attributes to index: a unique index maps each
+    value to its one object (a second object with that value is rejected
+    with ValueError), a non-unique index maps each value to the objects
+    having it. get_by_attribute and get_all_by_attribute on an indexed
+    attribute are dict lookups instead of scans. The indexes follow add
+    and delete, and every later assignment to an indexed attribute of a
+    stored object (update() included) through BaseModel.watch.
+
+    With a journal (see set_journal and durable.DurableStore) every add,
+    delete and save() of a stored object is also written to it, under
+    the same lock as the change, so the journal replays in storage order.
+
+    Safe to share between threads: reads take a shared lock and return
+    snapshots (get_all builds its list under the lock), writes to the
+    storage and indexes take an exclusive one. Changing an object's
+    fields is left to the object: update() runs its setters outside the
+    lock, and only their index maintenance takes it.
+    """
+
+    def __init__(self, unique=(), indexed=()):
         self._storage = {}
+        self._unique = {attr_name: {} for attr_name in unique}
+        self._indexed = {attr_name: {} for attr_name in indexed}
+        self._lock = ReadWriteLock()
+        self._journal = None
+        self._watchers = self._build_watchers()
+
+    def set_journal(self, journal):
+        with self._lock.write():
+            previous = self._watchers
+            self._journal = journal
+            self._watchers = self._build_watchers()
+            for obj in self._storage.values():
+                obj.unwatch(previous)
+                obj.watch(self._watchers)
+
+    def _build_watchers(self):
+        """The BaseModel.watch argument shared by every stored object."""
+        names = set(self._unique) | set(self._indexed)
+        if self._journal is not None:
+            # BaseModel.save() assigns it after every change
+            names.add('updated_at')
+        return ((frozenset(names), self._attribute_changed),) if names else ()
 
     def add(self, obj):
-        self._storage[obj.id] = obj
+        self.add_many([obj])
+
+    def add_many(self, objs):
+        """add() each object, taking the lock once; stops at the first clash."""
+        with self._lock.write():
+            for obj in objs:
+                self._insert(obj)
+                # Under the lock, so the journal's order is the storage's
+                if self._journal is not None:
+                    self._journal.put(obj)
 
     def get(self, obj_id):
-        return self._storage.get(obj_id)
+        with self._lock.read():
+            return self._storage.get(obj_id)
 
     def get_all(self):
-        return list(self._storage.values())
+        with self._lock.read():
+            return list(self._storage.values())
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
@@ -45,8 +181,87 @@ class InMemoryRepository(Repository):
             obj.update(data)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        with self._lock.write():
+            obj = self._remove(obj_id)
+            if obj is not None:
+                obj.unwatch(self._watchers)
+                if self._journal is not None:
+                    self._journal.delete(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
\ No newline at end of file
+        with self._lock.read():
+            if attr_name in self._unique:
+                return self._unique[attr_name].get(attr_value)
+            if attr_name in self._indexed:
+                return next(iter(self._indexed[attr_name].get(attr_value, {}).values()), None)
+            return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        with self._lock.read():
+            if attr_name in self._unique:
+                obj = self._unique[attr_name].get(attr_value)
+                return [obj] if obj is not None else []
+            if attr_name in self._indexed:
+                return list(self._indexed[attr_name].get(attr_value, {}).values())
+            return [obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value]
+
+    def _insert(self, obj):
+        for attr_name, index in self._unique.items():
+            self._check_unique(attr_name, index, getattr(obj, attr_name), obj)
+        if obj.id in self._storage:
+            self._remove(obj.id)
+        self._storage[obj.id] = obj
+        for attr_name, index in self._unique.items():
+            index[getattr(obj, attr_name)] = obj
+        for attr_name, index in self._indexed.items():
+            index.setdefault(getattr(obj, attr_name), {})[obj.id] = obj
+        if self._watchers:
+            obj.watch(self._watchers)
+
+    def _remove(self, obj_id):
+        obj = self._storage.pop(obj_id, None)
+        if obj is None:
+            return None
+        for attr_name, index in self._unique.items():
+            if index.get(getattr(obj, attr_name)) is obj:
+                del index[getattr(obj, attr_name)]
+        for attr_name, index in self._indexed.items():
+            self._unindex(index, getattr(obj, attr_name), obj_id)
+        return obj
+
+    def _attribute_changed(self, obj, attr_name, old_value, new_value):
+        if attr_name == 'updated_at':
+            # Journal only. The read lock is enough to keep an add or delete
+            # of the object from landing between the check and the append.
+            if self._journal is not None:
+                with self._lock.read():
+                    if self._storage.get(obj.id) is obj:
+                        self._journal.put(obj)
+            return
+        with self._lock.write():
+            if self._storage.get(obj.id) is not obj:
+                return
+            if attr_name in self._unique:
+                index = self._unique[attr_name]
+                self._check_unique(attr_name, index, new_value, obj)
+                if index.get(old_value) is obj:
+                    del index[old_value]
+                index[new_value] = obj
+            if attr_name in self._indexed:
+                index = self._indexed[attr_name]
+                self._unindex(index, old_value, obj.id)
+                index.setdefault(new_value, {})[obj.id] = obj
+
+    @staticmethod
+    def _check_unique(attr_name, index, value, obj):
+        holder = index.get(value)
+        if holder is not None and holder.id != obj.id:
+            raise ValueError(f"{attr_name.capitalize()} '{value}' is already in use")
+
+    @staticmethod
+    def _unindex(index, value, obj_id):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del index[value]
@@ -6,10 +6,22 @@ from app.models.review import Review
 
 class HBnBFacade:
     def __init__(self):
-        self.user_repo = InMemoryRepository()
+        self.user_repo = InMemoryRepository(unique=('email',))
         self.amenity_repo = InMemoryRepository()
         self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
+        self.review_repo = InMemoryRepository(indexed=('place',))
+
+    def persist(self, store):
+        """Load the repositories from a DurableStore and journal them to it."""
+        store.attach([
+            ('user', self.user_repo, User),
+            ('amenity', self.amenity_repo, Amenity),
+            ('place', self.place_repo, Place),
+            ('review', self.review_repo, Review),
+        ])
+        # Places do not store their reviews; rebuild the lists from the reviews
+        for review in self.review_repo.get_all():
+            review.place.add_review(review)
 
 
     # User Methods -----------------------------------------------------------
@@ -116,6 +128,8 @@ class HBnBFacade:
                     raise ValueError(f"Amenity with ID {amenity_id} not found")
                 place.add_amenity(amenity)
 
+        # Covers the owner and amenities too (place.update() saved before them)
+        place.save()
         return place
 
 
@@ -151,7 +165,10 @@ class HBnBFacade:
         return self.review_repo.get_all()
     
     def get_reviews_by_place(self, place_id):
-        return [review for review in self.review_repo.get_all() if review.place.id == place_id]
+        place = self.get_place(place_id)
+        if not place:
+            return None
+        return self.review_repo.get_all_by_attribute('place', place)
 
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
@@ -176,6 +193,6 @@ class HBnBFacade:
         if not review:
             return None
 
-        review.place.reviews = [r for r in review.place.reviews if r.id != review.id]
+        review.place.remove_review(review)
         self.review_repo.delete(review_id)
         return True
@@ -4,6 +4,11 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Directory for the journal and snapshot; unset keeps data in memory only
+    PERSISTENCE_PATH = os.getenv('HBNB_DATA_DIR')
+    PERSISTENCE_FSYNC = os.getenv('HBNB_FSYNC', 'interval')  # always | interval | never
+    PERSISTENCE_FSYNC_INTERVAL = 1.0
+    SNAPSHOT_EVERY = 100000  # journal entries between compactions
 
 class DevelopmentConfig(Config):
     DEBUG = True
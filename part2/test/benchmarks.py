@@ -0,0 +1,294 @@
+"""Micro-benchmarks for the in-memory persistence layer.
+
+Run from the part2 directory, e.g.:
+    PYTHONPATH=. python3 test/benchmarks.py user_lookup 10000 100000 1000000
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from app.models.user import User
+from app.persistence.durable import DurableStore
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+
+def make_users(count, prefix='user'):
+    return [User(first_name="Bench", last_name=str(i), email=f"{prefix}{i}@bench.hbnb")
+            for i in range(count)]
+
+
+def bench_user_lookup(*sizes, lookups=1000, scans=20):
+    """get_by_attribute('email') with a unique index, against the linear scan."""
+    sizes = [int(size) for size in sizes] or [10000, 100000, 1000000]
+    rng = random.Random(21)
+    for size in sizes:
+        users = make_users(size)
+        emails = [users[rng.randrange(size)].email for _ in range(lookups)]
+
+        scanned = InMemoryRepository()
+        indexed = InMemoryRepository(unique=('email',))
+        for user in users:
+            scanned.add(user)
+        start = time.perf_counter()
+        for user in users:
+            indexed.add(user)
+        add_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for email in emails[:scans]:
+            assert scanned.get_by_attribute('email', email).email == email
+        scan_elapsed = (time.perf_counter() - start) / scans
+
+        start = time.perf_counter()
+        for email in emails:
+            assert indexed.get_by_attribute('email', email).email == email
+        index_elapsed = (time.perf_counter() - start) / lookups
+
+        # An indexed field changed through the model's setter
+        start = time.perf_counter()
+        for i, user in enumerate(users[:lookups]):
+            user.email = f"renamed{i}@bench.hbnb"
+        rename_elapsed = (time.perf_counter() - start) / lookups
+        assert indexed.get_by_attribute('email', "renamed0@bench.hbnb") is users[0]
+
+        print(f"user_lookup users={size:>8} scan={scan_elapsed * 1e6:>10.1f}us "
+              f"index={index_elapsed * 1e6:.2f}us add={add_elapsed / size * 1e6:.2f}us/user "
+              f"setter={rename_elapsed * 1e6:.1f}us")
+
+
+def check_repository(repo):
+    """Storage and email index agree; raises AssertionError otherwise."""
+    users = repo.get_all()
+    assert len(users) == len(repo._unique['email'])
+    for user in users:
+        assert repo.get_by_attribute('email', user.email) is user
+
+
+def bench_repository_stress(*thread_counts, size=10000, duration=2.0, read_ratio=0.9):
+    """Mixed reads/writes on one shared repository from N threads.
+
+    Checks that readers hold the lock together, that no reader sees a
+    half-applied write (and no iteration fails), and that the storage
+    and index agree afterwards; then reports operations/s.
+    """
+    thread_counts = [int(count) for count in thread_counts] or [1, 2, 4, 8]
+    duration = float(duration)
+    # Switch threads far more often than the default 5ms to surface races
+    sys.setswitchinterval(1e-5)
+
+    repo = InMemoryRepository(unique=('email',))
+    readers = max(thread_counts)
+    inside = threading.Barrier(readers)
+    errors = []
+
+    def overlapping_reader():
+        try:
+            with repo._lock.read():
+                inside.wait(timeout=5)
+        except threading.BrokenBarrierError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=overlapping_reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, "readers blocked each other"
+    print(f"repository_stress {readers} readers held the read lock at once")
+
+    for threads_count in thread_counts:
+        repo = InMemoryRepository(unique=('email',))
+        for user in make_users(size):
+            repo.add(user)
+        stop = threading.Event()
+        counts = [0] * threads_count
+
+        def worker(slot):
+            rng = random.Random(slot)
+            done = 0
+            serial = 0
+            try:
+                while not stop.is_set():
+                    if not done % 100:
+                        # Also the full-snapshot read: iterates the whole store
+                        known = repo.get_all()
+                        assert len(known) == len(set(user.id for user in known))
+                        # An unindexed attribute: a scan over the live storage
+                        repo.get_all_by_attribute('first_name', "Stress")
+                    user = rng.choice(known)
+                    roll = rng.random()
+                    if roll < read_ratio / 2:
+                        repo.get(user.id)
+                    elif roll < read_ratio:
+                        found = repo.get_by_attribute('email', user.email)
+                        # Renamed or deleted meanwhile is fine; another user is not
+                        assert found is None or found is user or found.email == user.email
+                    elif roll < read_ratio + (1 - read_ratio) / 3:
+                        serial += 1
+                        repo.add(User(first_name="Stress", last_name=str(slot),
+                                      email=f"new{slot}.{serial}@bench.hbnb"))
+                    elif roll < read_ratio + 2 * (1 - read_ratio) / 3:
+                        repo.delete(user.id)
+                    else:
+                        serial += 1
+                        user.email = f"renamed{slot}.{serial}@bench.hbnb"
+                    done += 1
+            except Exception as error:
+                errors.append(error)
+                stop.set()
+            counts[slot] = done
+
+        threads = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        assert not errors, errors
+        check_repository(repo)
+        print(f"repository_stress threads={threads_count:>2} ops/s={sum(counts) / elapsed:>10.0f} "
+              f"users={len(repo.get_all())}")
+
+
+def populate(facade, entities, rng):
+    """About entities objects: 20% users, 30% places, 50% reviews, 100 amenities."""
+    users = [facade.create_user({"first_name": "Bench", "last_name": str(i),
+                                 "email": f"user{i}@bench.hbnb"})
+             for i in range(max(1, entities // 5))]
+    amenities = [facade.create_amenity({"name": f"Amenity {i}"}) for i in range(100)]
+    places = [facade.create_place({
+        "title": f"Place {i}", "price": rng.uniform(10, 500),
+        "latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180),
+        "owner_id": rng.choice(users).id,
+        "amenities": [amenity.id for amenity in rng.sample(amenities, 3)]
+    }) for i in range(max(1, entities * 3 // 10))]
+    for i in range(max(0, entities - len(users) - len(amenities) - len(places))):
+        facade.create_review({"text": "Bench review", "rating": rng.randint(1, 5),
+                              "user_id": rng.choice(users).id,
+                              "place_id": rng.choice(places).id})
+
+
+def count_entities(facade):
+    return sum(len(repo.get_all()) for repo in (facade.user_repo, facade.amenity_repo,
+                                                facade.place_repo, facade.review_repo))
+
+
+def open_store(path, fsync):
+    facade = HBnBFacade()
+    store = DurableStore(path, fsync=fsync, snapshot_every=sys.maxsize)
+    start = time.perf_counter()
+    facade.persist(store)
+    return facade, store, time.perf_counter() - start
+
+
+def bench_startup(*sizes, fsync='never'):
+    """Startup time from the journal alone and from a compacted snapshot.
+
+    Against building the same data through the facade, which is what
+    reloading by replaying API calls costs at the least.
+    """
+    sizes = [int(size) for size in sizes] or [10000, 100000, 1000000]
+    for size in sizes:
+        path = tempfile.mkdtemp()
+        try:
+            facade, store, _ = open_store(path, fsync)
+            start = time.perf_counter()
+            populate(facade, size, random.Random(23))
+            populate_elapsed = time.perf_counter() - start
+            entities = count_entities(facade)
+            store.close()
+            log_size = os.path.getsize(store.log_path)
+
+            facade, store, replay_elapsed = open_store(path, fsync)
+            assert count_entities(facade) == entities
+            start = time.perf_counter()
+            store.compact()
+            compact_elapsed = time.perf_counter() - start
+            store.close()
+            snapshot_size = os.path.getsize(store.snapshot_path)
+
+            facade, store, load_elapsed = open_store(path, fsync)
+            assert count_entities(facade) == entities
+            store.close()
+            print(f"startup entities={entities:>8} via-facade={populate_elapsed:.1f}s "
+                  f"log-replay={replay_elapsed:.1f}s ({log_size / entities:.0f}B/entity) "
+                  f"snapshot-load={load_elapsed:.1f}s ({snapshot_size / entities:.0f}B/entity) "
+                  f"compact={compact_elapsed:.1f}s")
+        finally:
+            shutil.rmtree(path)
+
+
+def bench_journal_writes(count=10000):
+    """Facade writes/s with each fsync policy, against no persistence."""
+    count = int(count)
+    for fsync in (None, 'never', 'interval', 'always'):
+        path = tempfile.mkdtemp()
+        try:
+            facade = HBnBFacade()
+            if fsync:
+                store = DurableStore(path, fsync=fsync, snapshot_every=sys.maxsize)
+                facade.persist(store)
+            user = facade.create_user({"first_name": "Bench", "last_name": "Writer",
+                                       "email": "writer@bench.hbnb"})
+            start = time.perf_counter()
+            for i in range(count):
+                facade.update_user(user.id, {"first_name": f"Bench{i % 10}"})
+            elapsed = time.perf_counter() - start
+            if fsync:
+                store.close()
+            print(f"journal_writes fsync={fsync or 'off':>8} writes/s={count / elapsed:>9.0f}")
+        finally:
+            shutil.rmtree(path)
+
+
+def bench_memory(count=100000):
+    """Bytes per stored entity of each kind, repository and indexes included.
+
+    Reviews are spread over a tenth as many places and each place gets
+    three amenities, so the relationship containers are counted too.
+    """
+    count = int(count)
+    rng = random.Random(24)
+    facade = HBnBFacade()
+    tracemalloc.start()
+
+    def measure(label, create, n):
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [create(i) for i in range(n)]
+        used = tracemalloc.get_traced_memory()[0] - before
+        print(f"memory {label:<8} n={n:>8} bytes/entity={used / n:>7.0f}")
+        return objects
+
+    users = measure("user", lambda i: facade.create_user({
+        "first_name": "Bench", "last_name": "User", "email": f"user{i}@bench.hbnb"}), count)
+    amenities = measure("amenity", lambda i: facade.create_amenity({"name": f"Amenity {i % 50}"}), 100)
+    places = measure("place", lambda i: facade.create_place({
+        "title": f"Place {i}", "price": 100.0, "latitude": 10.0, "longitude": 20.0,
+        "owner_id": users[i].id,
+        "amenities": [amenity.id for amenity in rng.sample(amenities, 3)]}), count // 10)
+    measure("review", lambda i: facade.create_review({
+        "text": "Great stay", "rating": 5, "user_id": users[i].id,
+        "place_id": places[i % len(places)].id}), count)
+    tracemalloc.stop()
+
+
+BENCHMARKS = {
+    "user_lookup": bench_user_lookup,
+    "repository_stress": bench_repository_stress,
+    "startup": bench_startup,
+    "journal_writes": bench_journal_writes,
+    "memory": bench_memory,
+}
+
+if __name__ == '__main__':
+    name, args = sys.argv[1], sys.argv[2:]
+    BENCHMARKS[name](*args)
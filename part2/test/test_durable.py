@@ -0,0 +1,181 @@
+import os
+import threading
+
+import pytest
+
+from app.persistence.durable import DurableStore
+from app.services.facade import HBnBFacade
+
+
+def reopen(path, **options):
+    facade = HBnBFacade()
+    store = DurableStore(str(path), **options)
+    facade.persist(store)
+    return facade, store
+
+
+def state(facade):
+    return ({user.id: user.to_dict() for user in facade.get_all_users()},
+            {amenity.id: amenity.to_dict() for amenity in facade.get_all_amenities()},
+            {place.id: place.to_dict() for place in facade.get_all_places()},
+            {review.id: review.to_dict() for review in facade.get_all_reviews()})
+
+
+def populate(facade):
+    owner = facade.create_user({"first_name": "Owner", "last_name": "Durable",
+                                "email": "owner@durable.hbnb"})
+    guest = facade.create_user({"first_name": "Guest", "last_name": "Durable",
+                                "email": "guest@durable.hbnb"})
+    wifi = facade.create_amenity({"name": "Wifi"})
+    pool = facade.create_amenity({"name": "Pool"})
+    place = facade.create_place({"title": "Flat", "price": 50.0, "latitude": 1.0, "longitude": 2.0,
+                                 "owner_id": owner.id, "amenities": [wifi.id]})
+    facade.create_review({"text": "Good", "rating": 4, "user_id": guest.id, "place_id": place.id})
+    gone = facade.create_review({"text": "Bad", "rating": 1, "user_id": owner.id,
+                                 "place_id": place.id})
+    facade.update_user(owner.id, {"email": "moved@durable.hbnb"})
+    facade.update_place(place.id, {"title": "Loft", "owner_id": guest.id,
+                                   "amenities": [pool.id, wifi.id]})
+    facade.update_amenity(wifi.id, {"name": "Wifi 6"})
+    facade.delete_review(gone.id)
+    return place
+
+
+@pytest.mark.parametrize('fsync', ['always', 'interval', 'never'])
+@pytest.mark.parametrize('snapshot_every', [3, 1000])
+def test_restart_round_trip(tmp_path, fsync, snapshot_every):
+    facade, store = reopen(tmp_path, fsync=fsync, snapshot_every=snapshot_every)
+    place = populate(facade)
+    before = state(facade)
+    store.close()
+
+    facade, store = reopen(tmp_path, fsync=fsync, snapshot_every=snapshot_every)
+    assert state(facade) == before
+    assert facade.get_user_by_email("moved@durable.hbnb") is not None
+    assert facade.get_user_by_email("owner@durable.hbnb") is None
+    assert [review.text for review in facade.get_reviews_by_place(place.id)] == ["Good"]
+    assert facade.get_place(place.id).owner is facade.get_user_by_email("guest@durable.hbnb")
+    # Writes after a restart land in the same files
+    facade.create_amenity({"name": "Sauna"})
+    before = state(facade)
+    store.close()
+
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    store.close()
+    assert sorted(os.listdir(tmp_path)) in (['journal.log'], ['journal.log', 'snapshot.bin'])
+
+
+def test_truncated_last_record_is_dropped(tmp_path):
+    facade, store = reopen(tmp_path, snapshot_every=1000)
+    populate(facade)
+    before = state(facade)
+    facade.create_user({"first_name": "Torn", "last_name": "Write", "email": "torn@durable.hbnb"})
+    store.close()
+    with open(store.log_path, 'r+b') as log:
+        log.truncate(os.path.getsize(store.log_path) - 5)
+
+    facade, store = reopen(tmp_path, snapshot_every=1000)
+    assert state(facade) == before
+    # The torn tail is cut off, so new records follow the last intact one
+    facade.create_user({"first_name": "After", "last_name": "Crash", "email": "after@durable.hbnb"})
+    before = state(facade)
+    store.close()
+
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    store.close()
+
+
+def test_crash_after_the_snapshot_skips_the_merged_log(tmp_path):
+    facade, store = reopen(tmp_path, snapshot_every=1000)
+    populate(facade)
+    with open(store.log_path, 'rb') as log:
+        merged_log = log.read()
+    store.compact()
+    before = state(facade)
+    store.close()
+    # As if the process died after the new snapshot was renamed into
+    # place but before the merged log was removed
+    with open(store.old_log_path, 'wb') as log:
+        log.write(merged_log)
+
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    store.close()
+    assert not os.path.exists(store.old_log_path)
+
+
+def test_crash_before_the_merge_replays_and_merges_the_rotated_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(DurableStore, '_start_compactor', lambda store: None)
+    facade, store = reopen(tmp_path, fsync='never', snapshot_every=5)
+    populate(facade)
+    before = state(facade)
+    # The process dies with journal.old rotated out but never merged
+    assert os.path.exists(store.old_log_path)
+    monkeypatch.undo()
+
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    store.close()
+    assert not os.path.exists(store.old_log_path)
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    store.close()
+
+
+def test_writes_carry_on_while_the_log_is_merged(tmp_path, monkeypatch):
+    merging = threading.Event()
+    release = threading.Event()
+    original = DurableStore._merged
+
+    def blocked(store, changes):
+        merging.set()
+        assert release.wait(10)
+        return original(store, changes)
+    monkeypatch.setattr(DurableStore, '_merged', blocked)
+
+    facade, store = reopen(tmp_path, snapshot_every=3)
+    populate(facade)
+    assert merging.wait(10)
+    written = [facade.create_amenity({"name": f"Amenity {number}"}) for number in range(20)]
+    release.set()
+    before = state(facade)
+    store.close()
+
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    assert all(facade.get_amenity(amenity.id) for amenity in written)
+    store.close()
+
+
+def test_concurrent_writes_replay_to_the_same_state(tmp_path):
+    facade, store = reopen(tmp_path, fsync='never', snapshot_every=50)
+    created = []
+    errors = []
+
+    def writer(number):
+        try:
+            for round_ in range(150):
+                user = facade.create_user({"first_name": "Writer", "last_name": str(number),
+                                           "email": f"w{number}-{round_}@durable.hbnb"})
+                created.append(user.id)
+                facade.update_user(user.id, {"first_name": f"Round{round_}"})
+                # Delete users other writers may still be adding or saving
+                if round_ % 2 and len(created) > 4:
+                    facade.user_repo.delete(created[-3])
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=writer, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    before = state(facade)
+    store.close()
+
+    facade, store = reopen(tmp_path)
+    assert state(facade) == before
+    store.close()
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository, ReadWriteLock
+
+WRITERS = 4
+READERS = 8
+ROUNDS = 300
+
+
+def test_writer_is_not_starved_by_overlapping_readers():
+    lock = ReadWriteLock()
+    stop = threading.Event()
+
+    def reader():
+        # Back-to-back reads from several threads: the lock is never free
+        # unless waiting writers hold new readers off
+        while not stop.is_set():
+            with lock.read():
+                time.sleep(0.001)
+
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in readers:
+        thread.start()
+    try:
+        time.sleep(0.05)
+        for _ in range(20):
+            acquired = threading.Event()
+
+            def writer():
+                with lock.write():
+                    acquired.set()
+            thread = threading.Thread(target=writer)
+            thread.start()
+            assert acquired.wait(2), "writer starved by readers"
+            thread.join()
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+
+def test_indexes_match_a_full_scan_after_concurrent_writes():
+    repo = InMemoryRepository(unique=('email',), indexed=('last_name',))
+    stop = threading.Event()
+    errors = []
+    finished = []
+
+    def writer(number):
+        try:
+            live = []
+            for round_ in range(ROUNDS):
+                user = User("Writer", f"Family{round_ % 7}", f"w{number}-{round_}@threads.hbnb")
+                repo.add(user)
+                live.append(user)
+                if round_ % 2:
+                    live[-2].update({"last_name": f"Family{(round_ + 3) % 7}",
+                                     "email": f"w{number}-{round_}-moved@threads.hbnb"})
+                if round_ % 3 == 0 and len(live) > 2:
+                    repo.delete(live.pop(0).id)
+            finished.append(number)
+        except Exception as error:
+            errors.append(error)
+
+    def reader():
+        try:
+            while not stop.is_set():
+                for user in repo.get_all():
+                    # A stored user is findable by its email unless it was
+                    # changed or deleted since the snapshot
+                    found = repo.get_by_attribute('email', user.email)
+                    assert found is None or found is user or found.email != user.email
+                repo.get_all_by_attribute('last_name', "Family3")
+        except Exception as error:
+            errors.append(error)
+
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    writers = [threading.Thread(target=writer, args=(number,)) for number in range(WRITERS)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join(10)
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors, errors
+    # Every writer got through its work while the readers kept going
+    assert sorted(finished) == list(range(WRITERS))
+
+    stored = repo.get_all()
+    assert repo._unique['email'] == {user.email: user for user in stored}
+    by_last_name = {}
+    for user in stored:
+        by_last_name.setdefault(user.last_name, {})[user.id] = user
+    assert repo._indexed['last_name'] == by_last_name
+    for user in stored:
+        assert repo.get_by_attribute('email', user.email) is user
+        assert user in repo.get_all_by_attribute('last_name', user.last_name)
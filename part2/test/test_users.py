@@ -0,0 +1,22 @@
+import pytest
+
+from app.services.facade import HBnBFacade
+
+
+@pytest.mark.parametrize('data', [
+    {"first_name": "Changed", "email": "taken@users.hbnb"},
+    {"first_name": "Changed", "last_name": "", "email": "free@users.hbnb"},
+    {"first_name": "Changed", "email": "not-an-email"},
+])
+def test_rejected_update_changes_nothing(data):
+    facade = HBnBFacade()
+    facade.create_user({"first_name": "Taken", "last_name": "User", "email": "taken@users.hbnb"})
+    user = facade.create_user({"first_name": "Mine", "last_name": "User", "email": "mine@users.hbnb"})
+    updated_at = user.updated_at
+
+    with pytest.raises(ValueError):
+        facade.update_user(user.id, data)
+    assert (user.first_name, user.last_name, user.email) == ("Mine", "User", "mine@users.hbnb")
+    assert user.updated_at == updated_at
+    assert facade.user_repo.get_by_attribute('email', "mine@users.hbnb") is user
+    assert facade.user_repo.get_by_attribute('email', "free@users.hbnb") is None
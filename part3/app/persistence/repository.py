@@ -33,11 +33,32 @@ class Repository(ABC):
 
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Objects kept in a dict by id, with optional secondary hash indexes.
+
+    unique and indexed name attributes to index: a unique index maps each
+    value to its one object (a second object with that value is rejected
+    with ValueError), a non-unique index maps each value to the objects
+    having it. get_by_attribute and get_all_by_attribute on an indexed
+    attribute are dict lookups instead of scans. The indexes follow add,
+    update and delete; an indexed attribute assigned directly on a stored
+    object is not seen until the object is added again.
+    """
+
+    def __init__(self, unique=(), indexed=()):
         self._storage = {}
+        self._unique = {attr_name: {} for attr_name in unique}
+        self._indexed = {attr_name: {} for attr_name in indexed}
 
     def add(self, obj):
+        for attr_name, index in self._unique.items():
+            self._check_unique(attr_name, index, getattr(obj, attr_name), obj)
+        if obj.id in self._storage:
+            self.delete(obj.id)
         self._storage[obj.id] = obj
+        for attr_name, index in self._unique.items():
+            index[getattr(obj, attr_name)] = obj
+        for attr_name, index in self._indexed.items():
+            index.setdefault(getattr(obj, attr_name), {})[obj.id] = obj
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
@@ -47,16 +68,74 @@ class InMemoryRepository(Repository):
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
-        if obj:
-            obj.update(data)
+        if not obj:
+            return
+        old_values = {attr_name: getattr(obj, attr_name)
+                      for attr_name in (*self._unique, *self._indexed)}
+        obj.update(data)
+        if old_values:
+            self._reindex(obj, old_values)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        obj = self._storage.pop(obj_id, None)
+        if obj is None:
+            return
+        for attr_name, index in self._unique.items():
+            index.pop(getattr(obj, attr_name), None)
+        for attr_name, index in self._indexed.items():
+            self._unindex(index, getattr(obj, attr_name), obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._unique:
+            return self._unique[attr_name].get(attr_value)
+        if attr_name in self._indexed:
+            return next(iter(self._indexed[attr_name].get(attr_value, {}).values()), None)
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
-    
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._unique:
+            obj = self._unique[attr_name].get(attr_value)
+            return [obj] if obj is not None else []
+        if attr_name in self._indexed:
+            return list(self._indexed[attr_name].get(attr_value, {}).values())
+        return [obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value]
+
+    def _reindex(self, obj, old_values):
+        """Move obj to the index entries of its values after update().
+
+        A unique value already held by another object puts the old values
+        back and raises ValueError.
+        """
+        try:
+            for attr_name, index in self._unique.items():
+                self._check_unique(attr_name, index, getattr(obj, attr_name), obj)
+        except ValueError:
+            for attr_name, old_value in old_values.items():
+                setattr(obj, attr_name, old_value)
+            raise
+        for attr_name, index in self._unique.items():
+            new_value = getattr(obj, attr_name)
+            if index.get(old_values[attr_name]) is obj:
+                del index[old_values[attr_name]]
+            index[new_value] = obj
+        for attr_name, index in self._indexed.items():
+            self._unindex(index, old_values[attr_name], obj.id)
+            index.setdefault(getattr(obj, attr_name), {})[obj.id] = obj
+
+    @staticmethod
+    def _check_unique(attr_name, index, value, obj):
+        holder = index.get(value)
+        if holder is not None and holder.id != obj.id:
+            raise ValueError(f"{attr_name.capitalize()} '{value}' is already in use")
+
+    @staticmethod
+    def _unindex(index, value, obj_id):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del index[value]
+
 
 class SQLAlchemyRepository(Repository):
     def __init__(self, model):
@@ -11,7 +11,7 @@ class HBnBFacade:
         self.user_repo = SQLAlchemyRepository(User)
         self.amenity_repo = InMemoryRepository()
         self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
+        self.review_repo = InMemoryRepository(indexed=('place',))
 
     # User Methods -----------------------------------------------------------
     def create_user(self, user_data):
@@ -170,7 +170,10 @@ class HBnBFacade:
         return self.review_repo.get_all()
     
     def get_reviews_by_place(self, place_id):
-        return [review for review in self.review_repo.get_all() if review.place.id == place_id]
+        place = self.get_place(place_id)
+        if not place:
+            return []
+        return self.review_repo.get_all_by_attribute('place', place)
 
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
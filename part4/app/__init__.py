@@ -13,7 +13,17 @@ from config import DevelopmentConfig
 from app.extensions import bcrypt
 from app.extensions import jwt
 from app.extensions import db
+from app.extensions import password_pool
+from app.hashing import PasswordPoolBusy
 from app.services import facade
+from app.persistence.cache import repository_cache
+from app.response_cache import response_cache
+from app.serialization import serializer
+from app.persistence.engine import sqlite_tuning
+from app.persistence.unit_of_work import unit_of_work
+from app.commands import (db_status_command, db_upgrade_command, rebuild_ratings_command,
+                          replicate_command)
+from app.persistence.replica import replica_router
 
 def seed_admin_user(app):
     with app.app_context():
@@ -22,15 +32,17 @@ def seed_admin_user(app):
         first_name = app.config['ADMIN_FIRST_NAME']
         last_name = app.config['ADMIN_LAST_NAME']
 
-        existing_user = facade.get_user_by_email(email)
-        if not existing_user:
-            facade.create_user({
-                "first_name": first_name,
-                "last_name": last_name,
-                "email": email,
-                "password": password,
-                "is_admin": True
-            })
+        # One unit of work so the lookup reads the primary, not a replica
+        with unit_of_work.transaction():
+            existing_user = facade.get_user_by_email(email)
+            if not existing_user:
+                facade.create_user({
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "email": email,
+                    "password": password,
+                    "is_admin": True
+                })
 
 
 def create_app(config_class=DevelopmentConfig):
@@ -38,9 +50,20 @@ def create_app(config_class=DevelopmentConfig):
     app.config.from_object(config_class)
 
     bcrypt.init_app(app)
+    password_pool.init_app(app)
+    repository_cache.init_app(app)
+    response_cache.init_app(app)
+    serializer.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    sqlite_tuning.init_app(app)
+    unit_of_work.init_app(app)
+    replica_router.init_app(app)
     CORS(app)
+    app.cli.add_command(rebuild_ratings_command)
+    app.cli.add_command(replicate_command)
+    app.cli.add_command(db_upgrade_command)
+    app.cli.add_command(db_status_command)
 
     with app.app_context():
         db.create_all()
@@ -57,6 +80,12 @@ def create_app(config_class=DevelopmentConfig):
         authorizations=app.config['RESTX_AUTHORIZE'],
         security=app.config['RESTX_SECURITY']
     )
+    api.representation('application/json')(serializer.output_json)
+
+    @api.errorhandler(PasswordPoolBusy)
+    def handle_password_pool_busy(error):
+        """Shed load when bcrypt is saturated instead of queueing requests"""
+        return {'error': 'Server busy, please retry'}, 503, {'Retry-After': str(error.retry_after)}
 
     # Register the users namespace
     api.add_namespace(users_ns, path='/api/v1/users')
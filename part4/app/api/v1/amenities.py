@@ -1,6 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
 from app.services import facade
+from app.api.v1.pagination import page_parser, page_args, page_response
+from app.api.v1.batch import batch_items, batch_args, batch_response
+from app.response_cache import response_cache
+from app.api.v1.conditional import (collection_validators, item_validators,
+                                    not_modified, validator_headers)
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -9,6 +14,8 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
+amenity_list_parser = page_parser(api, ['created_at', 'name'])
+
 @api.route('/')
 class AmenityList(Resource):
     @api.expect(amenity_model)
@@ -30,22 +37,79 @@ class AmenityList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(amenity_list_parser)
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid pagination arguments')
+    @response_cache.cached('amenity')
     def get(self):
         """Retrieve all amenities"""
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        args = amenity_list_parser.parse_args()
+        validators = collection_validators('amenity')
+        cached = not_modified(*validators)
+        if cached:
+            return cached
+        try:
+            page = facade.get_amenities_page(**page_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return page_response(page, lambda amenity: amenity.to_dict(),
+                             validator_headers(*validators))
+
+amenity_update_model = api.inherit('AmenityUpdate', amenity_model, {
+    'id': fields.String(required=True, description='ID of the amenity to update')
+})
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    @api.expect([amenity_model], validate=False)
+    @api.response(200, 'Per-item results and errors')
+    @api.response(400, 'Malformed batch')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """Create many amenities"""
+        if not get_jwt().get("is_admin", False):
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            items = batch_items(api.payload)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return batch_response(facade.create_amenities_batch(items, **batch_args()))
+
+    @api.expect([amenity_update_model], validate=False)
+    @api.response(200, 'Per-item results and errors')
+    @api.response(400, 'Malformed batch')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def put(self):
+        """Update many amenities"""
+        if not get_jwt().get("is_admin", False):
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            items = batch_items(api.payload)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return batch_response(facade.update_amenities_batch(items, **batch_args()))
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Not modified')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity by ID"""
+        validators = item_validators('amenity', amenity_id)
+        if not validators:
+            return {'error': 'Amenity not found'}, 404
+        cached = not_modified(*validators)
+        if cached:
+            return cached
         amenity = facade.get_amenity(amenity_id)
+        # Deleted between the validator lookup and this one
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return amenity.to_dict(), 200
+        return amenity.to_dict(), 200, validator_headers(*validators)
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
@@ -17,11 +17,10 @@ class Login(Resource):
         """Authenticate user and return a JWT token"""
         credentials = api.payload  # Get the email and password from the request payload
         
-        # Step 1: Retrieve the user based on the provided email
-        user = facade.get_user_by_email(credentials['email'])
-        
-        # Step 2: Check if the user exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
+        # Step 1 & 2: Retrieve the user and check the password
+        # (upgrades the stored hash if the bcrypt cost changed)
+        user = facade.authenticate_user(credentials['email'], credentials['password'])
+        if not user:
             return {'error': 'Invalid credentials'}, 401
 
         # Step 3: Create a JWT token with the user's id and is_admin flag
@@ -0,0 +1,25 @@
+from flask import current_app
+
+# Batch endpoints take a JSON array of items and answer 200 with
+#   {"results": [{"index": i, "id": ...}], "errors": [{"index": i, "error": ...}]}
+# where index is the item's position in the request. Valid items are written
+# in chunks of BATCH_CHUNK_SIZE, one transaction each; invalid items are
+# reported without affecting the rest of the batch.
+
+
+def batch_items(payload):
+    """The items of a batch request; raises ValueError if it is malformed."""
+    if not isinstance(payload, list):
+        raise ValueError('Expected a JSON array of items')
+    max_items = current_app.config['BATCH_MAX_ITEMS']
+    if len(payload) > max_items:
+        raise ValueError(f'At most {max_items} items per batch')
+    return payload
+
+
+def batch_args():
+    return {'chunk_size': current_app.config['BATCH_CHUNK_SIZE']}
+
+
+def batch_response(result):
+    return {'results': result.results, 'errors': result.errors}, 200
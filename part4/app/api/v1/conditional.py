@@ -0,0 +1,48 @@
+import hashlib
+
+from flask import request
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+
+from app.services import facade
+
+# HTTP conditional GET support (ETag / If-None-Match, Last-Modified /
+# If-Modified-Since). Validators come from updated_at, which the facade bumps
+# on every row whose representation changes, so a request whose copy is still
+# current is answered with 304 before anything is loaded or serialized.
+#
+# Collections only carry an ETag, over their table's generation counter
+# (see app/models/table_versions.py): a delete leaves max(updated_at)
+# unchanged, so Last-Modified alone would wrongly report an unmodified listing.
+
+
+def make_etag(*parts):
+    """Weak ETag over the version parts plus the query string (fields, page, ...)."""
+    raw = '|'.join(str(part) for part in parts + (request.query_string.decode(),))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def item_validators(entity, obj_id):
+    """(etag, last_modified) of one user/amenity/place/review, None if missing."""
+    version = facade.get_version(entity, obj_id)
+    if version is None:
+        return None
+    return make_etag(entity, obj_id, version), version
+
+
+def collection_validators(entity, filters=None):
+    version = facade.get_collection_version(entity, filters=filters)
+    return make_etag(entity, *version), None
+
+
+def validator_headers(etag, last_modified=None):
+    headers = {'ETag': quote_etag(etag, weak=True)}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag, last_modified=None):
+    """The 304 response if the client's copy is current, else None."""
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return '', 304, validator_headers(etag, last_modified)
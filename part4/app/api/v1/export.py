@@ -0,0 +1,42 @@
+from flask import current_app
+
+from app.persistence.pagination import DEFAULT_SORT, encode_cursor
+from app.serialization import serializer
+
+# Streaming exports for analytics jobs:
+#   ?format= ndjson (one JSON object per line, default) or csv
+#   ?cursor= the `cursor` value of the last row received, to resume
+# Rows come in (created_at, id) order, so rows created while an export is
+# running are picked up at its end or by the next resumed export.
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_parser(api):
+    parser = api.parser()
+    parser.add_argument('format', type=str, location='args', default='ndjson',
+                        choices=list(EXPORT_FORMATS), help='ndjson or csv')
+    parser.add_argument('cursor', type=str, location='args',
+                        help='cursor of the last row received, to resume an export')
+    return parser
+
+
+def export_args(args):
+    """facade.export_*() keywords from the shared export arguments."""
+    return {'cursor': args['cursor'], 'batch_size': current_app.config['EXPORT_BATCH_SIZE']}
+
+
+def export_response(columns, rows, export_format):
+    """Stream rows with a trailing `cursor` column holding each row's resume token."""
+    sort_index, id_index = columns.index(DEFAULT_SORT), columns.index('id')
+    columns = columns + ('cursor',)
+    rows = (tuple(row) + (encode_cursor(DEFAULT_SORT, row[sort_index], row[id_index]),)
+            for row in rows)
+    if export_format == 'csv':
+        chunks = serializer.iter_csv(columns, rows)
+    else:
+        chunks = serializer.iter_ndjson(dict(zip(columns, row)) for row in rows)
+    return serializer.stream_response(chunks, mimetype=EXPORT_FORMATS[export_format])
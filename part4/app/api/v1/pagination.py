@@ -0,0 +1,53 @@
+from flask import current_app
+
+from app.serialization import STREAM_CHUNK_SIZE, serializer
+
+# Query arguments shared by every paginated list endpoint:
+#   ?limit=  page size, capped by PAGINATION_MAX_LIMIT (no limit returns everything)
+#   ?cursor= X-Next-Cursor header value of the previous page
+#   ?sort=   one of the endpoint's sort keys, prefixed with '-' for descending
+
+
+def page_parser(api, sort_keys):
+    parser = api.parser()
+    parser.add_argument('limit', type=int, location='args',
+                        help='Maximum number of items to return')
+    parser.add_argument('cursor', type=str, location='args',
+                        help='X-Next-Cursor value from the previous page')
+    parser.add_argument('sort', type=str, location='args', default='created_at',
+                        choices=sort_keys + ['-' + key for key in sort_keys],
+                        help='Sort key, prefix with - for descending order')
+    return parser
+
+
+def clamp_limit(limit, default=None):
+    if limit is None:
+        return default
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, current_app.config['PAGINATION_MAX_LIMIT'])
+
+
+def page_args(args):
+    """Validate the shared pagination arguments into get_page() keywords."""
+    return {'limit': clamp_limit(args['limit']), 'cursor': args['cursor'], 'sort': args['sort']}
+
+
+def range_filters(args, field, min_arg, max_arg):
+    filters = []
+    if args.get(min_arg) is not None:
+        filters.append((field, 'ge', args[min_arg]))
+    if args.get(max_arg) is not None:
+        filters.append((field, 'le', args[max_arg]))
+    return filters
+
+
+def page_response(page, serialize, headers=None):
+    headers = dict(headers or {})
+    if page.next_cursor:
+        headers['X-Next-Cursor'] = page.next_cursor
+    if len(page.items) > STREAM_CHUNK_SIZE:
+        # Unbounded listings are encoded while they are sent
+        return serializer.stream_response(serializer.iter_list(page.items, serialize),
+                                           headers=headers)
+    return [serialize(item) for item in page.items], 200, headers
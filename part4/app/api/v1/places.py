@@ -1,6 +1,15 @@
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.pagination import page_parser, page_args, page_response, range_filters, clamp_limit
+from app.api.v1.projection import add_projection_arguments, requested_fields
+from app.api.v1.export import export_parser, export_args, export_response
+from app.api.v1.batch import batch_items, batch_args, batch_response
+from app.response_cache import response_cache
+from app.api.v1.conditional import (collection_validators, item_validators,
+                                    not_modified, validator_headers)
+from app.models.place import Place
 
 api = Namespace('places', description='Place operations')
 
@@ -13,6 +22,39 @@ place_model = api.model('Place', {
     'amenity_ids': fields.List(fields.String, required=False, description='List of Amenity IDs')
 })
 
+def add_filter_arguments(parser):
+    parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+    parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+    parser.add_argument('owner_id', type=str, location='args', help='Only places owned by this user')
+    parser.add_argument('min_rating', type=float, location='args', help='Minimum average rating')
+    parser.add_argument('max_rating', type=float, location='args', help='Maximum average rating')
+    return parser
+
+
+def place_filters(args):
+    filters = range_filters(args, 'price', 'min_price', 'max_price')
+    filters += range_filters(args, 'average_rating', 'min_rating', 'max_rating')
+    if args['owner_id']:
+        filters.append(('owner_id', 'eq', args['owner_id']))
+    return filters
+
+
+place_list_parser = page_parser(api, ['created_at', 'price', 'title', 'average_rating', 'review_count'])
+add_filter_arguments(place_list_parser)
+add_projection_arguments(place_list_parser)
+
+place_export_parser = add_filter_arguments(export_parser(api))
+
+place_detail_parser = add_projection_arguments(api.parser())
+
+search_parser = add_projection_arguments(api.parser())
+search_parser.add_argument('lat', type=float, location='args', help='Latitude of the search origin')
+search_parser.add_argument('lon', type=float, location='args', help='Longitude of the search origin')
+search_parser.add_argument('radius_km', type=float, location='args', help='Search radius around (lat, lon) in km')
+for bound in ('min_lat', 'max_lat', 'min_lon', 'max_lon'):
+    search_parser.add_argument(bound, type=float, location='args', help='Bounding box edge')
+search_parser.add_argument('limit', type=int, location='args', help='Maximum number of places to return')
+
 @api.route('/')
 class PlaceList(Resource):
     @api.expect(place_model, validate=True)
@@ -31,22 +73,130 @@ class PlaceList(Resource):
         except ValueError as e:
             return {"error": str(e)}, 400
 
+    @api.expect(place_list_parser)
     @api.response(200, 'List of places retrieved')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid pagination arguments')
+    @response_cache.cached('place', 'user', 'amenity', 'review')
     def get(self):
         """Get all places"""
-        places = facade.get_all_places()
-        return [place.to_dict() for place in places], 200
+        args = place_list_parser.parse_args()
+        filters = place_filters(args)
+        validators = collection_validators('place', filters)
+        cached = not_modified(*validators)
+        if cached:
+            return cached
+        try:
+            fields = requested_fields(args, Place)
+            page = facade.get_places_page(profile='place_list', fields=fields,
+                                          filters=filters, **page_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return page_response(page, lambda place: place.to_dict(fields),
+                             validator_headers(*validators))
+
+place_update_model = api.inherit('PlaceUpdate', place_model, {
+    'id': fields.String(required=True, description='ID of the place to update')
+})
+
+@api.route('/batch')
+class PlaceBatch(Resource):
+    @api.expect([place_model], validate=False)
+    @api.response(200, 'Per-item results and errors')
+    @api.response(400, 'Malformed batch')
+    @jwt_required()
+    def post(self):
+        """Create many places owned by the current user"""
+        try:
+            items = batch_items(api.payload)
+            result = facade.create_places_batch(items, get_jwt_identity(), **batch_args())
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return batch_response(result)
+
+    @api.expect([place_update_model], validate=False)
+    @api.response(200, 'Per-item results and errors')
+    @api.response(400, 'Malformed batch')
+    @jwt_required()
+    def put(self):
+        """Update many places; only their owner or an admin may update each"""
+        try:
+            items = batch_items(api.payload)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return batch_response(facade.update_places_batch(
+            items, get_jwt_identity(), is_admin=get_jwt().get("is_admin", False), **batch_args()))
+
+@api.route('/export')
+class PlaceExport(Resource):
+    @api.expect(place_export_parser)
+    @api.response(200, 'Places streamed as NDJSON or CSV')
+    @api.response(400, 'Invalid cursor')
+    def get(self):
+        """Stream every place, resumable from a cursor"""
+        args = place_export_parser.parse_args()
+        try:
+            columns, rows = facade.export_places(filters=place_filters(args), **export_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return export_response(columns, rows, args['format'])
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.expect(search_parser)
+    @api.response(200, 'Matching places, nearest first')
+    @api.response(400, 'Invalid search arguments')
+    @response_cache.cached('place', 'user', 'amenity', 'review')
+    def get(self):
+        """Search places within a radius or a bounding box"""
+        args = search_parser.parse_args()
+        bounds = [args[bound] for bound in ('min_lat', 'max_lat', 'min_lon', 'max_lon')]
+        has_bbox = any(bound is not None for bound in bounds)
+        if has_bbox and not all(bound is not None for bound in bounds):
+            return {'error': 'A bounding box needs min_lat, max_lat, min_lon and max_lon'}, 400
+
+        try:
+            fields = requested_fields(args, Place)
+            limit = clamp_limit(args['limit'], default=current_app.config['PAGINATION_MAX_LIMIT'])
+            results = facade.search_places(
+                latitude=args['lat'], longitude=args['lon'], radius_km=args['radius_km'],
+                bbox=bounds if has_bbox else None, limit=limit,
+                profile='place_list', fields=fields
+            )
+        except ValueError as error:
+            return {'error': str(error)}, 400
+
+        places = []
+        for place, distance in results:
+            data = place.to_dict(fields)
+            data['distance_km'] = round(distance, 3)
+            places.append(data)
+        return places, 200
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @api.expect(place_detail_parser)
     @api.response(200, 'Place details')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid fields')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place by ID"""
-        place = facade.get_place(place_id)
+        try:
+            fields = requested_fields(place_detail_parser.parse_args(), Place)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        validators = item_validators('place', place_id)
+        if not validators:
+            return {"error": "Place not found"}, 404
+        cached = not_modified(*validators)
+        if cached:
+            return cached
+        place = facade.get_place(place_id, profile='place_detail', fields=fields)
+        # Deleted between the validator lookup and this one
         if not place:
             return {"error": "Place not found"}, 404
-        return place.to_dict(), 200
+        return place.to_dict(fields), 200, validator_headers(*validators)
 
     @api.expect(place_model, validate=True)
     @api.response(200, 'Place updated successfully')
@@ -0,0 +1,26 @@
+# Query arguments selecting which to_dict() fields an endpoint renders:
+#   ?view=summary|full  predefined field sets (full is the default)
+#   ?fields=a,b,c       explicit field list, takes precedence over view
+# Only the selected columns and relationships are loaded from the database.
+
+
+def add_projection_arguments(parser):
+    parser.add_argument('view', type=str, location='args', default='full',
+                        choices=['summary', 'full'],
+                        help='summary renders a reduced set of fields')
+    parser.add_argument('fields', type=str, location='args',
+                        help='Comma-separated list of fields to render')
+    return parser
+
+
+def requested_fields(args, model):
+    """Return the field tuple to render, or None for the full representation."""
+    if args.get('fields'):
+        fields = tuple(name.strip() for name in args['fields'].split(',') if name.strip())
+        unknown = [name for name in fields if name not in model.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        return fields or None
+    if args.get('view') == 'summary':
+        return model.SUMMARY_FIELDS
+    return None
@@ -1,6 +1,14 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.pagination import page_parser, page_args, page_response, range_filters
+from app.response_cache import response_cache
+from app.api.v1.conditional import (collection_validators, item_validators,
+                                    not_modified, validator_headers)
+from app.api.v1.projection import add_projection_arguments, requested_fields
+from app.api.v1.export import export_parser, export_args, export_response
+from app.api.v1.batch import batch_items, batch_args, batch_response
+from app.models.review import Review
 
 api = Namespace('reviews', description='Review operations')
 
@@ -10,6 +18,29 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place being reviewed')
 })
 
+def add_filter_arguments(parser):
+    parser.add_argument('min_rating', type=int, location='args', help='Minimum rating')
+    parser.add_argument('max_rating', type=int, location='args', help='Maximum rating')
+    parser.add_argument('user_id', type=str, location='args', help='Only reviews written by this user')
+    return parser
+
+
+def review_filters(args):
+    filters = range_filters(args, 'rating', 'min_rating', 'max_rating')
+    if args['user_id']:
+        filters.append(('user_id', 'eq', args['user_id']))
+    return filters
+
+
+review_list_parser = add_filter_arguments(page_parser(api, ['created_at', 'rating']))
+add_projection_arguments(review_list_parser)
+
+review_export_parser = add_filter_arguments(export_parser(api))
+
+place_reviews_parser = add_projection_arguments(page_parser(api, ['created_at']))
+
+review_detail_parser = add_projection_arguments(api.parser())
+
 @api.route('/')
 class ReviewList(Resource):
     @api.expect(review_model)
@@ -36,32 +67,109 @@ class ReviewList(Resource):
         if place.owner.id == user.id:
             return {'error': 'Cannot review your own place'}, 403
 
-        for review in facade.get_all_reviews():
-            if review.place.id == place.id and review.user.id == user.id:
-                return {'error': 'You have already reviewed this place'}, 400
-
+        # The facade performs the single duplicate-review probe
         review_data['user_id'] = user.id
-        review = facade.create_review(review_data)
+        try:
+            review = facade.create_review(review_data)
+        except ValueError as error:
+            return {'error': str(error)}, 400
         return review.to_dict(), 201
 
+    @api.expect(review_list_parser)
     @api.response(200, 'List of reviews retrieved')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid pagination arguments')
+    @response_cache.cached('review', 'user')
     def get(self):
         """Get all reviews"""
-        reviews = facade.get_all_reviews()
-        return [review.to_dict() for review in reviews], 200
+        args = review_list_parser.parse_args()
+        filters = review_filters(args)
+        validators = collection_validators('review', filters)
+        cached = not_modified(*validators)
+        if cached:
+            return cached
+        try:
+            fields = requested_fields(args, Review)
+            page = facade.get_reviews_page(profile='review_list', fields=fields,
+                                           filters=filters, **page_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return page_response(page, lambda review: review.to_dict(fields),
+                             validator_headers(*validators))
+
+review_update_model = api.model('ReviewUpdate', {
+    'id': fields.String(required=True, description='ID of the review to update'),
+    'text': fields.String(required=False, description='Review text'),
+    'rating': fields.Integer(required=False, min=1, max=5, description='Rating from 1 to 5')
+})
+
+@api.route('/batch')
+class ReviewBatch(Resource):
+    @api.expect([review_model], validate=False)
+    @api.response(200, 'Per-item results and errors')
+    @api.response(400, 'Malformed batch')
+    @jwt_required()
+    def post(self):
+        """Create many reviews written by the current user"""
+        try:
+            items = batch_items(api.payload)
+            result = facade.create_reviews_batch(items, get_jwt_identity(), **batch_args())
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return batch_response(result)
+
+    @api.expect([review_update_model], validate=False)
+    @api.response(200, 'Per-item results and errors')
+    @api.response(400, 'Malformed batch')
+    @jwt_required()
+    def put(self):
+        """Update many reviews; only their author or an admin may update each"""
+        try:
+            items = batch_items(api.payload)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return batch_response(facade.update_reviews_batch(
+            items, get_jwt_identity(), is_admin=get_jwt().get("is_admin", False), **batch_args()))
+
+@api.route('/export')
+class ReviewExport(Resource):
+    @api.expect(review_export_parser)
+    @api.response(200, 'Reviews streamed as NDJSON or CSV')
+    @api.response(400, 'Invalid cursor')
+    def get(self):
+        """Stream every review, resumable from a cursor"""
+        args = review_export_parser.parse_args()
+        try:
+            columns, rows = facade.export_reviews(filters=review_filters(args), **export_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return export_response(columns, rows, args['format'])
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
+    @api.expect(review_detail_parser)
     @api.response(200, 'Review retrieved')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid fields')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review by ID"""
-        review = facade.get_review(review_id)
+        try:
+            fields = requested_fields(review_detail_parser.parse_args(), Review)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        validators = item_validators('review', review_id)
+        if not validators:
+            return {'error': 'Review not found'}, 404
+        cached = not_modified(*validators)
+        if cached:
+            return cached
 
+        review = facade.get_review(review_id, profile='review_detail', fields=fields)
+        # Deleted between the validator lookup and this one
         if not review:
             return {'error': 'Review not found'}, 404
-
-        return review.to_dict(), 200
+        return review.to_dict(fields), 200, validator_headers(*validators)
 
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
@@ -109,13 +217,27 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviews(Resource):
+    @api.expect(place_reviews_parser)
     @api.response(200, 'List of reviews for place retrieved')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid pagination arguments')
     @api.response(404, 'Place not found')
+    @response_cache.cached('review', 'user', 'place')
     def get(self, place_id):
         """Get all reviews from Place ID"""
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
 
-        reviews = facade.get_reviews_by_place(place_id)
-        return [review.to_dict() for review in reviews], 200
+        args = place_reviews_parser.parse_args()
+        validators = collection_validators('review', [('place_id', 'eq', place_id)])
+        cached = not_modified(*validators)
+        if cached:
+            return cached
+        try:
+            fields = requested_fields(args, Review)
+            page = facade.get_reviews_by_place(place_id, fields=fields, **page_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return page_response(page, lambda review: review.to_dict(fields),
+                             validator_headers(*validators))
@@ -1,6 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.pagination import page_parser, page_args, page_response
+from app.api.v1.conditional import (collection_validators, item_validators,
+                                    not_modified, validator_headers)
 
 api = Namespace('users', description='User operations')
 
@@ -22,6 +25,8 @@ user_update_model = api.model('UserUpdate', {
     'password': fields.String(required=False, description='User password', min_length=6)
 })
 
+user_list_parser = page_parser(api, ['created_at', 'first_name', 'last_name', 'email'])
+
 @api.route('/')
 class UserList(Resource):
     @api.expect(user_create_model, validate=True)
@@ -44,22 +49,41 @@ class UserList(Resource):
         new_user = facade.create_user(user_data)
         return new_user.to_dict(), 201
 
+    @api.expect(user_list_parser)
     @api.response(200, 'List of users retrieved')
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid pagination arguments')
     def get(self):
         """Get all users"""
-        users = facade.get_all_users()
-        return [ user.to_dict() for user in users ], 200
+        args = user_list_parser.parse_args()
+        validators = collection_validators('user')
+        cached = not_modified(*validators)
+        if cached:
+            return cached
+        try:
+            page = facade.get_users_page(**page_args(args))
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        return page_response(page, lambda user: user.to_dict(), validator_headers(*validators))
 
 @api.route('/<user_id>')
 class UserResource(Resource):
     @api.response(200, 'User details retrieved successfully')
+    @api.response(304, 'Not modified')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Get user by ID"""
+        validators = item_validators('user', user_id)
+        if not validators:
+            return {'error': 'User not found'}, 404
+        cached = not_modified(*validators)
+        if cached:
+            return cached
         user = facade.get_user(user_id)
+        # Deleted between the validator lookup and this one
         if not user:
             return {'error': 'User not found'}, 404
-        return user.to_dict(), 200
+        return user.to_dict(), 200, validator_headers(*validators)
 
     @api.expect(user_update_model, validate=True)
     @api.response(200, 'User updated successfully')
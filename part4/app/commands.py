@@ -0,0 +1,59 @@
+import click
+from flask.cli import with_appcontext
+
+from app.extensions import db
+from app.migrations import MigrationError, Migrator
+from app.persistence.replication import SQLiteReplicator
+from app.persistence.session import REPLICA_BIND
+from app.services import facade
+
+
+@click.command('rebuild-ratings')
+@with_appcontext
+def rebuild_ratings_command():
+    """Recompute every place's rating aggregates from its reviews."""
+    count = facade.rebuild_rating_aggregates()
+    click.echo(f"Rebuilt rating aggregates for {count} reviewed places")
+
+
+@click.command('replicate')
+@click.option('--interval', default=1.0, show_default=True,
+              help='Seconds between copies of the primary onto the replica.')
+@click.option('--once', is_flag=True, help='Copy once and exit.')
+@with_appcontext
+def replicate_command(interval, once):
+    """Keep the SQLite replica bind in sync with the primary database."""
+    primary, replica = db.engines[None], db.engines.get(REPLICA_BIND)
+    if replica is None or {primary.dialect.name, replica.dialect.name} != {'sqlite'}:
+        raise click.ClickException("Needs SQLite primary and replica databases")
+    replicator = SQLiteReplicator(primary.url.database, replica.url.database, interval)
+    if once:
+        replicator.sync()
+        return
+    click.echo(f"Copying {primary.url.database} to {replica.url.database} every {interval}s")
+    replicator.run()
+
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """Apply pending schema migrations; run at deploy time before starting workers."""
+    try:
+        applied = Migrator(db.engine).upgrade()
+    except MigrationError as error:
+        raise click.ClickException(str(error))
+    for migration in applied:
+        click.echo(f"Applied {migration.version:04d}_{migration.name}")
+    if not applied:
+        click.echo("Schema is up to date")
+
+
+@click.command('db-status')
+@with_appcontext
+def db_status_command():
+    """List schema migrations and whether each has been applied."""
+    migrator = Migrator(db.engine)
+    applied = migrator.applied()
+    for migration in migrator.migrations:
+        state = f"applied {applied[migration.version]}" if migration.version in applied else "pending"
+        click.echo(f"{migration.version:04d}_{migration.name}: {state}")
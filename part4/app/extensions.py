@@ -1,7 +1,10 @@
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.hashing import PasswordPool
+from app.persistence.session import RoutingSession
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+password_pool = PasswordPool()
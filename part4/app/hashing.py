@@ -0,0 +1,154 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+import bcrypt as _bcrypt
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing queue is full; the API answers 503 + Retry-After."""
+
+    def __init__(self, retry_after):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+def _hash_password(raw_password, rounds):
+    salt = _bcrypt.gensalt(rounds=rounds)
+    return _bcrypt.hashpw(raw_password.encode('utf-8'), salt).decode('utf-8')
+
+
+def _check_password(password_hash, raw_password):
+    return _bcrypt.checkpw(raw_password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def hash_cost(password_hash):
+    """Cost factor of a $2b$<cost>$... bcrypt hash, or None if unparseable."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class VerificationCache:
+    """Short-lived, size-bounded memory of successful password checks.
+
+    Entries are keyed by an HMAC of (user id, stored hash, password) under
+    a per-process random key, so neither passwords nor anything that can be
+    brute-forced offline are kept in memory. Changing the password changes
+    the stored hash and therefore invalidates the entry.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._key = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, user_id, password_hash, raw_password):
+        message = '\0'.join((user_id, password_hash, raw_password)).encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def contains(self, user_id, password_hash, raw_password):
+        digest = self._digest(user_id, password_hash, raw_password)
+        with self._lock:
+            expires_at = self._entries.get(digest)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[digest]
+                return False
+            return True
+
+    def add(self, user_id, password_hash, raw_password):
+        digest = self._digest(user_id, password_hash, raw_password)
+        with self._lock:
+            self._entries[digest] = time.monotonic() + self.ttl
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class PasswordPool:
+    """Runs bcrypt in a bounded process pool so it never blocks request workers.
+
+    At most PASSWORD_POOL_MAX_PENDING hash/verify jobs may be queued or
+    running; beyond that callers get PasswordPoolBusy immediately instead
+    of piling up behind the CPU. PASSWORD_POOL_WORKERS = 0 runs bcrypt
+    inline, which is what the tests use.
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = 0
+        self.timeout = None
+        self.retry_after = 1
+        self.cache = None
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.shutdown()
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        workers = app.config.get('PASSWORD_POOL_WORKERS')
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        max_pending = app.config.get('PASSWORD_POOL_MAX_PENDING') or 4 * max(self.workers, 1)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.timeout = app.config.get('PASSWORD_POOL_TIMEOUT')
+        self.retry_after = app.config.get('PASSWORD_POOL_RETRY_AFTER', 1)
+        cache_size = app.config.get('PASSWORD_VERIFY_CACHE_SIZE', 0)
+        cache_ttl = app.config.get('PASSWORD_VERIFY_CACHE_TTL', 0)
+        self.cache = VerificationCache(cache_size, cache_ttl) if cache_size and cache_ttl else None
+
+    def _get_executor(self):
+        # Started lazily so forking servers create the pool in each worker
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy(self.retry_after)
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordPoolBusy(self.retry_after)
+
+    def hash(self, raw_password):
+        return self._run(_hash_password, raw_password, self.rounds)
+
+    def verify(self, password_hash, raw_password, user_id=None):
+        """Check a password; successes for user_id may be served from the cache."""
+        cacheable = self.cache is not None and user_id is not None
+        if cacheable and self.cache.contains(user_id, password_hash, raw_password):
+            return True
+        valid = self._run(_check_password, password_hash, raw_password)
+        if valid and cacheable:
+            self.cache.add(user_id, password_hash, raw_password)
+        return valid
+
+    def needs_rehash(self, password_hash):
+        return hash_cost(password_hash) != self.rounds
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
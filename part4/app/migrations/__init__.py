@@ -0,0 +1,91 @@
+import importlib
+import pkgutil
+import re
+from collections import namedtuple
+
+from sqlalchemy import text
+
+from app.migrations import versions
+from app.models.base import utc_now
+
+# A script app/migrations/versions/NNNN_name.py defining upgrade(connection)
+Migration = namedtuple('Migration', ['version', 'name', 'upgrade'])
+
+_SCRIPT_NAME = re.compile(r'^(\d{4})_(\w+)$')
+
+
+class MigrationError(Exception):
+    """The database schema cannot be brought up to date by these scripts."""
+
+
+def load_migrations(package=versions):
+    """Every migration script in package, in version order."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _SCRIPT_NAME.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{package.__name__}.{module_info.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), module.upgrade))
+    migrations.sort()
+    for previous, migration in zip(migrations, migrations[1:]):
+        if previous.version == migration.version:
+            raise MigrationError(f"Duplicate migration version {migration.version:04d}")
+    return migrations
+
+
+class Migrator:
+    """Applies versioned, forward-only schema migrations.
+
+    Applied versions are recorded in schema_migrations. Each script runs
+    in its own transaction together with its version row, so a failing
+    script leaves the schema at the previous version (SQLite DDL is
+    transactional) and the next run retries it. There is no downgrade:
+    fixes ship as new scripts.
+
+    Scripts must also accept a database created by db.create_all() from
+    the current models, which already has their changes: use IF NOT
+    EXISTS and check for columns before adding them.
+    """
+
+    def __init__(self, engine, migrations=None):
+        self.engine = engine
+        self.migrations = load_migrations() if migrations is None else migrations
+
+    def _ensure_table(self, connection):
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "applied_at DATETIME NOT NULL)"
+        ))
+
+    def applied(self):
+        """{version: applied_at} of the migrations already run."""
+        with self.engine.begin() as connection:
+            self._ensure_table(connection)
+            return dict(connection.execute(text(
+                "SELECT version, applied_at FROM schema_migrations")).all())
+
+    def pending(self):
+        applied = self.applied()
+        known = {migration.version for migration in self.migrations}
+        unknown = sorted(set(applied) - known)
+        if unknown:
+            raise MigrationError(
+                f"Database has migrations this code does not know: {unknown}; deploy newer code")
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    def upgrade(self):
+        """Run every pending migration in order; returns the ones applied."""
+        applied = []
+        for migration in self.pending():
+            with self.engine.begin() as connection:
+                migration.upgrade(connection)
+                connection.execute(
+                    text("INSERT INTO schema_migrations (version, name, applied_at) "
+                         "VALUES (:version, :name, :applied_at)"),
+                    {"version": migration.version, "name": migration.name,
+                     "applied_at": utc_now()}
+                )
+            applied.append(migration)
+        return applied
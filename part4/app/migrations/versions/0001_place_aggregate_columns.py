@@ -0,0 +1,56 @@
+"""Add the grid cell and rating aggregate columns to places and backfill them.
+
+Databases created before these columns existed only have the original
+places table; db.create_all() never alters existing tables.
+"""
+from sqlalchemy import inspect, text
+
+# Frozen copy of the grid as this migration shipped (0.1 degree cells,
+# row * 3600 + col). It must not follow app.models.geo: a migration has to
+# write the same values whenever it runs.
+_CELL_DEGREES = 0.1
+_ROWS = 1800
+_COLS = 3600
+
+
+def grid_cell(latitude, longitude):
+    row = min(int((latitude + 90) / _CELL_DEGREES), _ROWS - 1)
+    col = min(int((longitude + 180) / _CELL_DEGREES), _COLS - 1)
+    return row * _COLS + col
+
+COLUMNS = [
+    ("grid_cell", "INTEGER"),
+    ("review_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("rating_sum", "INTEGER NOT NULL DEFAULT 0"),
+    ("average_rating", "FLOAT NOT NULL DEFAULT 0.0"),
+] + [(f"rating_{rating}_count", "INTEGER NOT NULL DEFAULT 0") for rating in range(1, 6)]
+
+
+def upgrade(connection):
+    existing = {column["name"] for column in inspect(connection).get_columns("places")}
+    missing = [(name, ddl) for name, ddl in COLUMNS if name not in existing]
+    if not missing:
+        return
+    for name, ddl in missing:
+        connection.execute(text(f"ALTER TABLE places ADD COLUMN {name} {ddl}"))
+
+    rows = connection.execute(text("SELECT id, latitude, longitude FROM places")).all()
+    if rows:
+        connection.execute(text("UPDATE places SET grid_cell = :cell WHERE id = :id"),
+                           [{"id": place_id, "cell": grid_cell(latitude, longitude)}
+                            for place_id, latitude, longitude in rows])
+
+    histogram = ", ".join(
+        f"rating_{rating}_count = (SELECT count(*) FROM reviews "
+        f"WHERE reviews.place_id = places.id AND reviews.rating = {rating})"
+        for rating in range(1, 6)
+    )
+    connection.execute(text(
+        "UPDATE places SET "
+        "review_count = (SELECT count(*) FROM reviews WHERE reviews.place_id = places.id), "
+        "rating_sum = (SELECT coalesce(sum(rating), 0) FROM reviews "
+        "WHERE reviews.place_id = places.id), "
+        "average_rating = (SELECT coalesce(avg(rating), 0.0) FROM reviews "
+        "WHERE reviews.place_id = places.id), "
+        f"{histogram}"
+    ))
@@ -0,0 +1,29 @@
+"""Create the secondary indexes declared on the models so far.
+
+db.create_all() only creates indexes together with their table, so
+databases whose tables predate these declarations never got them.
+"""
+from sqlalchemy import text
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_users_created_at ON users (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users (updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_amenities_created_at ON amenities (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_amenities_updated_at ON amenities (updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_places_created_at ON places (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_places_updated_at ON places (updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_places_price ON places (price)",
+    "CREATE INDEX IF NOT EXISTS ix_places_grid_cell ON places (grid_cell)",
+    "CREATE INDEX IF NOT EXISTS ix_places_average_rating ON places (average_rating)",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_created_at ON reviews (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_updated_at ON reviews (updated_at)",
+    # Fails if a user already reviewed a place twice; remove the duplicates first
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_reviews_user_id_place_id ON reviews (user_id, place_id)",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_place_id_created_at "
+    "ON reviews (place_id, created_at, id)",
+]
+
+
+def upgrade(connection):
+    for statement in INDEXES:
+        connection.execute(text(statement))
@@ -0,0 +1,15 @@
+"""Index the foreign keys that are filtered on without an index.
+
+places.owner_id is probed when a user's details change, and
+place_amenity.amenity_id when an amenity is renamed or deleted; the
+(place_id, amenity_id) primary key cannot serve amenity_id alone.
+reviews.user_id and reviews.place_id are already the leading columns of
+ix_reviews_user_id_place_id and ix_reviews_place_id_created_at.
+"""
+from sqlalchemy import text
+
+
+def upgrade(connection):
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id)"))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id)"))
@@ -0,0 +1,36 @@
+"""Create the table_versions generation counters and their triggers.
+
+Collection ETags come from these counters. db.create_all() creates the
+table and installs the triggers itself; this covers databases upgraded
+without it. The updated_at indexes only served the max(updated_at)
+validators these counters replace, so they are dropped.
+
+The statements are a frozen copy of app/models/table_versions.py as this
+migration shipped, so it does the same thing whenever it runs.
+"""
+from sqlalchemy import text
+
+TABLES = ('users', 'amenities', 'places', 'reviews')
+
+
+def upgrade(connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS table_versions ("
+        "name VARCHAR(64) NOT NULL PRIMARY KEY, version INTEGER NOT NULL)"
+    ))
+    # Other dialects have no counters and fall back to aggregating the rows
+    if connection.dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        connection.execute(text(
+            f"INSERT OR IGNORE INTO table_versions (name, version) "
+            f"VALUES ('{table}', abs(random() % 1000000000))"
+        ))
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_version_{operation.lower()} "
+                f"AFTER {operation} ON {table} BEGIN "
+                f"UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; "
+                f"END"
+            ))
+        connection.execute(text(f"DROP INDEX IF EXISTS ix_{table}_updated_at"))
@@ -1,21 +1,30 @@
 from app.extensions import db
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+def utc_now():
+    """Naive UTC datetime, as the DateTime columns store and compare it.
+
+    Every timestamp goes through here: updated_at is served as
+    Last-Modified, so local times on a non-UTC host would break it.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 class BaseModel(db.Model):
     __abstract__ = True  # Don't create a table for BaseModel
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utc_now, index=True)
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now)
 
     def __init__(self):
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self.created_at = self.updated_at = utc_now()
 
     def save(self):
-        self.updated_at = datetime.now()
+        self.updated_at = utc_now()
 
     def update(self, data):
         for key, value in data.items():
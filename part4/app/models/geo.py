@@ -0,0 +1,83 @@
+import math
+
+# Places are bucketed into a fixed latitude/longitude grid. The cell number
+# (row * GRID_COLS + col) is stored on each place and indexed, so a box
+# search becomes a handful of integer range scans instead of a table scan.
+GRID_CELL_DEGREES = 0.1
+GRID_ROWS = int(round(180 / GRID_CELL_DEGREES))
+GRID_COLS = int(round(360 / GRID_CELL_DEGREES))
+
+# Above this many grid rows a search collapses into one cell range; the exact
+# latitude/longitude filter that follows keeps the result correct
+MAX_RANGE_ROWS = 64
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def grid_row(latitude):
+    return min(int((latitude + 90) / GRID_CELL_DEGREES), GRID_ROWS - 1)
+
+
+def grid_col(longitude):
+    return min(int((longitude + 180) / GRID_CELL_DEGREES), GRID_COLS - 1)
+
+
+def grid_cell(latitude, longitude):
+    return grid_row(latitude) * GRID_COLS + grid_col(longitude)
+
+
+def cell_ranges(min_lat, max_lat, min_lon, max_lon, max_rows=MAX_RANGE_ROWS):
+    """Inclusive (start, end) cell ranges covering a box that does not cross the antimeridian."""
+    first_row, last_row = grid_row(min_lat), grid_row(max_lat)
+    first_col, last_col = grid_col(min_lon), grid_col(max_lon)
+    if max_rows is not None and last_row - first_row + 1 > max_rows:
+        return [(first_row * GRID_COLS + first_col, last_row * GRID_COLS + last_col)]
+    return [(row * GRID_COLS + first_col, row * GRID_COLS + last_col)
+            for row in range(first_row, last_row + 1)]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (math.sin(d_phi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def split_bbox(min_lat, max_lat, min_lon, max_lon):
+    """Split a box into boxes that do not cross the antimeridian.
+
+    A box whose min_lon is greater than its max_lon wraps around 180.
+    """
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise ValueError("Latitude bounds must satisfy -90 <= min_lat <= max_lat <= 90")
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError("Longitude bounds must be between -180 and 180")
+    if min_lon <= max_lon:
+        return [(min_lat, max_lat, min_lon, max_lon)]
+    return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+
+
+def radius_bboxes(latitude, longitude, radius_km):
+    """Boxes that together contain every point within radius_km of a point."""
+    if radius_km <= 0:
+        raise ValueError("radius_km must be greater than 0")
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle contains a pole: every longitude is in range
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    # Widest longitude offset reached by the circle (at its tangent points,
+    # which lie poleward of the centre)
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    d_lon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return split_bbox(min_lat, max_lat, min_lon, max_lon)
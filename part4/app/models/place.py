@@ -2,18 +2,45 @@ from app.models.base import BaseModel
 from app.extensions import db
 from sqlalchemy.orm import validates, relationship
 from app.models.associations import place_amenity
+from app.models.geo import grid_cell
 
 
 class Place(BaseModel):
     __tablename__ = 'places'
 
+    # Keys of to_dict(); ?view=summary listings such as the index page only need a few
+    FIELDS = ('id', 'title', 'description', 'price', 'latitude', 'longitude',
+              'owner_id', 'owner', 'amenities', 'reviews',
+              'review_count', 'average_rating', 'rating_histogram')
+    SUMMARY_FIELDS = ('id', 'title', 'price')
+    # Flat columns streamed by /places/export
+    EXPORT_FIELDS = ('id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_id',
+                     'review_count', 'average_rating', 'created_at', 'updated_at')
+    # Columns behind to_dict() keys that are not columns themselves
+    FIELD_COLUMNS = {
+        'rating_histogram': tuple(f"rating_{rating}_count" for rating in range(1, 6))
+    }
+
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    price = db.Column(db.Float, nullable=False)
+    price = db.Column(db.Float, nullable=False, index=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    # Spatial bucket of (latitude, longitude), kept in sync by the validators
+    grid_cell = db.Column(db.Integer, nullable=True, index=True)
+
+    # Rating aggregates maintained by the facade whenever a review is
+    # created, updated or deleted; rebuild with `flask rebuild-ratings`
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    average_rating = db.Column(db.Float, nullable=False, default=0.0, index=True)
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_5_count = db.Column(db.Integer, nullable=False, default=0)
 
-    owner_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False, index=True)
     owner = db.relationship("User", backref="places")
 
     amenities = relationship(
@@ -30,6 +57,11 @@ class Place(BaseModel):
         self.longitude = longitude
         self.owner_id = owner_id
         self.description = description or ""
+        self.review_count = 0
+        self.rating_sum = 0
+        self.average_rating = 0.0
+        for rating in range(1, 6):
+            setattr(self, f"rating_{rating}_count", 0)
 
     @validates('title')
     def validate_title(self, key, value):
@@ -47,30 +79,56 @@ class Place(BaseModel):
     def validate_latitude(self, key, value):
         if not (-90 <= value <= 90):
             raise ValueError("Latitude must be between -90 and 90")
+        if self.longitude is not None:
+            self.grid_cell = grid_cell(value, self.longitude)
         return value
 
     @validates('longitude')
     def validate_longitude(self, key, value):
         if not (-180 <= value <= 180):
             raise ValueError("Longitude must be between -180 and 180")
+        if self.latitude is not None:
+            self.grid_cell = grid_cell(self.latitude, value)
         return value
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "price": self.price,
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-            "owner_id": self.owner_id,
-            "owner": {
+    def to_dict(self, fields=None):
+        # Values are computed lazily so unrequested relationships are never loaded
+        values = {
+            "id": lambda: self.id,
+            "title": lambda: self.title,
+            "description": lambda: self.description,
+            "price": lambda: self.price,
+            "latitude": lambda: self.latitude,
+            "longitude": lambda: self.longitude,
+            "owner_id": lambda: self.owner_id,
+            "owner": lambda: {
                 "first_name": self.owner.first_name,
                 "last_name": self.owner.last_name
             } if self.owner else None,
-            "amenities": [a.to_dict() for a in self.amenities],
-            "reviews": [r.to_dict() for r in self.reviews]
+            "amenities": lambda: [a.to_dict() for a in self.amenities],
+            "reviews": lambda: [r.to_dict() for r in self.reviews],
+            "review_count": lambda: self.review_count,
+            "average_rating": lambda: self.average_rating,
+            "rating_histogram": lambda: {
+                str(rating): getattr(self, f"rating_{rating}_count") for rating in range(1, 6)
+            }
         }
+        return {name: values[name]() for name in (fields or self.FIELDS)}
+
+    def set_amenities(self, amenities):
+        """Make amenities the place's amenity list.
+
+        The collection is diffed rather than rebuilt, so the flush only
+        deletes and inserts the place_amenity rows that actually change.
+        """
+        wanted = {amenity.id for amenity in amenities}
+        current = {amenity.id for amenity in self.amenities}
+        for amenity in [a for a in self.amenities if a.id not in wanted]:
+            self.amenities.remove(amenity)
+        for amenity in amenities:
+            if amenity.id not in current:
+                self.amenities.append(amenity)
+                current.add(amenity.id)
 
     def update(self, data):
         for field in ['title', 'description', 'price', 'latitude', 'longitude']:
@@ -5,6 +5,12 @@ from sqlalchemy.orm import validates
 class Review(BaseModel):
     __tablename__ = 'reviews'
 
+    # Keys of to_dict(); ?view=summary listings skip the author
+    FIELDS = ('id', 'text', 'rating', 'user', 'place_id')
+    SUMMARY_FIELDS = ('id', 'text', 'rating', 'place_id')
+    # Flat columns streamed by /reviews/export
+    EXPORT_FIELDS = ('id', 'text', 'rating', 'user_id', 'place_id', 'created_at', 'updated_at')
+
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
 
@@ -14,6 +20,13 @@ class Review(BaseModel):
     place_id = db.Column(db.String(60), db.ForeignKey('places.id'), nullable=False)
     place = db.relationship("Place", backref="reviews")
 
+    # One review per user and place; also backs the duplicate-review probe.
+    # (place_id, created_at, id) serves the per-place listing and its keyset pages.
+    __table_args__ = (
+        db.Index('ix_reviews_user_id_place_id', 'user_id', 'place_id', unique=True),
+        db.Index('ix_reviews_place_id_created_at', 'place_id', 'created_at', 'id'),
+    )
+
     def __init__(self, text, rating, user_id, place_id):
         super().__init__()
         self.text = text
@@ -33,14 +46,16 @@ class Review(BaseModel):
             raise ValueError("Review text cannot be empty")
         return value
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "text": self.text,
-            "rating": self.rating,
-            "user": self.user.to_dict() if self.user else None,
-            "place_id": self.place_id
+    def to_dict(self, fields=None):
+        # Values are computed lazily so unrequested relationships are never loaded
+        values = {
+            "id": lambda: self.id,
+            "text": lambda: self.text,
+            "rating": lambda: self.rating,
+            "user": lambda: self.user.to_dict() if self.user else None,
+            "place_id": lambda: self.place_id
         }
+        return {name: values[name]() for name in (fields or self.FIELDS)}
 
     def update(self, data):
         if "rating" in data:
@@ -0,0 +1,47 @@
+from sqlalchemy import event, text
+
+from app.extensions import db
+
+# One generation counter per entity table, bumped by SQLite triggers on every
+# insert, update and delete of its rows, including bulk statements that never
+# go through the ORM. Collection validators read it with a primary key probe
+# instead of aggregating over the rows. The counters live in the database, so
+# every worker process and the read replica see the same values.
+table_versions = db.Table(
+    'table_versions',
+    db.Column('name', db.String(64), primary_key=True),
+    db.Column('version', db.Integer, nullable=False, default=0)
+)
+
+VERSIONED_TABLES = ('users', 'amenities', 'places', 'reviews')
+
+
+def version_statements():
+    """Idempotent statements seeding the counters and creating their triggers."""
+    statements = []
+    for table in VERSIONED_TABLES:
+        # A random start keeps a recreated database from reusing old ETags
+        statements.append(f"INSERT OR IGNORE INTO table_versions (name, version) "
+                          f"VALUES ('{table}', abs(random() % 1000000000))")
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_version_{operation.lower()} "
+                f"AFTER {operation} ON {table} BEGIN "
+                f"UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; "
+                f"END"
+            )
+    return statements
+
+
+def install_version_triggers(connection):
+    """Seed the counters and create the triggers; SQLite only."""
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in version_statements():
+        connection.execute(text(statement))
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _after_create(metadata, connection, **kwargs):
+    # create_all() fires this once all the tables exist, new database or not
+    install_version_triggers(connection)
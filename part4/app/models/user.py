@@ -1,5 +1,5 @@
 from app.models.base import BaseModel
-from app.extensions import db, bcrypt
+from app.extensions import db, password_pool
 from email_validator import validate_email, EmailNotValidError
 from sqlalchemy.orm import validates
 
@@ -20,13 +20,18 @@ class User(BaseModel):
         self.hash_password(password)
 
     def hash_password(self, raw_password):
-        self.password = bcrypt.generate_password_hash(raw_password).decode('utf-8')
+        # bcrypt runs in the password pool and may raise PasswordPoolBusy
+        self.password = password_pool.hash(raw_password)
 
     def set_password(self, raw_password):
         self.hash_password(raw_password)
 
     def verify_password(self, raw_password):
-        return bcrypt.check_password_hash(self.password, raw_password)
+        return password_pool.verify(self.password, raw_password, user_id=self.id)
+
+    def password_needs_rehash(self):
+        """True when the stored hash uses a cost other than BCRYPT_LOG_ROUNDS."""
+        return password_pool.needs_rehash(self.password)
 
     def to_dict(self):
         return {
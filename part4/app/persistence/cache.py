@@ -0,0 +1,276 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from app.extensions import db
+from app.persistence.replica import replica_router
+from app.persistence.repository import Repository
+
+
+class RepositoryCache:
+    """Process-wide LRU of row snapshots with a TTL and hit/miss counters.
+
+    Only column values are stored, never live ORM instances, so entries can
+    be shared safely between requests and sessions. Sized by
+    REPOSITORY_CACHE_SIZE and REPOSITORY_CACHE_TTL; a size of 0 disables
+    the shared cache (the per-request memo still applies).
+    """
+
+    def __init__(self, app=None):
+        self.max_entries = 0
+        self.ttl = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'request_hits': 0, 'hits': 0, 'misses': 0, 'invalidations': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('REPOSITORY_CACHE_SIZE', 0)
+        self.ttl = app.config.get('REPOSITORY_CACHE_TTL', 0)
+        self.clear()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, key, snapshot):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self.counters['invalidations'] += 1
+            self._entries.pop(key, None)
+
+    def invalidate_table(self, tablename):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == tablename]:
+                del self._entries[key]
+
+    def count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for counter in self.counters:
+                self.counters[counter] = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries))
+
+
+class CachedRepository(Repository):
+    """Read-through cache decorator around another Repository's get().
+
+    get() and get_many() first check a memo scoped to the current request,
+    then the shared RepositoryCache when it is enabled, and only then the
+    wrapped repository.
+    Calls with loader options bypass the cache because the eager loads they ask
+    for are not part of a snapshot. Every other method, including the
+    wrapped repository's own extras, is delegated unchanged.
+
+    Entries are invalidated by add/update/delete and, for changes made
+    directly on ORM objects, by the session flush/commit hooks below.
+    """
+
+    def __init__(self, repository, cache):
+        self.repository = repository
+        self.model = repository.model
+        self.cache = cache
+        _CACHED_MODELS.setdefault(self.model, cache)
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _key(self, obj_id):
+        return (self.model.__tablename__, obj_id)
+
+    def _request_memo(self):
+        if not has_app_context():
+            return {}
+        return g.setdefault('repository_memo', {})
+
+    def _snapshot(self, obj):
+        mapper = inspect(self.model)
+        return {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+
+    def _restore(self, obj_id, snapshot):
+        mapper = inspect(self.model)
+        identity_key = mapper.identity_key_from_primary_key((obj_id,))
+        existing = db.session.identity_map.get(identity_key)
+        if existing is not None:
+            return existing
+        obj = mapper.class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        # load=False attaches the instance without emitting a SELECT
+        return db.session.merge(obj, load=False)
+
+    def _lookup(self, memo, obj_id):
+        """obj_id from the request memo or the shared cache, else None."""
+        key = self._key(obj_id)
+        obj = memo.get(key)
+        # The memo is only valid while its objects belong to the live session
+        if obj is not None and obj in db.session:
+            self.cache.count('request_hits')
+            return obj
+        if not self.cache.enabled:
+            return None
+
+        snapshot = self.cache.get(key)
+        if snapshot is None:
+            self.cache.count('misses')
+            return None
+        self.cache.count('hits')
+        obj = self._restore(obj_id, snapshot)
+        memo[key] = obj
+        return obj
+
+    def _remember(self, memo, obj):
+        key = self._key(obj.id)
+        # Never cache values that are not committed yet, nor rows read from
+        # the lagging replica: the writer itself would be served them
+        if (self.cache.enabled and not inspect(obj).modified
+                and not replica_router.reading_from_replica()):
+            self.cache.set(key, self._snapshot(obj))
+        memo[key] = obj
+
+    def get(self, obj_id, options=None):
+        if options:
+            return self.repository.get(obj_id, options=options)
+
+        memo = self._request_memo()
+        obj = self._lookup(memo, obj_id)
+        if obj is None:
+            obj = self.repository.get(obj_id)
+            if obj is not None:
+                self._remember(memo, obj)
+        return obj
+
+    def get_many(self, obj_ids, options=None):
+        if options:
+            return self.repository.get_many(obj_ids, options=options)
+
+        # Serve what the caches hold and fetch the rest in one call
+        memo = self._request_memo()
+        obj_ids = list(dict.fromkeys(obj_ids))
+        found = {}
+        for obj_id in obj_ids:
+            obj = self._lookup(memo, obj_id)
+            if obj is not None:
+                found[obj_id] = obj
+        fetched, missing = self.repository.get_many(
+            [obj_id for obj_id in obj_ids if obj_id not in found])
+        for obj in fetched:
+            self._remember(memo, obj)
+            found[obj.id] = obj
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found], missing
+
+    def invalidate(self, obj_id):
+        """Drop obj_id now and again once the current transaction commits."""
+        key = self._key(obj_id)
+        self.cache.invalidate(key)
+        self._request_memo().pop(key, None)
+        db.session.info.setdefault('cache_invalidations', set()).add((self.cache, key))
+
+    def invalidate_all(self):
+        self.cache.invalidate_table(self.model.__tablename__)
+        self._request_memo().clear()
+
+    def add(self, obj):
+        self.repository.add(obj)
+        self.invalidate(obj.id)
+
+    def add_many(self, objs):
+        self.repository.add_many(objs)
+
+    def existing_values(self, attr_name, values):
+        return self.repository.existing_values(attr_name, values)
+
+    def get_all(self, options=None):
+        return self.repository.get_all(options=options)
+
+    def get_page(self, limit=None, cursor=None, filters=None, sort=None, options=None):
+        return self.repository.get_page(limit=limit, cursor=cursor, filters=filters,
+                                        sort=sort, options=options)
+
+    def update(self, obj_id, data):
+        self.repository.update(obj_id, data)
+        self.invalidate(obj_id)
+
+    def delete(self, obj_id):
+        self.repository.delete(obj_id)
+        self.invalidate(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self.repository.get_by_attribute(attr_name, attr_value)
+
+    def exists(self, **filters):
+        return self.repository.exists(**filters)
+
+    def get_version(self, obj_id):
+        return self.repository.get_version(obj_id)
+
+    def get_collection_version(self, filters=None):
+        return self.repository.get_collection_version(filters=filters)
+
+    def iter_rows(self, columns, batch_size=1000, cursor=None, filters=None):
+        return self.repository.iter_rows(columns, batch_size=batch_size, cursor=cursor,
+                                         filters=filters)
+
+
+# Model -> RepositoryCache for every model wrapped by a CachedRepository
+_CACHED_MODELS = {}
+
+
+@event.listens_for(db.session, 'after_flush')
+def _invalidate_flushed(session, flush_context):
+    pending = session.info.setdefault('cache_invalidations', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        cache = _CACHED_MODELS.get(type(obj))
+        if cache is not None:
+            key = (obj.__tablename__, obj.id)
+            cache.invalidate(key)
+            pending.add((cache, key))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_committed(session):
+    # A concurrent reader may have re-cached the old row between our flush
+    # and this commit; drop it once more now that the change is visible
+    for cache, key in session.info.pop('cache_invalidations', ()):
+        cache.invalidate(key)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_rolled_back(session):
+    for cache, key in session.info.pop('cache_invalidations', ()):
+        cache.invalidate(key)
+
+
+repository_cache = RepositoryCache()
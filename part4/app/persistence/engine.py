@@ -0,0 +1,59 @@
+import re
+
+from sqlalchemy import event, text
+
+from app.extensions import db
+
+# Pragma values are interpolated into SQL, so only plain words and integers pass
+_PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+def pragma_statement(name, value):
+    if not name.isidentifier() or not _PRAGMA_VALUE.match(str(value)):
+        raise ValueError(f"Invalid SQLite pragma: {name}={value!r}")
+    return f"PRAGMA {name}={value}"
+
+
+class SQLiteTuning:
+    """Applies SQLITE_PRAGMAS to every connection the SQLite engines open.
+
+    Most pragmas (synchronous, cache_size, mmap_size, busy_timeout) only
+    last for one connection, so they are set from a 'connect' event rather
+    than once at startup; journal_mode=WAL is stored in the database file
+    but re-asserting it is a no-op. Pool sizing is left to
+    SQLALCHEMY_ENGINE_OPTIONS, which Flask-SQLAlchemy hands to every bind.
+    Other dialects and an empty SQLITE_PRAGMAS are left untouched.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Validate eagerly so a bad setting fails at startup, not on first query
+        statements = [pragma_statement(name, value)
+                      for name, value in (app.config.get('SQLITE_PRAGMAS') or {}).items()]
+        if not statements:
+            return
+
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+
+        with app.app_context():
+            for engine in db.engines.values():
+                if engine.dialect.name == 'sqlite':
+                    event.listen(engine, 'connect', apply_pragmas)
+
+    def current(self, *names):
+        """{name: value} of the given pragmas on a pooled connection."""
+        with db.engine.connect() as connection:
+            return {name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                    for name in names if name.isidentifier()}
+
+
+sqlite_tuning = SQLiteTuning()
@@ -0,0 +1,74 @@
+from sqlalchemy.orm import joinedload, selectinload, load_only
+
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.pagination import parse_sort
+
+# Relationship loading strategies named after the endpoint that renders them.
+# Each profile loads exactly what that endpoint's to_dict() walks, so a page
+# renders in a fixed number of SELECTs no matter how many rows it holds.
+LOAD_PROFILES = {
+    'place_list': lambda: [
+        joinedload(Place.owner),
+        selectinload(Place.amenities),
+        selectinload(Place.reviews).joinedload(Review.user),
+    ],
+    'place_detail': lambda: [
+        joinedload(Place.owner),
+        selectinload(Place.amenities),
+        selectinload(Place.reviews).joinedload(Review.user),
+    ],
+    'review_list': lambda: [
+        joinedload(Review.user),
+    ],
+    'review_detail': lambda: [
+        joinedload(Review.user),
+    ],
+}
+
+
+# Loaders for relationship-valued to_dict() fields, used by projections
+RELATIONSHIP_LOADERS = {
+    (Place, 'owner'): lambda: [joinedload(Place.owner)],
+    (Place, 'amenities'): lambda: [selectinload(Place.amenities)],
+    (Place, 'reviews'): lambda: [selectinload(Place.reviews).joinedload(Review.user)],
+    (Review, 'user'): lambda: [joinedload(Review.user)],
+}
+
+
+def projection(model, fields, sort_key=None):
+    """Loader options that fetch only the columns and relationships in fields.
+
+    id and created_at (plus the sort key) are always loaded because
+    pagination builds cursors from them.
+    """
+    columns = {'id', 'created_at'}
+    if sort_key:
+        columns.add(sort_key)
+    options = []
+    for name in fields:
+        loader = RELATIONSHIP_LOADERS.get((model, name))
+        if loader:
+            options.extend(loader())
+        elif name in model.__table__.columns:
+            columns.add(name)
+        else:
+            columns.update(getattr(model, 'FIELD_COLUMNS', {}).get(name, ()))
+    return [load_only(*(getattr(model, column) for column in sorted(columns)))] + options
+
+
+def load_profile(name):
+    """Return the loader options for a named profile (no options for None)."""
+    if name is None:
+        return []
+    try:
+        return LOAD_PROFILES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown load profile: {name}")
+
+
+def load_options(model, profile=None, fields=None, sort=None):
+    """Projection options when specific fields are requested, else the profile."""
+    if fields:
+        return projection(model, fields, parse_sort(sort)[0])
+    return load_profile(profile)
@@ -0,0 +1,106 @@
+import base64
+import heapq
+import json
+import operator
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+# One page of a keyset-paginated listing; next_cursor is None on the last page
+Page = namedtuple('Page', ['items', 'next_cursor'])
+
+# Operators accepted in (field, op, value) filters. They work the same on
+# plain Python values and on SQLAlchemy columns.
+FILTER_OPERATORS = {
+    'eq': operator.eq,
+    'ge': operator.ge,
+    'le': operator.le,
+}
+
+DEFAULT_SORT = 'created_at'
+
+
+def parse_sort(sort):
+    """Split a sort key such as '-price' into ('price', True)."""
+    sort = sort or DEFAULT_SORT
+    return sort.lstrip('-'), sort.startswith('-')
+
+
+def encode_cursor(sort_key, value, obj_id):
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    raw = json.dumps([sort_key, value, obj_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, sort_key):
+    """Return the (value, id) position stored in a cursor for sort_key."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        key, value, obj_id = json.loads(raw)
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if key != sort_key:
+        raise ValueError("Cursor does not match the requested sort order")
+    return value, obj_id
+
+
+def make_page(rows, limit, sort_key=DEFAULT_SORT):
+    """Build a Page from up to limit + 1 rows fetched in (sort_key, id) order."""
+    if limit is None or len(rows) <= limit:
+        return Page(rows, None)
+    items = rows[:limit]
+    last = items[-1]
+    return Page(items, encode_cursor(sort_key, getattr(last, sort_key), last.id))
+
+
+def paginate_query(query, model, limit=None, cursor=None, filters=None, sort=None):
+    """Apply filters and keyset pagination on (sort_key, id) to a Query."""
+    sort_key, descending = parse_sort(sort)
+    column = getattr(model, sort_key)
+
+    for field, op, value in filters or []:
+        query = query.filter(FILTER_OPERATORS[op](getattr(model, field), value))
+
+    if cursor:
+        value, obj_id = decode_cursor(cursor, sort_key)
+        position = tuple_(column, model.id)
+        bound = tuple_(value, obj_id)
+        query = query.filter(position < bound if descending else position > bound)
+
+    if descending:
+        query = query.order_by(column.desc(), model.id.desc())
+    else:
+        query = query.order_by(column, model.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return make_page(query.all(), limit, sort_key)
+
+
+def paginate_objects(objects, limit=None, cursor=None, filters=None, sort=None):
+    """Same contract as paginate_query over an iterable of model objects."""
+    sort_key, descending = parse_sort(sort)
+    compare = operator.lt if descending else operator.gt
+
+    def position(obj):
+        return (getattr(obj, sort_key), obj.id)
+
+    matching = (
+        obj for obj in objects
+        if all(FILTER_OPERATORS[op](getattr(obj, field), value)
+               for field, op, value in filters or [])
+    )
+    if cursor:
+        bound = decode_cursor(cursor, sort_key)
+        matching = (obj for obj in matching if compare(position(obj), bound))
+
+    if limit is None:
+        rows = sorted(matching, key=position, reverse=descending)
+    elif descending:
+        rows = heapq.nlargest(limit + 1, matching, key=position)
+    else:
+        rows = heapq.nsmallest(limit + 1, matching, key=position)
+    return make_page(rows, limit, sort_key)
@@ -0,0 +1,200 @@
+from collections import defaultdict
+
+from sqlalchemy import Float, and_, bindparam, case, cast, func, or_, select, update
+
+from app.extensions import db
+from app.models.base import utc_now
+from app.models.geo import GRID_COLS, cell_ranges, grid_cell
+from app.models.place import Place
+from app.models.review import Review
+from app.models.associations import place_amenity
+from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository
+
+class PlaceRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Place)
+
+    def coordinates_in_boxes(self, boxes):
+        """(id, latitude, longitude) of the places inside any of the
+        (min_lat, max_lat, min_lon, max_lon) boxes; no ORM objects are built."""
+        # grid_cell ranges drive the ix_places_grid_cell index; the exact
+        # bounds then drop the neighbours that share a boundary cell
+        conditions = []
+        for min_lat, max_lat, min_lon, max_lon in boxes:
+            cells = or_(*(Place.grid_cell.between(start, end)
+                          for start, end in cell_ranges(min_lat, max_lat, min_lon, max_lon)))
+            conditions.append(and_(
+                cells,
+                Place.latitude.between(min_lat, max_lat),
+                Place.longitude.between(min_lon, max_lon)
+            ))
+        return (db.session.query(Place.id, Place.latitude, Place.longitude)
+                .filter(or_(*conditions)).all())
+
+    def touch_for_amenity(self, amenity_id):
+        """Places embedding an amenity whose name changed."""
+        self.touch(where=Place.id.in_(
+            select(place_amenity.c.place_id).where(place_amenity.c.amenity_id == amenity_id)
+        ))
+
+    def touch_for_user(self, user_id):
+        """Places embedding a user as owner or reviewer."""
+        self.touch(where=or_(
+            Place.owner_id == user_id,
+            Place.id.in_(select(Review.place_id).where(Review.user_id == user_id))
+        ))
+
+    def get_owners(self, place_ids):
+        """{place_id: owner_id} for the place_ids that exist."""
+        place_ids = list(place_ids)
+        if not place_ids:
+            return {}
+        return dict(db.session.query(Place.id, Place.owner_id).filter(Place.id.in_(place_ids)))
+
+    def link_amenities(self, pairs):
+        """Insert (place_id, amenity_id) rows in one executemany; the caller commits."""
+        if pairs:
+            db.session.execute(place_amenity.insert(),
+                               [{"place_id": place_id, "amenity_id": amenity_id}
+                                for place_id, amenity_id in pairs])
+
+    def apply_rating_change(self, place_id, added=None, removed=None):
+        """Adjust a place's rating aggregates for one added and/or removed rating."""
+        deltas = defaultdict(int)
+        if added is not None:
+            deltas[added] += 1
+        if removed is not None:
+            deltas[removed] -= 1
+        self.apply_rating_changes({place_id: deltas})
+
+    def apply_rating_changes(self, changes):
+        """Apply {place_id: {rating: count delta}} to the rating aggregates.
+
+        Runs as one relative executemany UPDATE in the current transaction,
+        so concurrent reviews never overwrite each other's counts; the
+        caller commits together with the review changes themselves. A place
+        with no deltas only has its updated_at bumped.
+        """
+        params = []
+        for place_id, deltas in changes.items():
+            row = {"b_id": place_id,
+                   "b_count": sum(deltas.values()),
+                   "b_sum": sum(rating * delta for rating, delta in deltas.items())}
+            row.update({f"b_rating_{rating}": deltas.get(rating, 0) for rating in range(1, 6)})
+            params.append(row)
+        if not params:
+            return
+
+        table = Place.__table__
+        # Bind names must differ from the column names in an executemany UPDATE
+        new_count = table.c.review_count + bindparam("b_count")
+        new_sum = table.c.rating_sum + bindparam("b_sum")
+        values = {
+            "updated_at": utc_now(),
+            "review_count": new_count,
+            "rating_sum": new_sum,
+            "average_rating": case(
+                (new_count > 0, cast(new_sum, Float) / new_count), else_=0.0
+            ),
+        }
+        for rating in range(1, 6):
+            column = f"rating_{rating}_count"
+            values[column] = table.c[column] + bindparam(f"b_rating_{rating}")
+        statement = table.update().where(table.c.id == bindparam("b_id")).values(values)
+        db.session.execute(statement, params)
+
+    def rebuild_rating_aggregates(self):
+        """Recompute every place's rating aggregates from the reviews table."""
+        histograms = {}
+        rows = db.session.execute(
+            select(Review.place_id, Review.rating, func.count())
+            .group_by(Review.place_id, Review.rating)
+        )
+        for place_id, rating, count in rows:
+            histograms.setdefault(place_id, [0] * 5)[rating - 1] = count
+
+        reset = {"review_count": 0, "rating_sum": 0, "average_rating": 0.0}
+        reset.update({f"rating_{rating}_count": 0 for rating in range(1, 6)})
+        db.session.execute(update(Place).values(reset),
+                           execution_options={"synchronize_session": False})
+
+        params = []
+        for place_id, histogram in histograms.items():
+            count = sum(histogram)
+            total = sum(rating * n for rating, n in enumerate(histogram, start=1))
+            row = {"review_count": count, "rating_sum": total, "average_rating": total / count}
+            row.update({f"rating_{rating}_count": n
+                        for rating, n in enumerate(histogram, start=1)})
+            # Bind names must differ from the column names in an executemany UPDATE
+            params.append({"b_id": place_id, **{f"b_{key}": value for key, value in row.items()}})
+        if params:
+            table = Place.__table__
+            columns = list(reset)
+            statement = (table.update()
+                         .where(table.c.id == bindparam("b_id"))
+                         .values({column: bindparam(f"b_{column}") for column in columns}))
+            db.session.execute(statement, params)
+        return len(params)
+
+
+class InMemoryPlaceRepository(InMemoryRepository):
+    """In-memory places with a grid index over (latitude, longitude)."""
+
+    def __init__(self):
+        super().__init__()
+        self._cells = defaultdict(dict)
+        self._cell_of = {}
+
+    def add(self, obj):
+        super().add(obj)
+        self._index(obj)
+
+    def update(self, obj_id, data):
+        super().update(obj_id, data)
+        obj = self.get(obj_id)
+        if obj:
+            self._index(obj)
+
+    def delete(self, obj_id):
+        self._unindex(obj_id)
+        super().delete(obj_id)
+
+    def _index(self, obj):
+        self._unindex(obj.id)
+        cell = grid_cell(obj.latitude, obj.longitude)
+        self._cells[cell][obj.id] = obj
+        self._cell_of[obj.id] = cell
+
+    def _unindex(self, obj_id):
+        cell = self._cell_of.pop(obj_id, None)
+        if cell is not None:
+            bucket = self._cells[cell]
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def _cells_in(self, min_lat, max_lat, min_lon, max_lon):
+        ranges = cell_ranges(min_lat, max_lat, min_lon, max_lon, max_rows=None)
+        if sum(end - start + 1 for start, end in ranges) <= len(self._cells):
+            for start, end in ranges:
+                for cell in range(start, end + 1):
+                    if cell in self._cells:
+                        yield self._cells[cell]
+            return
+        # Sparse grid: walking the occupied cells is cheaper than probing the box
+        first_row, first_col = divmod(ranges[0][0], GRID_COLS)
+        last_row, last_col = divmod(ranges[-1][1], GRID_COLS)
+        for cell, bucket in self._cells.items():
+            row, col = divmod(cell, GRID_COLS)
+            if first_row <= row <= last_row and first_col <= col <= last_col:
+                yield bucket
+
+    def coordinates_in_boxes(self, boxes):
+        found = {}
+        for min_lat, max_lat, min_lon, max_lon in boxes:
+            for bucket in self._cells_in(min_lat, max_lat, min_lon, max_lon):
+                for obj in bucket.values():
+                    if (min_lat <= obj.latitude <= max_lat
+                            and min_lon <= obj.longitude <= max_lon):
+                        found[obj.id] = (obj.id, obj.latitude, obj.longitude)
+        return list(found.values())
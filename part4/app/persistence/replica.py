@@ -0,0 +1,126 @@
+import functools
+import threading
+import time
+
+from flask import has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event
+
+from app.extensions import db
+from app.persistence.session import REPLICA_BIND
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _sqlite_query_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def _request_identity(verify=True):
+    """JWT identity of the current request, or None for anonymous requests."""
+    try:
+        if verify:
+            verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        # Rejecting a bad token is the view's job; for routing it is anonymous
+        return None
+
+
+class ReplicaRouter:
+    """Routes reads to the 'replica' bind of SQLALCHEMY_BINDS.
+
+    GET/HEAD requests, and facade methods decorated with @read_only when
+    called outside a request, read from the replica; every other request
+    and every unit of work uses the primary (see RoutingSession). Because
+    the replica lags, a JWT identity that committed a write reads from the
+    primary for READ_YOUR_WRITES_WINDOW seconds afterwards, which should
+    exceed the worst replication lag. The window is tracked per process.
+
+    Shared caches must not be filled from the replica, or a stale row
+    could outlive the window; they check reading_from_replica().
+    Without a replica bind every method is a no-op.
+    """
+
+    # Expired write marks are swept once this many identities are tracked
+    PRUNE_THRESHOLD = 10000
+
+    def __init__(self, app=None):
+        self.window = 0
+        self._writes = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.window = app.config.get('READ_YOUR_WRITES_WINDOW', 0)
+        with self._lock:
+            self._writes.clear()
+        app.before_request(self._route_request)
+        app.teardown_request(self._end_request)
+        with app.app_context():
+            replica = db.engines.get(REPLICA_BIND)
+            if replica is not None and replica.dialect.name == 'sqlite':
+                event.listen(replica, 'connect', _sqlite_query_only)
+
+    @staticmethod
+    def enabled():
+        return REPLICA_BIND in db.engines
+
+    def reading_from_replica(self):
+        return self.enabled() and bool(db.session().reads_from_replica())
+
+    def record_write(self, identity):
+        now = time.monotonic()
+        with self._lock:
+            self._writes[identity] = now
+            if len(self._writes) > self.PRUNE_THRESHOLD:
+                self._writes = {key: at for key, at in self._writes.items()
+                                if at + self.window > now}
+
+    def wrote_recently(self, identity):
+        with self._lock:
+            at = self._writes.get(identity)
+        return at is not None and at + self.window > time.monotonic()
+
+    def _route_request(self):
+        if not self.enabled():
+            return
+        db.session.info['read_replica'] = (request.method in SAFE_METHODS
+                                           and not self.wrote_recently(_request_identity()))
+
+    def _end_request(self, error=None):
+        db.session.info.pop('read_replica', None)
+
+    def read_only(self, func):
+        """Read from the replica when called outside a request."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = db.session
+            # Requests have already been routed by _route_request
+            if 'read_replica' in session.info or not self.enabled():
+                return func(*args, **kwargs)
+            wrote_at = session.info.get('wrote_at')
+            session.info['read_replica'] = wrote_at is None or wrote_at + self.window <= time.monotonic()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session.info.pop('read_replica', None)
+        return wrapper
+
+
+replica_router = ReplicaRouter()
+
+
+@event.listens_for(db.session, 'after_commit')
+def _record_commit(session):
+    if not replica_router.enabled():
+        return
+    # The session outlives its first commit outside requests (scripts, CLI)
+    session.info['wrote_at'] = time.monotonic()
+    if has_request_context():
+        identity = _request_identity(verify=False)
+        if identity is not None:
+            replica_router.record_write(identity)
@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+
+
+class SQLiteReplicator:
+    """Stand-in for real replication between two SQLite files.
+
+    sync() copies the primary onto the replica with SQLite's online backup
+    API, which yields a consistent snapshot even while the primary is
+    being written; start() repeats it every interval seconds from a
+    daemon thread, so the replica lags by up to one interval. Meant for
+    exercising read-replica routing locally (`flask replicate`), not for
+    production use.
+    """
+
+    def __init__(self, primary_path, replica_path, interval=1.0):
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def sync(self):
+        source = sqlite3.connect(self.primary_path)
+        try:
+            target = sqlite3.connect(self.replica_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.sync()
+            self._stopped.wait(self.interval)
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name='sqlite-replicator', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
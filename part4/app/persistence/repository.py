@@ -1,5 +1,16 @@
 from abc import ABC, abstractmethod
+
+from sqlalchemy import func, inspect, select, tuple_, update
+
 from app.extensions import db
+from app.models.base import utc_now
+from app.models.table_versions import table_versions
+from app.persistence.pagination import (DEFAULT_SORT, FILTER_OPERATORS, decode_cursor,
+                                        paginate_query, paginate_objects)
+
+# Values per IN (...) clause; stays well below SQLite's bound parameter limit
+IN_CHUNK_SIZE = 500
+
 
 class Repository(ABC):
     @abstractmethod
@@ -7,11 +18,31 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get(self, obj_id):
+    def add_many(self, objs):
+        """Stage already-validated objs for insertion; the caller commits."""
+
+    @abstractmethod
+    def existing_values(self, attr_name, values):
+        """The subset of values that some stored object has as attr_name."""
+
+    @abstractmethod
+    def get(self, obj_id, options=None):
+        pass
+
+    @abstractmethod
+    def get_many(self, obj_ids, options=None):
+        """(objects, missing_ids) for obj_ids, both in request order.
+
+        Duplicate ids are collapsed, so each object and each missing id is
+        reported once.
+        """
+
+    @abstractmethod
+    def get_all(self, options=None):
         pass
 
     @abstractmethod
-    def get_all(self):
+    def get_page(self, limit=None, cursor=None, filters=None, sort=None, options=None):
         pass
 
     @abstractmethod
@@ -26,62 +57,298 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def exists(self, **filters):
+        pass
+
+    @abstractmethod
+    def get_version(self, obj_id):
+        """updated_at of obj_id without loading it, or None if it does not exist."""
+
+    @abstractmethod
+    def get_collection_version(self, filters=None):
+        """A tuple that changes whenever the objects matching filters may have."""
+
+    @abstractmethod
+    def iter_rows(self, columns, batch_size=1000, cursor=None, filters=None):
+        """Tuples of column values in (created_at, id) order, after cursor.
+
+        Rows are fetched batch_size at a time, so memory does not grow with
+        the table. An invalid cursor raises ValueError before anything is
+        yielded.
+        """
+
+    def invalidate(self, obj_id):
+        """Hook for caching decorators; obj_id changed outside this repository."""
+
+    def invalidate_all(self):
+        """Hook for caching decorators; many rows changed outside this repository."""
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Objects kept in a dict by id, with optional secondary hash indexes.
+
+    unique and indexed name attributes to index: a unique index maps each
+    value to its one object (a second object with that value is rejected
+    with ValueError), a non-unique index maps each value to the objects
+    having it. get_by_attribute and get_all_by_attribute on an indexed
+    attribute are dict lookups instead of scans. The indexes follow add,
+    update and delete; an indexed attribute assigned directly on a stored
+    object is not seen until the object is added again.
+    """
+
+    def __init__(self, unique=(), indexed=()):
         self._storage = {}
+        self._unique = {attr_name: {} for attr_name in unique}
+        self._indexed = {attr_name: {} for attr_name in indexed}
 
     def add(self, obj):
+        for attr_name, index in self._unique.items():
+            self._check_unique(attr_name, index, getattr(obj, attr_name), obj)
+        if obj.id in self._storage:
+            self.delete(obj.id)
         self._storage[obj.id] = obj
+        for attr_name, index in self._unique.items():
+            index[getattr(obj, attr_name)] = obj
+        for attr_name, index in self._indexed.items():
+            index.setdefault(getattr(obj, attr_name), {})[obj.id] = obj
+
+    def add_many(self, objs):
+        for obj in objs:
+            self.add(obj)
 
-    def get(self, obj_id):
+    def existing_values(self, attr_name, values):
+        values = set(values)
+        return {getattr(obj, attr_name) for obj in self._storage.values()} & values
+
+    def get(self, obj_id, options=None):
         return self._storage.get(obj_id)
 
-    def get_all(self):
+    def get_many(self, obj_ids, options=None):
+        obj_ids = list(dict.fromkeys(obj_ids))
+        return ([self._storage[obj_id] for obj_id in obj_ids if obj_id in self._storage],
+                [obj_id for obj_id in obj_ids if obj_id not in self._storage])
+
+    def get_all(self, options=None):
         return list(self._storage.values())
 
+    def get_page(self, limit=None, cursor=None, filters=None, sort=None, options=None):
+        return paginate_objects(self._storage.values(), limit=limit, cursor=cursor,
+                                filters=filters, sort=sort)
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
-        if obj:
-            obj.update(data)
+        if not obj:
+            return
+        old_values = {attr_name: getattr(obj, attr_name)
+                      for attr_name in (*self._unique, *self._indexed)}
+        obj.update(data)
+        if old_values:
+            self._reindex(obj, old_values)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        obj = self._storage.pop(obj_id, None)
+        if obj is None:
+            return
+        for attr_name, index in self._unique.items():
+            index.pop(getattr(obj, attr_name), None)
+        for attr_name, index in self._indexed.items():
+            self._unindex(index, getattr(obj, attr_name), obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._unique:
+            return self._unique[attr_name].get(attr_value)
+        if attr_name in self._indexed:
+            return next(iter(self._indexed[attr_name].get(attr_value, {}).values()), None)
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
 
+    def get_all_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._unique:
+            obj = self._unique[attr_name].get(attr_value)
+            return [obj] if obj is not None else []
+        if attr_name in self._indexed:
+            return list(self._indexed[attr_name].get(attr_value, {}).values())
+        return [obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value]
+
+    def exists(self, **filters):
+        return any(
+            all(getattr(obj, key) == value for key, value in filters.items())
+            for obj in self._storage.values()
+        )
+
+    def get_version(self, obj_id):
+        obj = self.get(obj_id)
+        return obj.updated_at if obj else None
+
+    def get_collection_version(self, filters=None):
+        matching = [
+            obj.updated_at for obj in self._storage.values()
+            if all(FILTER_OPERATORS[op](getattr(obj, field), value)
+                   for field, op, value in filters or [])
+        ]
+        return len(matching), max(matching, default=None)
+
+    def iter_rows(self, columns, batch_size=1000, cursor=None, filters=None):
+        page = paginate_objects(self._storage.values(), cursor=cursor, filters=filters)
+        return (tuple(getattr(obj, column) for column in columns) for obj in page.items)
+
+    def _reindex(self, obj, old_values):
+        """Move obj to the index entries of its values after update().
+
+        A unique value already held by another object puts the old values
+        back and raises ValueError.
+        """
+        try:
+            for attr_name, index in self._unique.items():
+                self._check_unique(attr_name, index, getattr(obj, attr_name), obj)
+        except ValueError:
+            for attr_name, old_value in old_values.items():
+                setattr(obj, attr_name, old_value)
+            raise
+        for attr_name, index in self._unique.items():
+            new_value = getattr(obj, attr_name)
+            if index.get(old_values[attr_name]) is obj:
+                del index[old_values[attr_name]]
+            index[new_value] = obj
+        for attr_name, index in self._indexed.items():
+            self._unindex(index, old_values[attr_name], obj.id)
+            index.setdefault(getattr(obj, attr_name), {})[obj.id] = obj
+
+    @staticmethod
+    def _check_unique(attr_name, index, value, obj):
+        holder = index.get(value)
+        if holder is not None and holder.id != obj.id:
+            raise ValueError(f"{attr_name.capitalize()} '{value}' is already in use")
+
+    @staticmethod
+    def _unindex(index, value, obj_id):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del index[value]
+
 
 class SQLAlchemyRepository(Repository):
     def __init__(self, model):
         self.model = model
 
+    # Writes are only staged in the session; the facade's unit of work commits
+
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def add_many(self, objs):
+        # One executemany INSERT of the objects' column values; the objects
+        # themselves never enter the session, so nothing is tracked per row
+        keys = [attr.key for attr in inspect(self.model).column_attrs]
+        rows = [{key: getattr(obj, key) for key in keys} for obj in objs]
+        if rows:
+            db.session.execute(self.model.__table__.insert(), rows)
+
+    def existing_values(self, attr_name, values):
+        values = list(set(values))
+        column = getattr(self.model, attr_name)
+        found = set()
+        for start in range(0, len(values), IN_CHUNK_SIZE):
+            found.update(value for value, in db.session.query(column)
+                         .filter(column.in_(values[start:start + IN_CHUNK_SIZE])))
+        return found
+
+    def get(self, obj_id, options=None):
+        return db.session.get(self.model, obj_id, options=options)
+
+    def get_many(self, obj_ids, options=None):
+        obj_ids = list(dict.fromkeys(obj_ids))
+        found = {}
+        if not options:
+            # Like get(), reuse objects the session already holds
+            mapper = inspect(self.model)
+            for obj_id in obj_ids:
+                obj = db.session.identity_map.get(mapper.identity_key_from_primary_key((obj_id,)))
+                if obj is not None and not inspect(obj).expired:
+                    found[obj_id] = obj
+        # One IN query per IN_CHUNK_SIZE ids instead of one query per id
+        to_load = [obj_id for obj_id in obj_ids if obj_id not in found]
+        for start in range(0, len(to_load), IN_CHUNK_SIZE):
+            query = (self.model.query.options(*(options or []))
+                     .filter(self.model.id.in_(to_load[start:start + IN_CHUNK_SIZE])))
+            found.update((obj.id, obj) for obj in query)
+        return ([found[obj_id] for obj_id in obj_ids if obj_id in found],
+                [obj_id for obj_id in obj_ids if obj_id not in found])
+
+    def get_all(self, options=None):
+        return self.model.query.options(*(options or [])).all()
 
-    def get_all(self):
-        return self.model.query.all()
+    def get_page(self, limit=None, cursor=None, filters=None, sort=None, options=None):
+        query = self.model.query.options(*(options or []))
+        return paginate_query(query, self.model, limit=limit, cursor=cursor,
+                              filters=filters, sort=sort)
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
 
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter_by(**{attr_name: attr_value}).first()
     
     def get_by_attribute_multiple(self, filters: dict):
-        return self.model.query.filter_by(**filters).first()
\ No newline at end of file
+        return self.model.query.filter_by(**filters).first()
+
+    def exists(self, **filters):
+        # SELECT EXISTS(...) stops at the first matching index entry and
+        # never hydrates an ORM object
+        query = self.model.query.filter_by(**filters).exists()
+        return db.session.query(query).scalar()
+
+    def get_version(self, obj_id):
+        row = (db.session.query(self.model.updated_at)
+               .filter(self.model.id == obj_id).first())
+        return row[0] if row else None
+
+    def get_collection_version(self, filters=None):
+        # The table's generation counter: one primary key probe, whatever the
+        # filters. Any write to the table moves it, so filtered listings
+        # revalidate more often than strictly needed but never go stale.
+        version = db.session.execute(
+            select(table_versions.c.version)
+            .where(table_versions.c.name == self.model.__tablename__)
+        ).scalar()
+        if version is not None:
+            return (version,)
+        # No counter (not SQLite): aggregate over every matching row
+        query = db.session.query(func.count(self.model.id), func.max(self.model.updated_at))
+        for field, op, value in filters or []:
+            query = query.filter(FILTER_OPERATORS[op](getattr(self.model, field), value))
+        return tuple(query.one())
+
+    def iter_rows(self, columns, batch_size=1000, cursor=None, filters=None):
+        query = db.session.query(*(getattr(self.model, column) for column in columns))
+        for field, op, value in filters or []:
+            query = query.filter(FILTER_OPERATORS[op](getattr(self.model, field), value))
+        if cursor:
+            value, obj_id = decode_cursor(cursor, DEFAULT_SORT)
+            query = query.filter(tuple_(self.model.created_at, self.model.id) > tuple_(value, obj_id))
+        # yield_per streams from the DB cursor instead of buffering every row
+        query = (query.order_by(self.model.created_at, self.model.id)
+                 .execution_options(yield_per=batch_size))
+        return iter(query)
+
+    def touch(self, *obj_ids, where=None):
+        """Bump updated_at on obj_ids, or on the rows matching a SQL condition.
+
+        Used when a row's representation embeds data that changed elsewhere,
+        so its HTTP validators change too. Commits with the caller.
+        """
+        condition = where if where is not None else self.model.id.in_(obj_ids)
+        db.session.execute(
+            update(self.model).where(condition).values(updated_at=utc_now()),
+            execution_options={"synchronize_session": False}
+        )
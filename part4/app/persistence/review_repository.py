@@ -0,0 +1,26 @@
+from app.extensions import db
+from app.models.review import Review
+from app.persistence.repository import SQLAlchemyRepository
+
+class ReviewRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Review)
+
+    def get_reviews_by_place(self, place_id, limit=None, cursor=None, sort=None, options=None):
+        # Served by ix_reviews_place_id_created_at: WHERE place_id = ? plus
+        # a (created_at, id) range scan
+        return self.get_page(limit=limit, cursor=cursor, sort=sort,
+                             filters=[('place_id', 'eq', place_id)],
+                             options=options)
+
+    def reviewed_places(self, user_id, place_ids):
+        """The place_ids that user_id has already reviewed."""
+        place_ids = list(place_ids)
+        if not place_ids:
+            return set()
+        return {place_id for place_id, in db.session.query(Review.place_id).filter(
+            Review.user_id == user_id, Review.place_id.in_(place_ids))}
+
+    def touch_for_user(self, user_id):
+        """Reviews embedding a user whose details changed."""
+        self.touch(where=Review.user_id == user_id)
@@ -0,0 +1,32 @@
+from flask_sqlalchemy.session import Session
+
+# SQLALCHEMY_BINDS key of the read replica
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """db.session that sends reads to the replica bind when allowed.
+
+    A session reads from the replica only while info['read_replica'] is
+    set (see ReplicaRouter) and it is not writing: flushes, units of work
+    and sessions holding pending changes always use the primary. Reading
+    from the replica sets info['replica_reads'] so a later unit of work
+    can expire what was loaded before writing on top of it. Tables of
+    other binds are never rerouted.
+    """
+
+    def reads_from_replica(self):
+        return (self.info.get('read_replica')
+                and not self._flushing
+                # uow_depth is maintained by UnitOfWork.transaction()
+                and not self.info.get('uow_depth')
+                and not (self.new or self.deleted or self.dirty))
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is None and self.reads_from_replica():
+            engines = self._db.engines
+            if engine is engines.get(None) and REPLICA_BIND in engines:
+                self.info['replica_reads'] = True
+                return engines[REPLICA_BIND]
+        return engine
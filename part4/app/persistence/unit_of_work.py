@@ -0,0 +1,114 @@
+import functools
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.extensions import db
+
+
+def is_lock_error(error):
+    """True for SQLite's 'database is locked' / 'database table is locked'."""
+    return isinstance(error, OperationalError) and 'is locked' in str(error.orig)
+
+
+def _sqlite_connect(dbapi_connection, connection_record):
+    # Let SQLAlchemy, not pysqlite, decide when transactions begin; without
+    # this SAVEPOINT is unreliable on SQLite
+    dbapi_connection.isolation_level = None
+
+
+def _sqlite_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+class UnitOfWork:
+    """Transaction scope for the facade: one commit per unit of work.
+
+    Repositories only stage changes. The outermost transaction() commits
+    once on success and rolls back on any exception; nested transaction()
+    blocks become SAVEPOINTs, so a failing step can be undone without
+    abandoning the whole request. Methods decorated with @transactional
+    are additionally retried, with exponential backoff, when SQLite
+    reports that the database is locked.
+
+    Callbacks registered with on_commit() run once the outermost
+    transaction has committed, e.g. to invalidate caches only when the
+    new data is visible.
+    """
+
+    def __init__(self, app=None):
+        self.retries = 0
+        self.backoff = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.retries = app.config.get('TRANSACTION_RETRIES', 0)
+        self.backoff = app.config.get('TRANSACTION_RETRY_BACKOFF', 0)
+        with app.app_context():
+            engine = db.engine
+            if engine.dialect.name == 'sqlite' and not event.contains(engine, 'begin', _sqlite_begin):
+                event.listen(engine, 'connect', _sqlite_connect)
+                event.listen(engine, 'begin', _sqlite_begin)
+
+    @property
+    def depth(self):
+        return db.session.info.get('uow_depth', 0)
+
+    @contextmanager
+    def transaction(self):
+        session = db.session
+        depth = self.depth
+        session.info['uow_depth'] = depth + 1
+        try:
+            if depth:
+                with session.begin_nested():
+                    yield session
+                return
+            if session.info.pop('replica_reads', False):
+                # Objects read from the lagging replica must not be written back
+                session.expire_all()
+            try:
+                yield session
+                session.commit()
+            except BaseException:
+                session.rollback()
+                session.info.pop('uow_on_commit', None)
+                raise
+        finally:
+            session.info['uow_depth'] = depth
+        for callback in session.info.pop('uow_on_commit', ()):
+            callback()
+
+    def on_commit(self, callback):
+        """Run callback after the current unit of work commits, or now if there is none."""
+        if self.depth:
+            db.session.info.setdefault('uow_on_commit', []).append(callback)
+        else:
+            callback()
+
+    def run(self, func, *args, **kwargs):
+        """Call func inside a transaction, retrying it while the database is locked."""
+        attempt = 0
+        while True:
+            nested = self.depth > 0
+            try:
+                with self.transaction():
+                    return func(*args, **kwargs)
+            except OperationalError as error:
+                # A savepoint cannot be retried on its own; let the outermost caller do it
+                if nested or attempt >= self.retries or not is_lock_error(error):
+                    raise
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def transactional(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func, *args, **kwargs)
+        return wrapper
+
+
+unit_of_work = UnitOfWork()
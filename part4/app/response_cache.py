@@ -0,0 +1,252 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from flask import request
+from flask_restx.utils import unpack
+from werkzeug.wrappers import Response
+
+from app.persistence.replica import replica_router
+from app.serialization import serializer
+
+# A cached 200 response. generations are the entity generations the response
+# was built under; it is only served while they are all still current.
+Entry = namedtuple('Entry', ['generations', 'expires_at', 'status', 'headers', 'body'])
+
+# Headers replayed from a cached response; anything else is per-request
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'X-Next-Cursor')
+
+
+class MemoryBackend:
+    """In-process LRU. Each worker process keeps (and invalidates) its own copy."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, generations, status, headers, body, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = Entry(generations, time.monotonic() + ttl,
+                                       status, headers, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, entity):
+        with self._lock:
+            return self._generations.get(entity, 0)
+
+    def bump(self, entity):
+        with self._lock:
+            self._generations[entity] = self._generations.get(entity, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+class FileBackend:
+    """Entries and generations stored as files, shared by every worker on a host.
+
+    Point RESPONSE_CACHE_DIR at a tmpfs such as /dev/shm to keep it in
+    shared memory. Every write goes through os.replace(), so readers see
+    either the old or the new file, never a partial one. A generation is a
+    random token rewritten on each invalidation, which needs no locking.
+    """
+
+    # Expired and surplus entry files are swept every PRUNE_INTERVAL writes
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, directory, max_entries, ttl):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.entry')
+
+    def _generation_path(self, entity):
+        return os.path.join(self.directory, entity + '.generation')
+
+    def _write(self, path, data):
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key):
+        try:
+            with open(self._entry_path(key), 'rb') as entry_file:
+                meta = json.loads(entry_file.readline())
+                body = entry_file.read()
+        except (OSError, ValueError):
+            return None
+        if meta['key'] != key or meta['expires_at'] < time.time():
+            return None
+        return Entry(meta['generations'], meta['expires_at'], meta['status'],
+                     [tuple(header) for header in meta['headers']], body)
+
+    def set(self, key, generations, status, headers, body, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        meta = {'key': key, 'generations': generations, 'expires_at': time.time() + ttl,
+                'status': status, 'headers': headers}
+        self._write(self._entry_path(key), json.dumps(meta).encode('utf-8') + b'\n' + body)
+        self._writes += 1
+        if self._writes % self.PRUNE_INTERVAL == 0:
+            self.prune()
+
+    def generation(self, entity):
+        try:
+            with open(self._generation_path(entity)) as generation_file:
+                return generation_file.read()
+        except OSError:
+            return ''
+
+    def bump(self, entity):
+        self._write(self._generation_path(entity), uuid.uuid4().hex.encode('ascii'))
+
+    def prune(self):
+        """Drop expired entries, then the oldest ones beyond max_entries."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.entry'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                modified = os.path.getmtime(path)
+            except OSError:
+                continue
+            if modified + self.ttl < time.time():
+                self._remove(path)
+            else:
+                entries.append((modified, path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(('.entry', '.generation')):
+                self._remove(os.path.join(self.directory, name))
+
+
+class ResponseCache:
+    """Caches the serialized body of anonymous GET listings.
+
+    Views opt in with @response_cache.cached(*entities), naming every entity
+    type their output depends on; the facade calls invalidate(entity) after
+    each committed write. Rather than deleting entries, invalidation bumps
+    the entity's generation: an entry is only served while the generations
+    it was built under are current, so a response computed concurrently
+    with a write is never served afterwards.
+
+    RESPONSE_CACHE_BACKEND selects 'memory' (per-process LRU), 'file'
+    (shared by all workers through RESPONSE_CACHE_DIR) or None to disable.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        kind = app.config.get('RESPONSE_CACHE_BACKEND')
+        size = app.config.get('RESPONSE_CACHE_SIZE', 0)
+        ttl = app.config.get('RESPONSE_CACHE_TTL', 0)
+        if not kind or size <= 0 or ttl <= 0:
+            self.backend = None
+        elif kind == 'memory':
+            self.backend = MemoryBackend(size, ttl)
+        elif kind == 'file':
+            directory = (app.config.get('RESPONSE_CACHE_DIR')
+                         or os.path.join(tempfile.gettempdir(), 'hbnb-response-cache'))
+            self.backend = FileBackend(directory, size, ttl)
+        else:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {kind}")
+        for counter in self.counters:
+            self.counters[counter] = 0
+
+    def invalidate(self, *entities):
+        if self.backend is not None:
+            for entity in entities:
+                self.backend.bump(entity)
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def cached(self, *entities):
+        """Serve a GET view from the cache unless the request is authenticated."""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                if backend is None or 'Authorization' in request.headers:
+                    return view(*args, **kwargs)
+
+                key = request.full_path
+                # Read before running the view: a write that lands while it
+                # runs makes the stored entry stale from the start
+                generations = [backend.generation(entity) for entity in entities]
+                entry = backend.get(key)
+                if entry is not None and entry.generations == generations:
+                    self._count('hits')
+                    response = Response(entry.body, status=entry.status, headers=entry.headers)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response.make_conditional(request)
+
+                self._count('misses')
+                response = view(*args, **kwargs)
+                if not isinstance(response, Response):
+                    response = serializer.output_json(*unpack(response))
+                # A response read from the lagging replica may miss writes
+                # made before this generation; keep it no longer than the
+                # read-your-writes window, by which the replica has caught up
+                ttl = replica_router.window if replica_router.reading_from_replica() else None
+                if response.status_code == 200 and ttl != 0:
+                    headers = [(name, value) for name, value in response.headers
+                               if name in CACHED_HEADERS]
+                    backend.set(key, generations, 200, headers, response.get_data(), ttl=ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+
+response_cache = ResponseCache()
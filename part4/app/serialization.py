@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from uuid import UUID
+
+from flask import Response, stream_with_context
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Items encoded per chunk by the streaming encoders
+STREAM_CHUNK_SIZE = 500
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                      default=_default).encode('utf-8')
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+# name -> callable(obj) returning JSON bytes
+ENCODERS = {'json': _json_dumps}
+if orjson is not None:
+    ENCODERS['orjson'] = _orjson_dumps
+
+
+class JSONSerializer:
+    """Encodes API payloads straight to bytes with a pluggable encoder.
+
+    JSON_ENCODER picks the encoder: 'orjson' (C-accelerated, used by 'auto'
+    when installed) or 'json' (the standard library). Besides plain
+    payloads it streams large lists chunk by chunk and encodes raw query
+    tuples without building model objects first.
+    """
+
+    def __init__(self, app=None):
+        self.name = 'json'
+        self.dumps = _json_dumps
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        name = app.config.get('JSON_ENCODER', 'auto')
+        if name == 'auto':
+            name = 'orjson' if 'orjson' in ENCODERS else 'json'
+        if name not in ENCODERS:
+            raise ValueError(f"JSON encoder '{name}' is not available")
+        self.name = name
+        self.dumps = ENCODERS[name]
+
+    def output_json(self, data, code, headers=None):
+        """flask_restx representation for application/json."""
+        return self.response(data, code, headers)
+
+    def response(self, data, status=200, headers=None):
+        body = self.dumps(data) + b'\n'
+        return Response(body, status=status, headers=headers, mimetype='application/json')
+
+    def iter_list(self, items, serialize=None):
+        """Yield a JSON array of items in chunks of STREAM_CHUNK_SIZE."""
+        yield b'['
+        chunk = []
+        first = True
+        for item in items:
+            chunk.append(serialize(item) if serialize else item)
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield (b'' if first else b',') + self.dumps(chunk)[1:-1]
+                first = False
+                chunk = []
+        if chunk:
+            yield (b'' if first else b',') + self.dumps(chunk)[1:-1]
+        yield b']\n'
+
+    def iter_rows(self, columns, rows):
+        """Yield a JSON array of objects built from raw (column, ...) tuples."""
+        return self.iter_list(rows, lambda row: dict(zip(columns, row)))
+
+    def iter_ndjson(self, records):
+        """Yield newline-delimited JSON, STREAM_CHUNK_SIZE records per chunk."""
+        chunk = []
+        for record in records:
+            chunk.append(self.dumps(record))
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield b'\n'.join(chunk) + b'\n'
+                chunk = []
+        if chunk:
+            yield b'\n'.join(chunk) + b'\n'
+
+    def iter_csv(self, columns, rows):
+        """Yield CSV with a header line, STREAM_CHUNK_SIZE rows per chunk."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for count, row in enumerate(rows, 1):
+            writer.writerow([value.isoformat() if isinstance(value, (datetime, date)) else value
+                             for value in row])
+            if count % STREAM_CHUNK_SIZE == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+
+    def stream_response(self, chunks, status=200, headers=None, mimetype='application/json'):
+        """Response that encodes while it is being sent; the request context stays open."""
+        return Response(stream_with_context(chunks), status=status, headers=headers,
+                        mimetype=mimetype)
+
+
+serializer = JSONSerializer()
@@ -0,0 +1,38 @@
+from collections import namedtuple
+
+# Outcome of a batch call. results holds {'index', 'id'} for every item that
+# was written, errors holds {'index', 'error'} for every item that was not;
+# index is the item's position in the request array.
+BatchResult = namedtuple('BatchResult', ['results', 'errors'])
+
+CONFLICT_ERROR = "Conflicts with a concurrent write; retry this item"
+
+
+def chunked(items, size):
+    """(start, chunk) slices of items, size items at a time."""
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+def item_error(index, error):
+    if isinstance(error, KeyError):
+        message = f"Missing field {error}"
+    elif isinstance(error, (TypeError, AttributeError)):
+        message = "Invalid field type"
+    else:
+        message = str(error)
+    return {'index': index, 'error': message}
+
+
+def build_item(index, item, build):
+    """(obj, None) from build(item), or (None, error) if the model rejects it.
+
+    build runs the model constructor or update() so the @validates hooks
+    apply exactly as they do for single-item requests.
+    """
+    if not isinstance(item, dict):
+        return None, {'index': index, 'error': "Item must be a JSON object"}
+    try:
+        return build(item), None
+    except (AttributeError, KeyError, TypeError, ValueError) as error:
+        return None, item_error(index, error)
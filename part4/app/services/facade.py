@@ -1,36 +1,90 @@
 from app.persistence.repository import InMemoryRepository
 from app.persistence.repository import SQLAlchemyRepository
 from app.persistence.user_repository import UserRepository
-
-from app.extensions import db
+from app.persistence.review_repository import ReviewRepository
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.load_profiles import load_profile, load_options
+from app.persistence.cache import CachedRepository, repository_cache
+from app.persistence.replica import replica_router
+from app.persistence.unit_of_work import is_lock_error, unit_of_work
+from app.response_cache import response_cache
+from app.services.batch import BatchResult, CONFLICT_ERROR, build_item, chunked
+
+from app.extensions import db, password_pool
+from sqlalchemy.exc import IntegrityError, OperationalError
+from collections import defaultdict
+import heapq
 
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.models.geo import haversine_km, radius_bboxes, split_bbox
 
 class HBnBFacade:
     def __init__(self):
-        self.user_repo = UserRepository()
-        self.amenity_repo = SQLAlchemyRepository(Amenity)
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
+        # Users, amenities and places are fetched by id several times per
+        # request, so their get() is served through the repository cache
+        self.user_repo = CachedRepository(UserRepository(), repository_cache)
+        self.amenity_repo = CachedRepository(SQLAlchemyRepository(Amenity), repository_cache)
+        self.place_repo = CachedRepository(PlaceRepository(), repository_cache)
+        self.review_repo = ReviewRepository()
+
+    def _invalidate_responses(self, *entities):
+        # Only once the change is committed, or a concurrent reader could
+        # cache the old data under the new generation
+        unit_of_work.on_commit(lambda: response_cache.invalidate(*entities))
+
+    # Every write method runs as one unit of work: a single commit on
+    # success, a rollback on any error, and a retry while SQLite is locked
 
     # User Methods -----------------------------------------------------------
+    @unit_of_work.transactional
     def create_user(self, user_data):
         user = User(**user_data)
         self.user_repo.add(user)
+        self._invalidate_responses('user')
         return user
 
+    @replica_router.read_only
     def get_user(self, user_id):
         return self.user_repo.get(user_id)
 
+    @replica_router.read_only
     def get_user_by_email(self, email):
         return self.user_repo.get_by_attribute('email', email)
 
+    def authenticate_user(self, email, password):
+        """Return the user for valid credentials, or None.
+
+        A hash made with an outdated bcrypt cost is upgraded on the spot,
+        while the plaintext password is at hand. bcrypt runs outside any
+        unit of work, so it never holds a transaction open nor reruns on
+        a lock retry; one is opened only to store the upgraded hash.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            self._store_password_hash(user.id, user.password, password_pool.hash(password))
+        return user
+
+    @unit_of_work.transactional
+    def _store_password_hash(self, user_id, verified_hash, new_hash):
+        user = self.user_repo.get(user_id)
+        # Leave a password changed since the check alone
+        if user and user.password == verified_hash:
+            user.password = new_hash
+
+    @replica_router.read_only
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    @replica_router.read_only
+    def get_users_page(self, **page_args):
+        return self.user_repo.get_page(**page_args)
+
+    @unit_of_work.transactional
     def update_user(self, user_id, data, allow_email_change=False, allow_password_change=False):
         user = self.user_repo.get(user_id)
         if not user:
@@ -51,30 +105,46 @@ class HBnBFacade:
 
         user.first_name = data["first_name"]
         user.last_name = data["last_name"]
-        db.session.commit()
+        # Places and reviews embed the user, so their validators must change
+        self.place_repo.touch_for_user(user_id)
+        self.review_repo.touch_for_user(user_id)
+        unit_of_work.on_commit(self.place_repo.invalidate_all)
+        self._invalidate_responses('user')
         return user
 
     # Amenities Methods -------------------------------------------------------
+    @unit_of_work.transactional
     def create_amenity(self, amenity_data):
         amenity = Amenity(**amenity_data)
         self.amenity_repo.add(amenity)
+        self._invalidate_responses('amenity')
         return amenity
 
+    @replica_router.read_only
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get(amenity_id)
 
+    @replica_router.read_only
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    @replica_router.read_only
+    def get_amenities_page(self, **page_args):
+        return self.amenity_repo.get_page(**page_args)
+
+    @unit_of_work.transactional
     def update_amenity(self, amenity_id, amenity_data):
         amenity = self.get_amenity(amenity_id)
         if not amenity:
             return None
         amenity.update(amenity_data)
-        db.session.commit()
+        self.place_repo.touch_for_amenity(amenity_id)
+        unit_of_work.on_commit(self.place_repo.invalidate_all)
+        self._invalidate_responses('amenity')
         return amenity
 
     # Place Methods -------------------------------------------------------
+    @unit_of_work.transactional
     def create_place(self, place_data):
         owner = self.user_repo.get(place_data['user_id'])
         if not owner:
@@ -89,25 +159,90 @@ class HBnBFacade:
             owner_id=owner.id
         )
 
-        amenity_ids = place_data.get("amenity_ids", [])
-        if not isinstance(amenity_ids, list):
-            raise ValueError("amenity_ids must be a list")
-
-        for amenity_id in amenity_ids:
-            amenity = self.amenity_repo.get(amenity_id)
-            if not amenity:
-                raise ValueError(f"Amenity with ID {amenity_id} not found")
-            place.amenities.append(amenity)
+        place.set_amenities(self._get_amenities(place_data.get("amenity_ids", [])))
 
         self.place_repo.add(place)
+        self._invalidate_responses('place')
         return place
 
-    def get_place(self, place_id):
-        return self.place_repo.get(place_id)
-
-    def get_all_places(self):
-        return self.place_repo.get_all()
+    @staticmethod
+    def _missing_amenities_error(missing):
+        if len(missing) == 1:
+            return f"Amenity with ID {missing[0]} not found"
+        return f"Amenities with IDs {', '.join(map(str, missing))} not found"
 
+    def _get_amenities(self, amenity_ids):
+        """The amenities behind amenity_ids, fetched with a single query."""
+        if not isinstance(amenity_ids, list):
+            raise ValueError("amenity_ids must be a list")
+        amenities, missing = self.amenity_repo.get_many(amenity_ids)
+        if missing:
+            raise ValueError(self._missing_amenities_error(missing))
+        return amenities
+
+    @replica_router.read_only
+    def get_place(self, place_id, profile=None, fields=None):
+        return self.place_repo.get(place_id, options=load_options(Place, profile, fields))
+
+    @replica_router.read_only
+    def get_all_places(self, profile=None):
+        return self.place_repo.get_all(options=load_profile(profile))
+
+    @replica_router.read_only
+    def get_places_page(self, profile=None, fields=None, **page_args):
+        options = load_options(Place, profile, fields, page_args.get('sort'))
+        return self.place_repo.get_page(options=options, **page_args)
+
+    @replica_router.read_only
+    def export_places(self, cursor=None, filters=None, batch_size=1000):
+        """(columns, rows) of every place after cursor, streamed from the database."""
+        return Place.EXPORT_FIELDS, self.place_repo.iter_rows(
+            Place.EXPORT_FIELDS, batch_size=batch_size, cursor=cursor, filters=filters)
+
+    @replica_router.read_only
+    def search_places(self, latitude=None, longitude=None, radius_km=None, bbox=None,
+                      limit=None, profile=None, fields=None):
+        """Places within radius_km of a point or inside bbox, nearest first.
+
+        bbox is (min_lat, max_lat, min_lon, max_lon). Distances are measured
+        from (latitude, longitude), or from the centre of bbox when no point
+        is given. Returns (place, distance_km) pairs.
+        """
+        if radius_km is not None:
+            if latitude is None or longitude is None:
+                raise ValueError("A radius search needs latitude and longitude")
+            boxes = radius_bboxes(latitude, longitude, radius_km)
+        elif bbox is not None:
+            boxes = split_bbox(*bbox)
+            if latitude is None or longitude is None:
+                min_lat, max_lat, min_lon, max_lon = bbox
+                latitude = (min_lat + max_lat) / 2
+                longitude = (min_lon + max_lon) / 2
+                if min_lon > max_lon:
+                    # The box wraps around the antimeridian
+                    longitude += 180 if longitude <= 0 else -180
+        else:
+            raise ValueError("Provide either radius_km or a bounding box")
+
+        # Rank on the coordinates alone; only the places kept are loaded,
+        # with the eager loads of the requested view
+        ranked = []
+        for place_id, place_latitude, place_longitude in self.place_repo.coordinates_in_boxes(boxes):
+            distance = haversine_km(latitude, longitude, place_latitude, place_longitude)
+            if radius_km is None or distance <= radius_km:
+                ranked.append((distance, place_id))
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked.sort()
+        places, _ = self.place_repo.get_many([place_id for _, place_id in ranked],
+                                             options=load_options(Place, profile, fields))
+        places = {place.id: place for place in places}
+        # A place deleted since it was ranked is left out
+        return [(places[place_id], distance) for distance, place_id in ranked
+                if place_id in places]
+
+    @unit_of_work.transactional
     def update_place(self, place_id, place_data):
         place = self.get_place(place_id)
         if not place:
@@ -116,19 +251,12 @@ class HBnBFacade:
         place.update(place_data)
 
         if "amenity_ids" in place_data:
-            if not isinstance(place_data["amenity_ids"], list):
-                raise ValueError("amenity_ids must be a list")
-
-            place.amenities = []
-            for amenity_id in place_data["amenity_ids"]:
-                amenity = self.amenity_repo.get(amenity_id)
-                if not amenity:
-                    raise ValueError(f"Amenity with ID {amenity_id} not found")
-                place.amenities.append(amenity)
+            place.set_amenities(self._get_amenities(place_data["amenity_ids"]))
 
-        db.session.commit() 
+        self._invalidate_responses('place')
         return place
 
+    @unit_of_work.transactional
     def delete_place(self, place_id, requesting_user, is_admin=False):
         place = self.get_place(place_id)
         if not place:
@@ -138,9 +266,11 @@ class HBnBFacade:
             raise ValueError("Unauthorized")
 
         self.place_repo.delete(place_id)
+        self._invalidate_responses('place', 'review')
         return True
 
     # Review Methods -------------------------------------------------------
+    @unit_of_work.transactional
     def create_review(self, review_data):
         user = self.get_user(review_data['user_id'])
         if not user:
@@ -153,11 +283,7 @@ class HBnBFacade:
         if place.owner_id == user.id:
             raise ValueError("Cannot review your own place")
 
-        existing_review = self.review_repo.get_by_attribute_multiple({
-            "user_id": user.id,
-            "place_id": place.id
-        })
-        if existing_review:
+        if self.has_reviewed_place(user.id, place.id):
             raise ValueError("You have already reviewed this place")
 
         new_review = Review(
@@ -167,31 +293,389 @@ class HBnBFacade:
             place_id=place.id
         )
 
-        self.review_repo.add(new_review)
+        try:
+            # Savepoint: aggregates and review are written, or undone, together
+            with unit_of_work.transaction():
+                self.place_repo.apply_rating_change(place.id, added=new_review.rating)
+                self.place_repo.invalidate(place.id)
+                self.review_repo.add(new_review)
+        except IntegrityError:
+            # A concurrent request won the race on the unique (user_id, place_id) index
+            raise ValueError("You have already reviewed this place")
+        self._invalidate_responses('review', 'place')
         return new_review
 
-    def get_review(self, review_id):
-        return self.review_repo.get(review_id)
+    def has_reviewed_place(self, user_id, place_id):
+        return self.review_repo.exists(user_id=user_id, place_id=place_id)
 
-    def get_all_reviews(self):
-        return self.review_repo.get_all()
-    
-    def get_reviews_by_place(self, place_id):
-        return [review for review in self.review_repo.get_all() if review.place.id == place_id]
+    @replica_router.read_only
+    def get_review(self, review_id, profile=None, fields=None):
+        return self.review_repo.get(review_id, options=load_options(Review, profile, fields))
+
+    @replica_router.read_only
+    def get_all_reviews(self, profile=None):
+        return self.review_repo.get_all(options=load_profile(profile))
 
+    @replica_router.read_only
+    def get_reviews_page(self, profile=None, fields=None, **page_args):
+        options = load_options(Review, profile, fields, page_args.get('sort'))
+        return self.review_repo.get_page(options=options, **page_args)
+    
+    @replica_router.read_only
+    def get_reviews_by_place(self, place_id, fields=None, **page_args):
+        options = load_options(Review, 'review_list', fields, page_args.get('sort'))
+        return self.review_repo.get_reviews_by_place(place_id, options=options, **page_args)
+
+    @replica_router.read_only
+    def export_reviews(self, cursor=None, filters=None, batch_size=1000):
+        """(columns, rows) of every review after cursor, streamed from the database."""
+        return Review.EXPORT_FIELDS, self.review_repo.iter_rows(
+            Review.EXPORT_FIELDS, batch_size=batch_size, cursor=cursor, filters=filters)
+
+    @unit_of_work.transactional
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
         if not review:
             return None
 
+        old_rating = review.rating
         review.update(review_data)
-        db.session.commit()
+        if review.rating != old_rating:
+            self.place_repo.apply_rating_change(review.place_id, added=review.rating,
+                                                removed=old_rating)
+        else:
+            # The place embeds its reviews
+            self.place_repo.touch(review.place_id)
+        self.place_repo.invalidate(review.place_id)
+        self._invalidate_responses('review', 'place')
         return review
 
+    @unit_of_work.transactional
     def delete_review(self, review_id):
         review = self.get_review(review_id)
         if not review:
             return None
 
+        self.place_repo.apply_rating_change(review.place_id, removed=review.rating)
+        self.place_repo.invalidate(review.place_id)
         self.review_repo.delete(review_id)
+        self._invalidate_responses('review', 'place')
         return True
+
+    @unit_of_work.transactional
+    def rebuild_rating_aggregates(self):
+        count = self.place_repo.rebuild_rating_aggregates()
+        unit_of_work.on_commit(self.place_repo.invalidate_all)
+        self._invalidate_responses('place')
+        return count
+
+    # Batch Methods -------------------------------------------------------
+    def _write_batch(self, items, chunk_size, build_chunk, write_chunk=None):
+        """Validate and write items one chunk, and one transaction, at a time.
+
+        build_chunk(start, chunk) returns ([(index, obj)], errors) for the
+        chunk's items; write_chunk(built) stages the valid ones. A chunk
+        that still fails on commit (a concurrent write won a race) is
+        rolled back and its items are reported as conflicts, as is one
+        that finds the database locked.
+        """
+        results, errors = [], []
+        for start, chunk in chunked(items, chunk_size):
+            # Objects under validation must not be flushed half-updated
+            with db.session.no_autoflush:
+                built, chunk_errors = build_chunk(start, chunk)
+            errors.extend(chunk_errors)
+            if not built:
+                continue
+            try:
+                with unit_of_work.transaction():
+                    if write_chunk:
+                        write_chunk(built)
+            except (IntegrityError, OperationalError) as error:
+                if isinstance(error, OperationalError) and not is_lock_error(error):
+                    raise
+                errors.extend({'index': index, 'error': CONFLICT_ERROR} for index, _ in built)
+                continue
+            results.extend({'index': index, 'id': obj.id} for index, obj in built)
+        errors.sort(key=lambda error: error['index'])
+        return BatchResult(results, errors)
+
+    def _update_item(self, obj, apply, claimed):
+        """Run apply(obj); on failure discard whatever it had already changed.
+
+        claimed holds the ids already updated by the batch: a second item
+        for the same object is rejected, since expiring it on failure would
+        drop the first item's changes and rating deltas assume one old
+        value per review.
+        """
+        if obj.id in claimed:
+            raise ValueError("Duplicate id in batch")
+        claimed.add(obj.id)
+        try:
+            apply(obj)
+        except Exception:
+            db.session.expire(obj)
+            raise
+        return obj
+
+    def _checked_amenity_ids(self, data, known_ids):
+        amenity_ids = data.get("amenity_ids", [])
+        if not isinstance(amenity_ids, list):
+            raise ValueError("amenity_ids must be a list")
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        missing = [amenity_id for amenity_id in amenity_ids if amenity_id not in known_ids]
+        if missing:
+            raise ValueError(self._missing_amenities_error(missing))
+        return amenity_ids
+
+    @staticmethod
+    def _by_id(repo, ids):
+        """{id: obj} for the ids that exist, fetched with repo.get_many()."""
+        return {obj.id: obj for obj in repo.get_many(ids)[0]}
+
+    @staticmethod
+    def _field_values(chunk, key):
+        return {item[key] for item in chunk
+                if isinstance(item, dict) and isinstance(item.get(key), str)}
+
+    @staticmethod
+    def _list_values(chunk, key):
+        return {value for item in chunk if isinstance(item, dict)
+                and isinstance(item.get(key), list)
+                for value in item[key] if isinstance(value, str)}
+
+    def create_amenities_batch(self, items, chunk_size=1000):
+        seen = set()
+
+        def build_chunk(start, chunk):
+            names = {name.strip() for name in self._field_values(chunk, 'name')}
+            taken = self.amenity_repo.existing_values('name', names) | seen
+            built, errors = [], []
+            for index, item in enumerate(chunk, start):
+                amenity, error = build_item(index, item, lambda data: Amenity(name=data['name']))
+                if amenity and amenity.name in taken:
+                    amenity, error = None, {'index': index, 'error': "Amenity already exists"}
+                if error:
+                    errors.append(error)
+                    continue
+                taken.add(amenity.name)
+                seen.add(amenity.name)
+                built.append((index, amenity))
+            return built, errors
+
+        result = self._write_batch(items, chunk_size, build_chunk,
+                                   lambda built: self.amenity_repo.add_many(obj for _, obj in built))
+        if result.results:
+            self._invalidate_responses('amenity')
+        return result
+
+    def update_amenities_batch(self, items, chunk_size=1000):
+        claimed = set()
+
+        def build_chunk(start, chunk):
+            names = {name.strip() for name in self._field_values(chunk, 'name')}
+            taken = self.amenity_repo.existing_values('name', names)
+            amenities = self._by_id(self.amenity_repo, self._field_values(chunk, 'id'))
+            built, errors = [], []
+            for index, item in enumerate(chunk, start):
+                def apply(data):
+                    amenity = amenities.get(data['id'])
+                    if not amenity:
+                        raise ValueError("Amenity not found")
+                    if 'name' in data and data['name'] != amenity.name:
+                        if isinstance(data['name'], str) and data['name'].strip() in taken:
+                            raise ValueError("Amenity already exists")
+                    return self._update_item(amenity, lambda obj: obj.update(data), claimed)
+                amenity, error = build_item(index, item, apply)
+                if error:
+                    errors.append(error)
+                    continue
+                taken.add(amenity.name)
+                built.append((index, amenity))
+            return built, errors
+
+        def write_chunk(built):
+            # Places embed their amenities
+            for _, amenity in built:
+                self.place_repo.touch_for_amenity(amenity.id)
+
+        result = self._write_batch(items, chunk_size, build_chunk, write_chunk)
+        if result.results:
+            self.amenity_repo.invalidate_all()
+            self.place_repo.invalidate_all()
+            self._invalidate_responses('amenity')
+        return result
+
+    def create_places_batch(self, items, owner_id, chunk_size=1000):
+        if not self.user_repo.get(owner_id):
+            raise ValueError("Owner not found")
+        # place id -> amenity ids to link once the place is inserted
+        amenity_links = {}
+
+        def build_chunk(start, chunk):
+            known_ids = self.amenity_repo.existing_values(
+                'id', self._list_values(chunk, 'amenity_ids'))
+            built, errors = [], []
+            for index, item in enumerate(chunk, start):
+                def build(data):
+                    amenity_ids = self._checked_amenity_ids(data, known_ids)
+                    place = Place(
+                        title=data['title'],
+                        description=data.get('description', ''),
+                        price=data['price'],
+                        latitude=data['latitude'],
+                        longitude=data['longitude'],
+                        owner_id=owner_id
+                    )
+                    amenity_links[place.id] = amenity_ids
+                    return place
+                place, error = build_item(index, item, build)
+                if error:
+                    errors.append(error)
+                else:
+                    built.append((index, place))
+            return built, errors
+
+        def write_chunk(built):
+            self.place_repo.add_many(place for _, place in built)
+            self.place_repo.link_amenities([(place.id, amenity_id)
+                                            for _, place in built
+                                            for amenity_id in amenity_links.pop(place.id)])
+
+        result = self._write_batch(items, chunk_size, build_chunk, write_chunk)
+        if result.results:
+            self._invalidate_responses('place')
+        return result
+
+    def update_places_batch(self, items, user_id, is_admin=False, chunk_size=1000):
+        claimed = set()
+
+        def build_chunk(start, chunk):
+            places = self._by_id(self.place_repo, self._field_values(chunk, 'id'))
+            amenities = self._by_id(self.amenity_repo, self._list_values(chunk, 'amenity_ids'))
+            built, errors = [], []
+            for index, item in enumerate(chunk, start):
+                def apply(data):
+                    place = places.get(data['id'])
+                    if not place:
+                        raise ValueError("Place not found")
+                    if not is_admin and place.owner_id != user_id:
+                        raise ValueError("Unauthorized")
+                    amenity_ids = (self._checked_amenity_ids(data, amenities)
+                                   if "amenity_ids" in data else None)
+
+                    def update(obj):
+                        obj.update(data)
+                        if amenity_ids is not None:
+                            obj.set_amenities([amenities[amenity_id]
+                                               for amenity_id in amenity_ids])
+                    return self._update_item(place, update, claimed)
+                place, error = build_item(index, item, apply)
+                if error:
+                    errors.append(error)
+                else:
+                    built.append((index, place))
+            return built, errors
+
+        result = self._write_batch(items, chunk_size, build_chunk)
+        for entry in result.results:
+            self.place_repo.invalidate(entry['id'])
+        if result.results:
+            self._invalidate_responses('place')
+        return result
+
+    def create_reviews_batch(self, items, user_id, chunk_size=1000):
+        if not self.user_repo.get(user_id):
+            raise ValueError('User not found')
+        reviewed = set()
+
+        def build_chunk(start, chunk):
+            place_ids = self._field_values(chunk, 'place_id')
+            owners = self.place_repo.get_owners(place_ids)
+            reviewed.update(self.review_repo.reviewed_places(user_id, place_ids))
+            built, errors = [], []
+            for index, item in enumerate(chunk, start):
+                def build(data):
+                    if data['place_id'] not in owners:
+                        raise ValueError('Place not found')
+                    if owners[data['place_id']] == user_id:
+                        raise ValueError("Cannot review your own place")
+                    if data['place_id'] in reviewed:
+                        raise ValueError("You have already reviewed this place")
+                    return Review(text=data['text'], rating=data['rating'],
+                                  user_id=user_id, place_id=data['place_id'])
+                review, error = build_item(index, item, build)
+                if error:
+                    errors.append(error)
+                    continue
+                reviewed.add(review.place_id)
+                built.append((index, review))
+            return built, errors
+
+        def write_chunk(built):
+            changes = defaultdict(lambda: defaultdict(int))
+            for _, review in built:
+                changes[review.place_id][review.rating] += 1
+            self.place_repo.apply_rating_changes(changes)
+            self.review_repo.add_many(review for _, review in built)
+            for place_id in changes:
+                self.place_repo.invalidate(place_id)
+
+        result = self._write_batch(items, chunk_size, build_chunk, write_chunk)
+        if result.results:
+            self._invalidate_responses('review', 'place')
+        return result
+
+    def update_reviews_batch(self, items, user_id, is_admin=False, chunk_size=1000):
+        old_ratings = {}
+        claimed = set()
+
+        def build_chunk(start, chunk):
+            reviews = self._by_id(self.review_repo, self._field_values(chunk, 'id'))
+            built, errors = [], []
+            for index, item in enumerate(chunk, start):
+                def apply(data):
+                    review = reviews.get(data['id'])
+                    if not review:
+                        raise ValueError('Review not found')
+                    if not is_admin and review.user_id != user_id:
+                        raise ValueError('Unauthorized')
+                    old_ratings[index] = review.rating
+                    return self._update_item(review, lambda obj: obj.update(data), claimed)
+                review, error = build_item(index, item, apply)
+                if error:
+                    errors.append(error)
+                else:
+                    built.append((index, review))
+            return built, errors
+
+        def write_chunk(built):
+            # Text-only changes still bump the place, which embeds its reviews
+            changes = defaultdict(lambda: defaultdict(int))
+            for index, review in built:
+                deltas = changes[review.place_id]
+                if review.rating != old_ratings[index]:
+                    deltas[review.rating] += 1
+                    deltas[old_ratings[index]] -= 1
+            self.place_repo.apply_rating_changes(changes)
+            for place_id in changes:
+                self.place_repo.invalidate(place_id)
+
+        result = self._write_batch(items, chunk_size, build_chunk, write_chunk)
+        if result.results:
+            self._invalidate_responses('review', 'place')
+        return result
+
+    # Conditional request validators -----------------------------------------
+    @replica_router.read_only
+    def get_version(self, entity, obj_id):
+        """updated_at of one user/amenity/place/review, None if missing."""
+        return getattr(self, f"{entity}_repo").get_version(obj_id)
+
+    @replica_router.read_only
+    def get_collection_version(self, entity, filters=None):
+        """Version tuple of a user/amenity/place/review collection."""
+        return getattr(self, f"{entity}_repo").get_collection_version(filters=filters)
+
+    def get_cache_stats(self):
+        return {'repository': repository_cache.stats(), 'response': response_cache.stats()}
@@ -26,12 +26,102 @@ class Config:
     RESTX_DOC = '/'
     RESTX_SECURITY = 'Bearer Auth'
 
+    # Upper bound for the ?limit= query argument on paginated listings
+    PAGINATION_MAX_LIMIT = 100
+
+    # bcrypt cost factor and the process pool that runs it.
+    # PASSWORD_POOL_WORKERS = None uses one worker per CPU, 0 hashes inline.
+    # Beyond PASSWORD_POOL_MAX_PENDING queued jobs requests get a 503.
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_POOL_WORKERS = None
+    PASSWORD_POOL_MAX_PENDING = None
+    PASSWORD_POOL_TIMEOUT = 10
+    PASSWORD_POOL_RETRY_AFTER = 1
+
+    # Remember successful logins for a few seconds so client retries skip
+    # bcrypt; PASSWORD_VERIFY_CACHE_SIZE = 0 disables the cache
+    PASSWORD_VERIFY_CACHE_SIZE = int(os.getenv('PASSWORD_VERIFY_CACHE_SIZE', 0))
+    PASSWORD_VERIFY_CACHE_TTL = 30
+
+    # Shared read-through cache for repository get(); size 0 disables it
+    REPOSITORY_CACHE_SIZE = 10000
+    REPOSITORY_CACHE_TTL = 60
+
+    # Serialized responses of anonymous collection GETs. The backend is
+    # 'memory' (per process), 'file' (shared by all workers through
+    # RESPONSE_CACHE_DIR, e.g. under /dev/shm) or None to disable it
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR')
+    RESPONSE_CACHE_SIZE = 1000
+    RESPONSE_CACHE_TTL = 60
+
+    # Encoder for API responses: 'auto' uses orjson when it is installed,
+    # 'json' forces the standard library
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+
+    # Rows fetched per database round trip by the /export endpoints
+    EXPORT_BATCH_SIZE = 1000
+
+    # Items accepted by one /batch request, and written per transaction
+    BATCH_MAX_ITEMS = 10000
+    BATCH_CHUNK_SIZE = 1000
+
+    # Facade writes are retried this many times, with exponential backoff
+    # from TRANSACTION_RETRY_BACKOFF seconds, while SQLite reports the
+    # database as locked
+    TRANSACTION_RETRIES = 5
+    TRANSACTION_RETRY_BACKOFF = 0.05
+
+    # PRAGMA name -> value applied to every new SQLite connection
+    SQLITE_PRAGMAS = {}
+
+    # With a 'replica' entry in SQLALCHEMY_BINDS, GET requests read from it.
+    # A JWT identity that just wrote reads from the primary for this many
+    # seconds; keep it above the replica's worst lag
+    READ_YOUR_WRITES_WINDOW = 5
+
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_POOL_WORKERS = 0
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Optional read replica, kept in sync outside the app
+    # (locally: `flask replicate` between two SQLite files)
+    SQLALCHEMY_BINDS = ({'replica': os.getenv('DATABASE_REPLICA_URL')}
+                        if os.getenv('DATABASE_REPLICA_URL') else {})
+
+    # Connections kept per worker process; size it to the worker's threads
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': 30,
+    }
+
+    # WAL lets readers run alongside the single writer; with it,
+    # synchronous=NORMAL only fsyncs at checkpoints and stays durable
+    # across application crashes. busy_timeout makes a blocked writer wait
+    # inside SQLite before the unit of work's retries kick in.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,  # KiB, i.e. 64 MiB of page cache per connection
+        'mmap_size': 268435456,  # 256 MiB of the file read through mmap
+    }
+
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
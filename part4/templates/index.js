@@ -1,5 +1,5 @@
 document.addEventListener('DOMContentLoaded', () => {
-    const API_URL = 'http://127.0.0.1:5000/api/v1/places/';
+    const API_URL = 'http://127.0.0.1:5000/api/v1/places/?view=summary';
     const loginLink = document.getElementById('login-link');
     const placesList = document.getElementById('places-list');
     const priceFilter = document.getElementById('price-filter');
@@ -0,0 +1,621 @@
+"""Micro-benchmarks for hot API paths.
+
+Run from the part4 directory, e.g.:
+    PYTHONPATH=. python3 test/benchmarks.py review_post 1000 100000 1000000
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db, bcrypt
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.geo import grid_cell
+from app.persistence.place_repository import InMemoryPlaceRepository
+from app.services import facade
+from app.persistence.engine import sqlite_tuning
+from app.serialization import ENCODERS, JSONSerializer
+from config import ProductionConfig, TestingConfig
+
+CHUNK_SIZE = 10000
+
+
+def bulk_insert(table, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(table.insert(), rows[start:start + CHUNK_SIZE])
+    db.session.commit()
+
+
+def seed_users(count, prefix='user'):
+    password = bcrypt.generate_password_hash('password').decode('utf-8')
+    now = datetime.utcnow()
+    rows = [{
+        "id": str(uuid.uuid4()),
+        "first_name": "Bench",
+        "last_name": str(i),
+        "email": f"{prefix}{i}@bench.hbnb",
+        "password": password,
+        "is_admin": False,
+        "created_at": now,
+        "updated_at": now
+    } for i in range(count)]
+    bulk_insert(User.__table__, rows)
+    return [row["id"] for row in rows]
+
+
+def random_coordinates(rng):
+    return rng.uniform(-60.0, 70.0), rng.uniform(-180.0, 180.0)
+
+
+def seed_places(count, owner_ids, seed=42):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    ids = []
+    rows = []
+    for i in range(count):
+        latitude, longitude = random_coordinates(rng)
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "title": f"Place {i}",
+            "description": "",
+            "price": 10.0 + i % 500,
+            "latitude": latitude,
+            "longitude": longitude,
+            "grid_cell": grid_cell(latitude, longitude),
+            "owner_id": owner_ids[i % len(owner_ids)],
+            "created_at": now,
+            "updated_at": now
+        })
+        ids.append(rows[-1]["id"])
+        if len(rows) == CHUNK_SIZE:
+            bulk_insert(Place.__table__, rows)
+            rows = []
+    bulk_insert(Place.__table__, rows)
+    return ids
+
+
+def seed_reviews(count):
+    """Seed `count` reviews spread over a square grid of users and places."""
+    side = max(2, int(count ** 0.5) + 1)
+    user_ids = seed_users(side)
+    # Places are owned by a separate user so nobody reviews their own place
+    owner_id = seed_users(1, prefix='owner')[0]
+    place_ids = seed_places(side, [owner_id])
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "text": "Bench review",
+            "rating": 1 + i % 5,
+            "user_id": user_ids[i // side],
+            "place_id": place_ids[i % side],
+            "created_at": now,
+            "updated_at": now
+        })
+        if len(rows) == CHUNK_SIZE:
+            bulk_insert(Review.__table__, rows)
+            rows = []
+    bulk_insert(Review.__table__, rows)
+    return user_ids, place_ids
+
+
+def bench_review_post(*sizes, requests=200):
+    """POST /api/v1/reviews/ latency against a growing reviews table."""
+    sizes = [int(size) for size in sizes] or [1000, 100000, 1000000]
+    for size in sizes:
+        app = create_app(TestingConfig)
+        with app.app_context():
+            _, place_ids = seed_reviews(size)
+            reviewer_id = seed_users(1, prefix='reviewer')[0]
+            token = create_access_token(identity=reviewer_id)
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        for place_id in place_ids[:requests]:
+            response = client.post('/api/v1/reviews/', headers=headers, json={
+                "text": "Great stay",
+                "rating": 5,
+                "place_id": place_id
+            })
+            assert response.status_code == 201, response.get_json()
+        elapsed = time.perf_counter() - start
+        count = min(requests, len(place_ids))
+        print(f"review_post reviews={size:>8} mean={elapsed / count * 1000:.2f}ms")
+
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+def bench_place_search(*sizes, queries=200, radius_km=50.0):
+    """Radius search latency in SQLite and in the in-memory grid index."""
+    sizes = [int(size) for size in sizes] or [100000, 1000000]
+    for size in sizes:
+        rng = random.Random(7)
+        origins = [random_coordinates(rng) for _ in range(queries)]
+
+        app = create_app(TestingConfig)
+        with app.app_context():
+            owner_id = seed_users(1, prefix='owner')[0]
+            seed_places(size, [owner_id])
+            # The summary projection, then the API's default full view
+            for view, fields in (('summary', ('id', 'title', 'price')), ('full', None)):
+                start = time.perf_counter()
+                found = 0
+                for latitude, longitude in origins:
+                    found += len(facade.search_places(latitude, longitude, radius_km, limit=100,
+                                                      profile='place_list', fields=fields))
+                    db.session.remove()
+                elapsed = time.perf_counter() - start
+                print(f"place_search sqlite   view={view:<7} places={size:>8} "
+                      f"mean={elapsed / queries * 1000:.2f}ms hits/query={found / queries:.1f}")
+
+            repo = InMemoryPlaceRepository()
+            for place in Place.query.yield_per(CHUNK_SIZE):
+                repo.add(place)
+            facade_repo, facade.place_repo = facade.place_repo, repo
+            try:
+                start = time.perf_counter()
+                for latitude, longitude in origins:
+                    facade.search_places(latitude, longitude, radius_km, limit=100)
+                elapsed = time.perf_counter() - start
+            finally:
+                facade.place_repo = facade_repo
+            print(f"place_search inmemory places={size:>8} mean={elapsed / queries * 1000:.2f}ms")
+
+            db.session.remove()
+            db.drop_all()
+
+
+def bench_login(*worker_counts, clients=16, duration=5.0, rounds=10):
+    """Login throughput with the bcrypt pool sized at each worker count."""
+    worker_counts = [int(count) for count in worker_counts] or sorted(
+        {1, 2, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1})
+    for workers in worker_counts:
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class LoginConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+            BCRYPT_LOG_ROUNDS = rounds
+            PASSWORD_POOL_WORKERS = workers
+
+        app = create_app(LoginConfig)
+        # Shed requests are logged as 5xx errors; keep the report readable
+        app.logger.disabled = True
+        credentials = {"email": LoginConfig.ADMIN_EMAIL, "password": LoginConfig.ADMIN_PASSWORD}
+        statuses = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def client_loop():
+            client = app.test_client()
+            while time.perf_counter() < deadline:
+                status = client.post('/api/v1/auth/login', json=credentials).status_code
+                with lock:
+                    statuses.append(status)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            for _ in range(clients):
+                pool.submit(client_loop)
+        elapsed = time.perf_counter() - start
+        ok = statuses.count(200)
+        print(f"login workers={workers:>3} rounds={rounds} logins/s={ok / elapsed:.1f} "
+              f"shed(503)={statuses.count(503)}")
+
+        from app.extensions import password_pool
+        password_pool.shutdown()
+        os.remove(path)
+
+
+def bench_conditional_get(size=100000, requests=200, limit=100):
+    """GET /api/v1/places/ cost with and without a matching If-None-Match."""
+    size, requests, limit = int(size), int(requests), int(limit)
+    app = create_app(TestingConfig)
+    with app.app_context():
+        owner_id = seed_users(1, prefix='owner')[0]
+        seed_places(size, [owner_id])
+    client = app.test_client()
+    url = f'/api/v1/places/?limit={limit}'
+    etag = client.get(url).headers['ETag']
+
+    for label, headers in (('full', {}), ('revalidated', {'If-None-Match': etag})):
+        transferred = 0
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = client.get(url, headers=headers)
+            transferred += len(response.data)
+        elapsed = time.perf_counter() - start
+        print(f"conditional_get {label:<11} places={size:>8} status={response.status_code} "
+              f"mean={elapsed / requests * 1000:.2f}ms bytes/request={transferred // requests}")
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def bench_response_cache(size=100000, requests=200, limit=100):
+    """Anonymous GET /api/v1/places/ latency per response cache backend."""
+    size, requests, limit = int(size), int(requests), int(limit)
+    for backend in (None, 'memory', 'file'):
+        class CacheConfig(TestingConfig):
+            RESPONSE_CACHE_BACKEND = backend
+            RESPONSE_CACHE_DIR = tempfile.mkdtemp()
+
+        app = create_app(CacheConfig)
+        with app.app_context():
+            owner_id = seed_users(1, prefix='owner')[0]
+            seed_places(size, [owner_id])
+        client = app.test_client()
+        url = f'/api/v1/places/?limit={limit}'
+        client.get(url)
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            assert client.get(url).status_code == 200
+        elapsed = time.perf_counter() - start
+        print(f"response_cache backend={str(backend):<6} places={size:>8} "
+              f"mean={elapsed / requests * 1000:.2f}ms")
+
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+def bench_serialization(size=10000, repeat=5):
+    """Encoding a size-place payload: flask_restx's path against the serializer layer."""
+    from flask_restx.representations import output_json
+
+    size, repeat = int(size), int(repeat)
+    app = create_app(TestingConfig)
+
+    def timed(label, func, unit='bytes'):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            nbytes = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"serialization {label:<28} places={size:>6} best={best * 1000:8.2f}ms {unit}={nbytes}")
+
+    with app.test_request_context():
+        owner_id = seed_users(1, prefix='owner')[0]
+        seed_places(size, [owner_id])
+        fields = Place.SUMMARY_FIELDS
+        payload = [place.to_dict() for place in facade.get_all_places(profile='place_list')]
+        rows = db.session.query(*(getattr(Place, name) for name in fields)).all()
+
+        timed("to_dict (full view)",
+              lambda: len([place.to_dict() for place in facade.get_all_places(profile='place_list')]),
+              unit='dicts')
+        timed("restx output_json", lambda: len(output_json(payload, 200).get_data()))
+        for name in ENCODERS:
+            encoder = JSONSerializer()
+            encoder.dumps = ENCODERS[name]
+            timed(f"serializer {name}", lambda: len(encoder.response(payload).get_data()))
+            timed(f"serializer {name} streamed", lambda: sum(map(len, encoder.iter_list(payload))))
+            timed(f"serializer {name} raw rows",
+                  lambda: sum(map(len, encoder.iter_rows(fields, rows))))
+
+        db.session.remove()
+        db.drop_all()
+
+    for name in ENCODERS:
+        class EncoderConfig(TestingConfig):
+            JSON_ENCODER = name
+            RESPONSE_CACHE_BACKEND = None
+
+        app = create_app(EncoderConfig)
+        with app.app_context():
+            owner_id = seed_users(1, prefix='owner')[0]
+            seed_places(size, [owner_id])
+        client = app.test_client()
+        timed(f"GET /places/ via {name}", lambda: len(client.get('/api/v1/places/').data))
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+def bench_export(*sizes):
+    """Time and peak Python memory of /reviews/export against the unbounded list."""
+    sizes = [int(size) for size in sizes] or [10000, 100000, 1000000]
+    for size in sizes:
+        class ExportConfig(TestingConfig):
+            RESPONSE_CACHE_BACKEND = None
+
+        app = create_app(ExportConfig)
+        with app.app_context():
+            seed_reviews(size)
+        client = app.test_client()
+
+        urls = ['/api/v1/reviews/export', '/api/v1/reviews/export?format=csv']
+        if size <= 100000:
+            urls.append('/api/v1/reviews/?view=summary')
+        for url in urls:
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = client.get(url, buffered=False)
+            transferred = sum(len(chunk) for chunk in response.response)
+            response.close()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"export reviews={size:>8} {url:<38} {elapsed:7.2f}s "
+                  f"peak={peak / 2 ** 20:8.1f}MiB bytes={transferred}")
+
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+def bench_batch_insert(*sizes, request_size=10000, single_requests=500):
+    """POST /api/v1/places/batch throughput, against one POST per place."""
+    sizes = [int(size) for size in sizes] or [10000, 100000, 1000000]
+    rng = random.Random(3)
+
+    def place_payload(i):
+        latitude, longitude = random_coordinates(rng)
+        return {"title": f"Place {i}", "description": "", "price": 10.0 + i % 500,
+                "latitude": latitude, "longitude": longitude}
+
+    for size in [None] + sizes:
+        class BatchConfig(TestingConfig):
+            RESPONSE_CACHE_BACKEND = None
+
+        app = create_app(BatchConfig)
+        with app.app_context():
+            owner_id = seed_users(1, prefix='owner')[0]
+            token = create_access_token(identity=owner_id)
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        if size is None:
+            # Baseline: one request and one commit per place
+            count = single_requests
+            for i in range(count):
+                assert client.post('/api/v1/places/', headers=headers,
+                                   json=place_payload(i)).status_code == 201
+        else:
+            count = size
+            for offset in range(0, size, request_size):
+                items = [place_payload(i) for i in range(offset, min(size, offset + request_size))]
+                body = client.post('/api/v1/places/batch', headers=headers, json=items).get_json()
+                assert not body['errors'] and len(body['results']) == len(items), body['errors'][:3]
+        elapsed = time.perf_counter() - start
+        label = "single" if size is None else "batch"
+        print(f"batch_insert {label:<6} places={count:>8} {elapsed:8.2f}s rows/s={count / elapsed:10.0f}")
+
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+def bench_write_latency(requests=200):
+    """Mean latency and commits per request of the write endpoints, on a file database."""
+    requests = int(requests)
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+
+    class WriteConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        RESPONSE_CACHE_BACKEND = None
+
+    app = create_app(WriteConfig)
+    with app.app_context():
+        owner_id = seed_users(1, prefix='owner')[0]
+        guest_ids = seed_users(requests, prefix='guest')
+        owner_token = create_access_token(identity=owner_id, additional_claims={"is_admin": True})
+        guest_tokens = [create_access_token(identity=guest_id) for guest_id in guest_ids]
+        engine = db.engine
+    client = app.test_client()
+    owner = {"Authorization": f"Bearer {owner_token}"}
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+
+    def timed(label, calls):
+        del commits[:]
+        start = time.perf_counter()
+        results = [call() for call in calls]
+        elapsed = time.perf_counter() - start
+        print(f"write_latency {label:<14} mean={elapsed / len(calls) * 1000:6.2f}ms "
+              f"commits/request={len(commits) / len(calls):.2f}")
+        return results
+
+    place = {"title": "Bench", "description": "", "price": 10.0, "latitude": 1.0, "longitude": 1.0}
+    place_ids = timed("create place", [
+        lambda: client.post('/api/v1/places/', headers=owner, json=place).get_json()["id"]
+    ] * requests)
+    timed("update place", [
+        (lambda place_id: lambda: client.put(f'/api/v1/places/{place_id}', headers=owner,
+                                             json=dict(place, title="Renamed")))(place_id)
+        for place_id in place_ids
+    ])
+    review_ids = timed("create review", [
+        (lambda token, place_id: lambda: client.post(
+            '/api/v1/reviews/', headers={"Authorization": f"Bearer {token}"},
+            json={"text": "Nice", "rating": 4, "place_id": place_id}).get_json()["id"])(token, place_id)
+        for token, place_id in zip(guest_tokens, place_ids)
+    ])
+    timed("delete review", [
+        (lambda token, review_id: lambda: client.delete(
+            f'/api/v1/reviews/{review_id}', headers={"Authorization": f"Bearer {token}"}))(token, review_id)
+        for token, review_id in zip(guest_tokens, review_ids)
+    ])
+    timed("update user", [
+        (lambda guest_id: lambda: client.put(f'/api/v1/users/{guest_id}', headers=owner,
+                                             json={"first_name": "New", "last_name": "Name"}))(guest_id)
+        for guest_id in guest_ids
+    ])
+    os.remove(path)
+
+
+def bench_place_amenities(*sizes, requests=50):
+    """Queries, place_amenity rows written and latency of place writes with N amenities."""
+    app = create_app(TestingConfig)
+    with app.app_context():
+        owner_id = seed_users(1, prefix='owner')[0]
+        token = create_access_token(identity=owner_id, additional_claims={"is_admin": True})
+        engine = db.engine
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement != "BEGIN":
+            rows = len(parameters) if isinstance(parameters, list) else 1
+            statements.append((statement, rows))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    for size in sizes or (1, 10, 100):
+        size = int(size)
+        amenity_ids = [client.post('/api/v1/amenities/', headers=headers,
+                                   json={"name": f"Amenity {size}-{i}"}).get_json()["id"]
+                       for i in range(size + 1)]
+        place = {"title": "Bench", "description": "", "price": 10.0, "latitude": 1.0,
+                 "longitude": 1.0, "amenity_ids": amenity_ids[:size]}
+        for label, call in (
+            ("create", lambda i: client.post('/api/v1/places/', headers=headers, json=place)),
+            # Swap one amenity back and forth: two association rows change each time
+            ("update", lambda i: client.put(f'/api/v1/places/{place_id}', headers=headers,
+                                            json=dict(place, amenity_ids=amenity_ids[i % 2:][:size])))
+        ):
+            del statements[:]
+            start = time.perf_counter()
+            for i in range(1, requests + 1):
+                response = call(i)
+            elapsed = time.perf_counter() - start
+            place_id = place_id if label == "update" else response.get_json()["id"]
+            links = sum(rows for statement, rows in statements
+                        if statement.startswith(("INSERT INTO place_amenity",
+                                                 "DELETE FROM place_amenity")))
+            print(f"place_amenities amenities={size:<5} {label}: "
+                  f"queries/request={len(statements) / requests:6.1f} "
+                  f"link rows/request={links / requests:6.1f} "
+                  f"mean={elapsed / requests * 1000:6.2f}ms")
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def concurrency_config(profile, path):
+    """Config for bench_sqlite_concurrency; built in each worker process."""
+    base = ProductionConfig if profile == 'production' else TestingConfig
+
+    class ConcurrencyConfig(base):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        BCRYPT_LOG_ROUNDS = 4
+        PASSWORD_POOL_WORKERS = 0
+        # Every read and write must reach SQLite
+        REPOSITORY_CACHE_SIZE = 0
+        RESPONSE_CACHE_BACKEND = None
+    return ConcurrencyConfig
+
+
+def concurrency_worker(profile, path, role, place_ids, duration, barrier, results):
+    app = create_app(concurrency_config(profile, path))
+    app.logger.disabled = True
+    with app.app_context():
+        admin_id = facade.get_user_by_email(app.config['ADMIN_EMAIL']).id
+        token = create_access_token(identity=admin_id, additional_claims={"is_admin": True})
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    place = {"title": "Bench", "description": "", "price": 10.0, "latitude": 1.0, "longitude": 1.0}
+    rng = random.Random(os.getpid())
+    latencies, errors = [], 0
+    barrier.wait()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        place_id = rng.choice(place_ids)
+        start = time.perf_counter()
+        if role == 'read':
+            response = client.get(f'/api/v1/places/{place_id}')
+        else:
+            response = client.put(f'/api/v1/places/{place_id}', headers=headers,
+                                  json=dict(place, title=f"Renamed {rng.random()}"))
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors += 1
+    results.put((role, latencies, errors))
+
+
+def bench_sqlite_concurrency(readers=4, writers=2, duration=5.0, size=10000):
+    """Reads/s, writes/s and latency percentiles with reader and writer processes.
+
+    Each worker process is a separate app, like gunicorn workers sharing one
+    SQLite file, and compares the default settings with ProductionConfig's
+    WAL journal and pragmas.
+    """
+    readers, writers, duration, size = int(readers), int(writers), float(duration), int(size)
+    # Workers must import a fresh interpreter, not fork open SQLite handles
+    context = multiprocessing.get_context('spawn')
+    for profile in ('default', 'production'):
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        app = create_app(concurrency_config(profile, path))
+        with app.app_context():
+            place_ids = seed_places(size, seed_users(10, prefix='owner'))
+            settings = sqlite_tuning.current('journal_mode', 'synchronous')
+            db.engine.dispose()
+
+        barrier = context.Barrier(readers + writers)
+        results = context.Queue()
+        roles = ['read'] * readers + ['write'] * writers
+        workers = [context.Process(target=concurrency_worker,
+                                   args=(profile, path, role, place_ids, duration, barrier, results))
+                   for role in roles]
+        for worker in workers:
+            worker.start()
+        outcomes = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        print(f"sqlite_concurrency profile={profile} journal_mode={settings['journal_mode']} "
+              f"synchronous={settings['synchronous']}")
+        for role in ('read', 'write'):
+            latencies = sorted(latency for kind, times, _ in outcomes if kind == role
+                               for latency in times)
+            errors = sum(count for kind, _, count in outcomes if kind == role)
+            if not latencies:
+                print(f"  {role:<5} no successful requests, errors={errors}")
+                continue
+            p50, p95, p99 = (latencies[int(len(latencies) * q)] * 1000 for q in (0.5, 0.95, 0.99))
+            print(f"  {role:<5} {len(latencies) / duration:8.1f}/s p50={p50:6.2f}ms "
+                  f"p95={p95:6.2f}ms p99={p99:7.2f}ms errors={errors}")
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+BENCHMARKS = {
+    "review_post": bench_review_post,
+    "place_search": bench_place_search,
+    "login": bench_login,
+    "conditional_get": bench_conditional_get,
+    "response_cache": bench_response_cache,
+    "serialization": bench_serialization,
+    "export": bench_export,
+    "batch_insert": bench_batch_insert,
+    "write_latency": bench_write_latency,
+    "place_amenities": bench_place_amenities,
+    "sqlite_concurrency": bench_sqlite_concurrency,
+}
+
+if __name__ == '__main__':
+    name, args = sys.argv[1], sys.argv[2:]
+    BENCHMARKS[name](*args)
@@ -0,0 +1,500 @@
+"""End-to-end load test of the HBnB API.
+
+Bulk-loads a synthetic dataset, then drives a weighted mix of login,
+place listing, place detail, search and review posting against
+create_app(), either in-process through the Flask test client or over a
+local socket through a threaded werkzeug server. Prints a JSON report
+with requests/s and p50/p95/p99 latency per scenario; with --baseline it
+compares the report against a stored one and exits 1 on regressions.
+
+Run from the part4 directory, e.g.:
+    PYTHONPATH=. python3 test/loadtest.py --driver socket \\
+        --baseline test/baselines/loadtest-socket.json
+    PYTHONPATH=. python3 test/loadtest.py --driver inprocess \\
+        --save-baseline test/baselines/loadtest-inprocess.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask_jwt_extended import create_access_token
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from app.extensions import db, bcrypt
+from app.models.amenity import Amenity
+from app.models.associations import place_amenity
+from app.models.geo import grid_cell
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+from config import ProductionConfig, TestingConfig
+
+CHUNK_SIZE = 10000
+PASSWORD = 'loadtest'
+
+# Relative share of each scenario in the request mix
+SCENARIO_WEIGHTS = {
+    'login': 5,
+    'list_places': 30,
+    'place_detail': 35,
+    'search': 20,
+    'post_review': 10,
+}
+
+# Metrics compared against a baseline; higher is worse for latencies
+LATENCY_METRICS = ('p50_ms', 'p95_ms')
+THROUGHPUT_METRIC = 'rps'
+DEFAULT_TOLERANCE = 0.25
+# Scenarios with fewer samples than this have too noisy percentiles to gate
+MIN_SAMPLES = 200
+
+
+def loadtest_config(path):
+    """TestingConfig on a SQLite file, tuned like production."""
+
+    class LoadTestConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLITE_PRAGMAS = ProductionConfig.SQLITE_PRAGMAS
+
+    return LoadTestConfig
+
+
+# Data generator -----------------------------------------------------------
+
+def bulk_insert(table, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(table.insert(), rows[start:start + CHUNK_SIZE])
+    db.session.commit()
+
+
+def generate(users=1000, places=2000, amenities=50, reviews=5000, reviewers=8, seed=25):
+    """Bulk-load a synthetic dataset into the current app's database.
+
+    Every user's password is PASSWORD. Reviewers are extra users with no
+    reviews and no places, so they can post one review to every place.
+    Rating aggregates are rebuilt from the loaded reviews at the end.
+    Returns what the scenarios need: emails, place and reviewer ids.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password = bcrypt.generate_password_hash(PASSWORD).decode('utf-8')
+
+    def user_row(email, last_name):
+        return {"id": str(uuid.uuid4()), "first_name": "Load", "last_name": last_name,
+                "email": email, "password": password, "is_admin": False,
+                "created_at": now, "updated_at": now}
+
+    user_rows = [user_row(f"user{i}@load.hbnb", str(i)) for i in range(users)]
+    reviewer_rows = [user_row(f"reviewer{i}@load.hbnb", f"Reviewer {i}") for i in range(reviewers)]
+    bulk_insert(User.__table__, user_rows + reviewer_rows)
+
+    amenity_rows = [{"id": str(uuid.uuid4()), "name": f"Amenity {i}",
+                     "created_at": now, "updated_at": now} for i in range(amenities)]
+    bulk_insert(Amenity.__table__, amenity_rows)
+    amenity_ids = [row["id"] for row in amenity_rows]
+
+    place_rows = []
+    link_rows = []
+    for i in range(places):
+        latitude, longitude = rng.uniform(-60.0, 70.0), rng.uniform(-180.0, 180.0)
+        place_rows.append({
+            "id": str(uuid.uuid4()), "title": f"Place {i}", "description": "Generated",
+            "price": round(rng.uniform(10.0, 500.0), 2),
+            "latitude": latitude, "longitude": longitude,
+            "grid_cell": grid_cell(latitude, longitude),
+            "owner_id": rng.choice(user_rows)["id"],
+            "created_at": now, "updated_at": now
+        })
+        for amenity_id in rng.sample(amenity_ids, min(3, len(amenity_ids))):
+            link_rows.append({"place_id": place_rows[-1]["id"], "amenity_id": amenity_id})
+    bulk_insert(Place.__table__, place_rows)
+    bulk_insert(place_amenity, link_rows)
+
+    # Distinct (user, place) pairs, never a review of one's own place
+    reviews = min(reviews, users * places - places)
+    pairs = set()
+    review_rows = []
+    while len(review_rows) < reviews:
+        user, place = rng.choice(user_rows), rng.choice(place_rows)
+        if place["owner_id"] == user["id"] or (user["id"], place["id"]) in pairs:
+            continue
+        pairs.add((user["id"], place["id"]))
+        review_rows.append({"id": str(uuid.uuid4()), "text": "Generated review",
+                            "rating": rng.randint(1, 5), "user_id": user["id"],
+                            "place_id": place["id"], "created_at": now, "updated_at": now})
+    bulk_insert(Review.__table__, review_rows)
+    facade.rebuild_rating_aggregates()
+    db.session.remove()
+
+    return {
+        "counts": {"users": users, "places": places, "amenities": amenities,
+                   "reviews": reviews, "reviewers": reviewers},
+        "emails": [row["email"] for row in user_rows],
+        "place_ids": [row["id"] for row in place_rows],
+        "reviewer_ids": [row["id"] for row in reviewer_rows],
+    }
+
+
+# Drivers ------------------------------------------------------------------
+
+class InProcessDriver:
+    """Requests through the Flask test client: no network, no server."""
+
+    name = 'inprocess'
+
+    def __init__(self, app):
+        self.app = app
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def session(self):
+        return InProcessSession(self.app.test_client())
+
+
+class InProcessSession:
+    def __init__(self, client):
+        self.client = client
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        data = response.get_data()
+        return response.status_code, data
+
+    def close(self):
+        pass
+
+
+class _KeepAliveHandler(WSGIRequestHandler):
+    # HTTP/1.1 keeps each session's connection open between requests
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class SocketDriver:
+    """Requests over HTTP to a threaded werkzeug server on 127.0.0.1."""
+
+    name = 'socket'
+
+    def __init__(self, app):
+        self.app = app
+        self.server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.server = make_server('127.0.0.1', 0, self.app, threaded=True,
+                                  request_handler=_KeepAliveHandler)
+        self._thread = threading.Thread(target=self.server.serve_forever,
+                                        name='loadtest-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self._thread.join()
+        self.server.server_close()
+
+    def session(self):
+        return SocketSession('127.0.0.1', self.server.server_port)
+
+
+class SocketSession:
+    def __init__(self, host, port):
+        self.connection = http.client.HTTPConnection(host, port, timeout=30)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+    def close(self):
+        self.connection.close()
+
+
+DRIVERS = {
+    'inprocess': InProcessDriver,
+    'socket': SocketDriver,
+}
+
+
+# Scenarios ----------------------------------------------------------------
+# Each takes (session, worker, rng) and returns whether the response was
+# the expected one.
+
+def scenario_login(session, worker, rng):
+    status, _ = session.request('POST', '/api/v1/auth/login', body={
+        "email": rng.choice(worker["dataset"]["emails"]), "password": PASSWORD})
+    return status == 200
+
+
+def scenario_list_places(session, worker, rng):
+    sort = rng.choice(('created_at', '-price', '-average_rating'))
+    status, _ = session.request('GET', f'/api/v1/places/?limit=20&sort={sort}')
+    return status == 200
+
+
+def scenario_place_detail(session, worker, rng):
+    place_id = rng.choice(worker["dataset"]["place_ids"])
+    status, _ = session.request('GET', f'/api/v1/places/{place_id}')
+    return status == 200
+
+
+def scenario_search(session, worker, rng):
+    latitude, longitude = rng.uniform(-60.0, 70.0), rng.uniform(-180.0, 180.0)
+    status, _ = session.request(
+        'GET', f'/api/v1/places/search?lat={latitude:.4f}&lon={longitude:.4f}'
+               f'&radius_km=500&limit=20')
+    return status == 200
+
+
+def scenario_post_review(session, worker, rng):
+    # Each worker's reviewer walks the places in order: one review per place
+    place_ids = worker["dataset"]["place_ids"]
+    place_id = place_ids[worker["next_place"] % len(place_ids)]
+    worker["next_place"] += 1
+    status, _ = session.request(
+        'POST', '/api/v1/reviews/', headers=worker["auth"],
+        body={"text": "Load test review", "rating": rng.randint(1, 5), "place_id": place_id})
+    return status == 201
+
+
+SCENARIOS = {
+    'login': scenario_login,
+    'list_places': scenario_list_places,
+    'place_detail': scenario_place_detail,
+    'search': scenario_search,
+    'post_review': scenario_post_review,
+}
+
+
+# Runner and report --------------------------------------------------------
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+    }
+
+
+def run(driver, dataset, workers=4, duration=10.0, requests=None, warmup=1.0,
+        weights=None, seed=25):
+    """Drive the scenario mix from `workers` threads; returns the report dict.
+
+    Each worker stops after `duration` seconds, or after `requests`
+    requests when given. Requests in the first `warmup` seconds are sent
+    but not recorded. Every worker posts reviews as its own reviewer.
+    """
+    weights = weights or SCENARIO_WEIGHTS
+    if len(dataset["reviewer_ids"]) < workers:
+        raise ValueError("The dataset needs one reviewer per worker")
+    names = list(weights)
+    with driver.app.app_context():
+        tokens = [create_access_token(identity=reviewer_id)
+                  for reviewer_id in dataset["reviewer_ids"][:workers]]
+
+    results = [[] for _ in range(workers)]
+    failures = []
+    ready = threading.Barrier(workers + 1)
+
+    def worker_loop(slot):
+        rng = random.Random(seed + slot)
+        worker = {"dataset": dataset, "auth": {"Authorization": f"Bearer {tokens[slot]}"},
+                  "next_place": slot * len(dataset["place_ids"]) // workers}
+        session = driver.session()
+        try:
+            ready.wait()
+            start = time.perf_counter()
+            warm_until = start + warmup
+            stop_at = warm_until + duration
+            recorded = results[slot]
+            while True:
+                now = time.perf_counter()
+                if requests is None and now >= stop_at:
+                    break
+                if requests is not None and len(recorded) >= requests:
+                    break
+                name = rng.choices(names, weights=[weights[name] for name in names])[0]
+                sent = time.perf_counter()
+                ok = SCENARIOS[name](session, worker, rng)
+                received = time.perf_counter()
+                if requests is not None or sent >= warm_until:
+                    recorded.append((name, received - sent, ok))
+        except Exception as error:
+            failures.append(error)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker_loop, args=(slot,)) for slot in range(workers)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise failures[0]
+    elapsed = time.perf_counter() - started
+    if requests is None:
+        elapsed -= warmup
+
+    by_scenario = {name: ([], [0]) for name in names}
+    for name, latency, ok in (sample for recorded in results for sample in recorded):
+        by_scenario[name][0].append(latency)
+        if not ok:
+            by_scenario[name][1][0] += 1
+    all_latencies = [latency for latencies, _ in by_scenario.values() for latency in latencies]
+    total_errors = sum(errors[0] for _, errors in by_scenario.values())
+
+    return {
+        "meta": {
+            "driver": driver.name,
+            "workers": workers,
+            "duration_s": duration if requests is None else None,
+            "requests_per_worker": requests,
+            "weights": weights,
+            "dataset": dataset["counts"],
+            "bcrypt_rounds": driver.app.config['BCRYPT_LOG_ROUNDS'],
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "started_at": datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        },
+        "total": summarize(all_latencies, total_errors, elapsed),
+        "scenarios": {name: summarize(latencies, errors[0], elapsed)
+                      for name, (latencies, errors) in by_scenario.items()},
+    }
+
+
+# Settings that must match for two reports to be comparable
+COMPARABLE_META = ('driver', 'workers', 'weights', 'dataset', 'bcrypt_rounds')
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regressions of report against baseline, as human-readable strings.
+
+    A latency percentile more than `tolerance` above the baseline's, a
+    throughput more than `tolerance` below it, or errors where the
+    baseline had none count as regressions. Latency and throughput are
+    only compared for sections with MIN_SAMPLES requests in both runs.
+    Raises ValueError when the two runs used different settings.
+    """
+    mismatched = [key for key in COMPARABLE_META
+                  if report["meta"].get(key) != baseline["meta"].get(key)]
+    if mismatched:
+        raise ValueError(f"Report and baseline differ in {', '.join(mismatched)}")
+
+    regressions = []
+    sections = [('total', report["total"], baseline["total"])] + [
+        (name, report["scenarios"].get(name), stats)
+        for name, stats in baseline["scenarios"].items()]
+    for name, current, previous in sections:
+        if current is None:
+            regressions.append(f"{name}: missing from the report")
+            continue
+        if current["errors"] and not previous["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors, baseline had none")
+        if min(current["requests"], previous["requests"]) < MIN_SAMPLES:
+            continue
+        for metric in LATENCY_METRICS:
+            if previous.get(metric) and current.get(metric) is not None \
+                    and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {current[metric]} > baseline {previous[metric]}")
+        if previous.get(THROUGHPUT_METRIC) \
+                and current[THROUGHPUT_METRIC] < previous[THROUGHPUT_METRIC] * (1 - tolerance):
+            regressions.append(f"{name}: {THROUGHPUT_METRIC} {current[THROUGHPUT_METRIC]} "
+                               f"< baseline {previous[THROUGHPUT_METRIC]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--driver', choices=sorted(DRIVERS), default='inprocess')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--places', type=int, default=2000)
+    parser.add_argument('--amenities', type=int, default=50)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds recorded per run')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Seconds sent but not recorded')
+    parser.add_argument('--seed', type=int, default=25)
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    parser.add_argument('--baseline', help='Compare against this stored report')
+    parser.add_argument('--save-baseline', help='Store the report as a baseline here')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative slowdown before flagging a regression')
+    args = parser.parse_args(argv)
+
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        app = create_app(loadtest_config(path))
+        # Expected 4xx/5xx are counted in the report; keep the output clean
+        app.logger.disabled = True
+        with app.app_context():
+            dataset = generate(users=args.users, places=args.places, amenities=args.amenities,
+                               reviews=args.reviews, reviewers=args.workers, seed=args.seed)
+        with DRIVERS[args.driver](app) as driver:
+            report = run(driver, dataset, workers=args.workers, duration=args.duration,
+                         warmup=args.warmup, seed=args.seed)
+    finally:
+        os.remove(path)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    for target in (args.output, args.save_baseline):
+        if target:
+            with open(target, 'w') as output:
+                output.write(text + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as stored:
+            regressions = compare(report, json.load(stored), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
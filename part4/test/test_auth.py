@@ -0,0 +1,36 @@
+from app import create_app
+from app.extensions import password_pool
+from app.hashing import hash_cost
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+from config import TestingConfig
+
+
+def test_login_upgrades_the_hash_without_bcrypt_inside_a_transaction(monkeypatch):
+    app = create_app(TestingConfig)
+    with app.app_context():
+        facade.create_user({"first_name": "Old", "last_name": "Cost",
+                            "email": "old@auth.hbnb", "password": "secret"})
+
+    depths = []
+    for name in ('hash', 'verify'):
+        original = getattr(password_pool, name)
+
+        def recording(*args, _original=original, **kwargs):
+            depths.append(unit_of_work.depth)
+            return _original(*args, **kwargs)
+        monkeypatch.setattr(password_pool, name, recording)
+    monkeypatch.setattr(password_pool, 'rounds', password_pool.rounds + 1)
+
+    client = app.test_client()
+    response = client.post('/api/v1/auth/login',
+                           json={"email": "old@auth.hbnb", "password": "secret"})
+    assert response.status_code == 200
+    # verify, then hash at the new cost, both outside any unit of work
+    assert depths == [0, 0]
+    with app.app_context():
+        assert hash_cost(facade.get_user_by_email("old@auth.hbnb").password) == password_pool.rounds
+
+    response = client.post('/api/v1/auth/login',
+                           json={"email": "old@auth.hbnb", "password": "wrong"})
+    assert response.status_code == 401
@@ -0,0 +1,98 @@
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.services import facade
+from config import TestingConfig
+
+
+def setup_batch_app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        owner = facade.create_user({"first_name": "Owner", "last_name": "Batch",
+                                    "email": "owner@batch.hbnb", "password": "secret"})
+        guest = facade.create_user({"first_name": "Guest", "last_name": "Batch",
+                                    "email": "guest@batch.hbnb", "password": "secret"})
+        admin_id = facade.get_user_by_email(TestingConfig.ADMIN_EMAIL).id
+        tokens = {
+            'owner': create_access_token(identity=owner.id, additional_claims={"is_admin": False}),
+            'guest': create_access_token(identity=guest.id, additional_claims={"is_admin": False}),
+            'admin': create_access_token(identity=admin_id, additional_claims={"is_admin": True}),
+        }
+    headers = {name: {"Authorization": f"Bearer {token}"} for name, token in tokens.items()}
+    return app, app.test_client(), headers
+
+
+def batch(client, method, path, headers, items):
+    response = client.open(path, method=method, headers=headers, json=items)
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    return [entry['index'] for entry in body['results']], {
+        entry['index']: entry['error'] for entry in body['errors']}
+
+
+def test_batches_write_valid_items_and_report_invalid_ones():
+    app, client, headers = setup_batch_app()
+
+    written, errors = batch(client, 'POST', '/api/v1/amenities/batch', headers['admin'],
+                            [{"name": "Wifi"}, {"name": "Wifi"}, {"name": "Pool"}, "bad"])
+    assert written == [0, 2]
+    assert errors == {1: "Amenity already exists", 3: "Item must be a JSON object"}
+
+    place = {"title": "Flat", "price": 50.0, "latitude": 48.8, "longitude": 2.3}
+    written, errors = batch(client, 'POST', '/api/v1/places/batch', headers['owner'],
+                            [place, dict(place, price=-1.0), dict(place, title="Loft")])
+    assert written == [0, 2]
+    assert list(errors) == [1]
+    place_ids = [entry['id'] for entry in
+                 client.post('/api/v1/places/batch', headers=headers['owner'],
+                             json=[place, place]).get_json()['results']]
+
+    written, errors = batch(client, 'POST', '/api/v1/reviews/batch', headers['guest'], [
+        {"text": "Good", "rating": 4, "place_id": place_ids[0]},
+        {"text": "Again", "rating": 2, "place_id": place_ids[0]},
+        {"text": "Fine", "rating": 3, "place_id": place_ids[1]},
+    ])
+    assert written == [0, 2]
+    assert errors == {1: "You have already reviewed this place"}
+
+    written, errors = batch(client, 'PUT', '/api/v1/places/batch', headers['guest'],
+                            [{"id": place_ids[0], "title": "Mine now"}])
+    assert errors == {0: "Unauthorized"}
+    with app.app_context():
+        assert facade.get_place(place_ids[0]).title == "Flat"
+        assert facade.get_place(place_ids[0]).average_rating == 4.0
+
+
+def test_batch_updates_reject_a_repeated_id():
+    app, client, headers = setup_batch_app()
+    with app.app_context():
+        owner_id = facade.get_user_by_email("owner@batch.hbnb").id
+        guest_id = facade.get_user_by_email("guest@batch.hbnb").id
+        place = facade.create_place({"title": "Orig", "price": 10.0, "latitude": 1.0,
+                                     "longitude": 1.0, "user_id": owner_id})
+        review = facade.create_review({"text": "Meh", "rating": 1, "user_id": guest_id,
+                                       "place_id": place.id})
+        amenity = facade.create_amenity({"name": "Sauna"})
+        place_id, review_id, amenity_id = place.id, review.id, amenity.id
+
+    written, errors = batch(client, 'PUT', '/api/v1/places/batch', headers['owner'],
+                            [{"id": place_id, "title": "First"}, {"id": place_id, "price": -5}])
+    assert written == [0]
+    assert errors == {1: "Duplicate id in batch"}
+
+    written, errors = batch(client, 'PUT', '/api/v1/reviews/batch', headers['guest'],
+                            [{"id": review_id, "rating": 5}, {"id": review_id, "rating": 3}])
+    assert written == [0]
+    assert errors == {1: "Duplicate id in batch"}
+
+    written, errors = batch(client, 'PUT', '/api/v1/amenities/batch', headers['admin'],
+                            [{"id": amenity_id, "name": "Spa"}, {"id": amenity_id, "name": "Gym"}])
+    assert written == [0]
+    assert errors == {1: "Duplicate id in batch"}
+
+    with app.app_context():
+        place = facade.get_place(place_id)
+        assert (place.title, place.price) == ("First", 10.0)
+        assert (place.review_count, place.rating_sum, place.average_rating) == (1, 5, 5.0)
+        assert [getattr(place, f"rating_{rating}_count") for rating in range(1, 6)] == [0, 0, 0, 0, 1]
+        assert facade.get_amenity(amenity_id).name == "Spa"
@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import event, text
+
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from config import TestingConfig
+
+
+def test_collection_version_is_one_probe_that_follows_every_write():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        owner = facade.create_user({"first_name": "Owner", "last_name": "Etag",
+                                    "email": "owner@etag.hbnb", "password": "secret"})
+        place = facade.create_place({"title": "Flat", "price": 50.0, "latitude": 1.0,
+                                     "longitude": 1.0, "user_id": owner.id})
+        filters = [('price', 'ge', 10.0)]
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if statement != "BEGIN":
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            version = facade.get_collection_version('place', filters=filters)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        assert len(statements) == 1 and 'places' not in statements[0], statements
+
+        seen = {version}
+        facade.update_place(place.id, {"title": "Loft"})
+        seen.add(facade.get_collection_version('place', filters=filters))
+        # Bulk statements that bypass the ORM move it too
+        db.session.execute(text("UPDATE places SET price = price + 1"))
+        db.session.commit()
+        seen.add(facade.get_collection_version('place', filters=filters))
+        facade.delete_place(place.id, owner.id, is_admin=True)
+        seen.add(facade.get_collection_version('place', filters=filters))
+        assert len(seen) == 4
+
+
+def test_timestamps_are_utc_on_a_non_utc_host(monkeypatch):
+    monkeypatch.setenv('TZ', 'Asia/Kolkata')
+    time.tzset()
+    try:
+        app = create_app(TestingConfig)
+        with app.app_context():
+            amenity = facade.create_amenity({"name": "Wifi"})
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            assert abs((amenity.updated_at - now).total_seconds()) < 60
+            assert amenity.created_at == amenity.updated_at
+    finally:
+        monkeypatch.delenv('TZ')
+        time.tzset()
+
+
+def test_item_deleted_after_its_validator_is_a_404(monkeypatch):
+    app = create_app(TestingConfig)
+    with app.app_context():
+        amenity_id = facade.create_amenity({"name": "Pool"}).id
+    # The row disappears between the validator lookup and the fetch
+    monkeypatch.setattr(facade, 'get_amenity', lambda amenity_id: None)
+    response = app.test_client().get(f'/api/v1/amenities/{amenity_id}')
+    assert response.status_code == 404
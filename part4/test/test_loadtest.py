@@ -0,0 +1,43 @@
+import copy
+import os
+import tempfile
+
+import pytest
+
+from app import create_app
+from loadtest import DRIVERS, SCENARIO_WEIGHTS, compare, generate, loadtest_config, run
+
+
+@pytest.mark.parametrize('driver_name', sorted(DRIVERS))
+def test_every_scenario_succeeds(driver_name):
+    path = os.path.join(tempfile.mkdtemp(), 'load.db')
+    app = create_app(loadtest_config(path))
+    with app.app_context():
+        dataset = generate(users=20, places=40, amenities=5, reviews=50, reviewers=2)
+    with DRIVERS[driver_name](app) as driver:
+        report = run(driver, dataset, workers=2, requests=40, warmup=0)
+
+    assert report["total"]["requests"] == 80
+    for name in SCENARIO_WEIGHTS:
+        assert report["scenarios"][name]["requests"] > 0, name
+        assert report["scenarios"][name]["errors"] == 0, name
+    assert compare(report, report) == []
+
+
+def test_compare_flags_regressions():
+    stats = {"requests": 1000, "errors": 0, "rps": 100.0, "mean_ms": 10.0,
+             "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0}
+    baseline = {"meta": {"driver": "inprocess", "workers": 4},
+                "total": dict(stats), "scenarios": {"search": dict(stats)}}
+
+    report = copy.deepcopy(baseline)
+    report["scenarios"]["search"].update(p95_ms=40.0, rps=50.0, errors=3)
+    assert compare(report, baseline) == [
+        "search: 3 errors, baseline had none",
+        "search: p95_ms 40.0 > baseline 20.0",
+        "search: rps 50.0 < baseline 100.0",
+    ]
+
+    report["meta"]["workers"] = 8
+    with pytest.raises(ValueError):
+        compare(report, baseline)
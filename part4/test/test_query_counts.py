@@ -0,0 +1,112 @@
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from config import TestingConfig
+
+
+def count_queries(app, func):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        # Transaction control emitted by the unit of work is not a query
+        if statement != "BEGIN":
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            func()
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def seed_places(app, count):
+    with app.app_context():
+        amenity = facade.create_amenity({"name": f"Wifi {count}"})
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": str(count),
+            "email": f"owner{count}@hbnb.com", "password": "secret"
+        })
+        guest = facade.create_user({
+            "first_name": "Guest", "last_name": str(count),
+            "email": f"guest{count}@hbnb.com", "password": "secret"
+        })
+        for i in range(count):
+            place = facade.create_place({
+                "title": f"Place {i}", "price": 10.0, "latitude": 0.0,
+                "longitude": 0.0, "user_id": owner.id, "amenity_ids": [amenity.id]
+            })
+            facade.create_review({
+                "text": "Nice", "rating": 5, "user_id": guest.id, "place_id": place.id
+            })
+        db.session.remove()
+
+
+def test_place_list_query_count_is_constant():
+    app = create_app(TestingConfig)
+    client = app.test_client()
+
+    seed_places(app, 2)
+    small = count_queries(app, lambda: client.get('/api/v1/places/'))
+    seed_places(app, 20)
+    large = count_queries(app, lambda: client.get('/api/v1/places/'))
+
+    assert small == large, (small, large)
+    assert large <= 4, large
+
+
+def test_place_amenity_writes_do_not_grow_with_amenity_count():
+    app = create_app(TestingConfig)
+
+    with app.app_context():
+        owner_id = facade.create_user({
+            "first_name": "Owner", "last_name": "Amenities",
+            "email": "amenities@hbnb.com", "password": "secret"
+        }).id
+        amenity_ids = [facade.create_amenity({"name": f"Amenity {i}"}).id for i in range(30)]
+        db.session.remove()
+
+    def write(count):
+        ids = amenity_ids[:count]
+        place_ids = []
+
+        def create():
+            place_ids.append(facade.create_place({
+                "title": "Place", "price": 10.0, "latitude": 0.0, "longitude": 0.0,
+                "user_id": owner_id, "amenity_ids": ids
+            }).id)
+            db.session.remove()
+
+        def update():
+            # Swap one amenity; only two place_amenity rows change
+            facade.update_place(place_ids[0], {"amenity_ids": ids[1:] + amenity_ids[-1:]})
+            db.session.remove()
+
+        return count_queries(app, create), count_queries(app, update)
+
+    write(2)  # warms the repository cache with the owner
+    assert write(2) == write(20)
+
+
+def test_request_memo_applies_without_the_shared_cache():
+    class NoSharedCacheConfig(TestingConfig):
+        REPOSITORY_CACHE_SIZE = 0
+
+    app = create_app(NoSharedCacheConfig)
+    with app.app_context():
+        user_id = facade.create_user({
+            "first_name": "Memo", "last_name": "User",
+            "email": "memo@hbnb.com", "password": "secret"
+        }).id
+        db.session.remove()
+
+    def get_twice():
+        facade.get_user(user_id)
+        facade.get_user(user_id)
+
+    assert count_queries(app, get_twice) == 1
+    assert facade.get_cache_stats()['repository']['request_hits'] == 1
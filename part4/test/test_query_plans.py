@@ -0,0 +1,95 @@
+import os
+import re
+import tempfile
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.schema import CreateTable
+
+from app import create_app
+from app.extensions import db
+from app.migrations import Migrator
+from app.services import facade
+from config import TestingConfig
+
+# "SCAN places" (or "SCAN TABLE places" before SQLite 3.36) with no index
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+
+def create_unindexed_schema(path):
+    """The current tables as an old database has them: no secondary indexes."""
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            connection.execute(CreateTable(table))
+    engine.dispose()
+
+
+def run_hot_paths(ids):
+    place = facade.get_place(ids['place'])
+    place.to_dict()
+    facade.get_user_by_email('owner@plans.hbnb')
+    facade.has_reviewed_place(ids['guest'], ids['place'])
+    facade.get_reviews_by_place(ids['place'], limit=10)
+    facade.get_places_page(limit=10)
+    facade.search_places(bbox=(48.0, 49.0, 2.0, 3.0))
+    # Writes that re-stamp the places and reviews embedding what changed
+    facade.update_user(ids['owner'], {"first_name": "Renamed", "last_name": "Owner"})
+    facade.update_amenity(ids['amenity'], {"name": "Renamed"})
+
+
+def full_scans(app, ids):
+    """(table, statement) for every hot query whose plan scans a whole table."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    with app.app_context():
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            run_hot_paths(ids)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        scans = []
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+                for row in plan:
+                    match = FULL_SCAN.match(row[-1])
+                    if match:
+                        scans.append((match.group(1), statement))
+        db.session.remove()
+    return scans
+
+
+def test_hot_queries_use_indexes_after_migrations():
+    path = os.path.join(tempfile.mkdtemp(), 'plans.db')
+    create_unindexed_schema(path)
+
+    class PlanConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(PlanConfig)
+    with app.app_context():
+        owner = facade.create_user({"first_name": "Owner", "last_name": "Plans",
+                                    "email": "owner@plans.hbnb", "password": "secret"})
+        guest = facade.create_user({"first_name": "Guest", "last_name": "Plans",
+                                    "email": "guest@plans.hbnb", "password": "secret"})
+        amenity = facade.create_amenity({"name": "Wifi"})
+        place = facade.create_place({"title": "Place", "price": 10.0, "latitude": 48.8,
+                                     "longitude": 2.3, "user_id": owner.id,
+                                     "amenity_ids": [amenity.id]})
+        facade.create_review({"text": "Nice", "rating": 5, "user_id": guest.id,
+                              "place_id": place.id})
+        ids = {'owner': owner.id, 'guest': guest.id, 'amenity': amenity.id, 'place': place.id}
+        db.session.remove()
+
+    # Guards the check itself: without the indexes some plans must scan
+    assert full_scans(app, ids)
+
+    with app.app_context():
+        Migrator(db.engine).upgrade()
+    scans = full_scans(app, ids)
+    assert not scans, scans
@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.persistence.replication import SQLiteReplicator
+from app.services import facade
+from config import TestingConfig
+
+
+def test_reads_use_replica_except_for_a_recent_writer():
+    directory = tempfile.mkdtemp()
+    primary = os.path.join(directory, 'primary.db')
+    replica = os.path.join(directory, 'replica.db')
+
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{primary}'
+        SQLALCHEMY_BINDS = {'replica': f'sqlite:///{replica}'}
+        READ_YOUR_WRITES_WINDOW = 60
+
+    app = create_app(ReplicaConfig)
+    replicator = SQLiteReplicator(primary, replica)
+    replicator.sync()
+    with app.app_context():
+        admin_id = facade.get_user_by_email(ReplicaConfig.ADMIN_EMAIL).id
+        token = create_access_token(identity=admin_id, additional_claims={"is_admin": True})
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post('/api/v1/amenities/', headers=headers, json={"name": "Pool"})
+    assert response.status_code == 201
+    url = f"/api/v1/amenities/{response.get_json()['id']}"
+
+    # The replica has not caught up yet; only the writer reads the primary
+    assert client.get(url, headers=headers).status_code == 200
+    assert client.get(url).status_code == 404
+
+    replicator.sync()
+    assert client.get(url).status_code == 200